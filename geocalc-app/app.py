@@ -28,20 +28,37 @@ parent_directory = os.path.dirname(app_directory)
 sys.path.append(parent_directory)
 
 # Now you should be able to import modules from geocalc-lib
+from geocalc_lib import backends, profiling
 from geocalc_lib.shapes.point import Point
+from geocalc_lib.shapes.point_set import PointSet
 from geocalc_lib.shapes.line import Line
+from geocalc_lib.shapes.segment_set import SegmentSet
 from geocalc_lib.shapes.circle import Circle
-from geocalc_lib.algorithms.closest_pair_of_points import ClosestPairOfPoints
-from geocalc_lib.algorithms.convex_hull import ConvexHull
+from geocalc_lib.algorithms.dynamic_convex_hull import DynamicConvexHull
+from geocalc_lib.algorithms.dynamic_delaunay import DynamicDelaunay
+from geocalc_lib.algorithms.dynamic_line_segment import (
+    DynamicLineSegmentIntersection)
 from geocalc_lib.algorithms.largest_empty_circle import LargestEmptyCircle
-from geocalc_lib.algorithms.line_segment import LineSegmentIntersection
+from geocalc_lib.spatial.rtree import RTree
 
 app = Flask(__name__)
 
 # Initialize points, lines, and circles as empty arrays
-points = []
-lines = []
+points = PointSet()
+lines = SegmentSet()
 circles = []
+# Keeps the convex hull of points up to date as points change
+hull_tracker = DynamicConvexHull()
+# Keeps the Delaunay triangulation of points up to date as points change
+delaunay_tracker = DynamicDelaunay()
+# Keeps the intersections of lines up to date as lines change
+line_tracker = DynamicLineSegmentIntersection()
+# R-trees over points and lines, built once a large scene is drawn
+# again without changing, and how often each was drawn since it changed
+scene_index = [None, None]
+scene_draws = [0, 0]
+# Scenes with fewer items than this are always scanned when drawn
+SCENE_INDEX_MIN_ITEMS = 2 ** 14
 # Keeps track of if points and lines should be highlighted
 is_highlighted = [[], []]
 # Also keep track of grid size
@@ -72,42 +89,46 @@ def index():
         # Get user inputted command
         command = request.form['command']
 
-        # Call appropriate function based on command input
-        if command.startswith('add_point'):
-            msg = [add_point(command)]
-        elif command.startswith('remove_point'):
-            msg = [remove_point(command)]
-        elif command.startswith("clear_points"):
-            msg = [clear_points()]
-        elif command.startswith("add_line"):
-            msg = [add_line(command)]
-        elif command.startswith("remove_line"):
-            msg = [remove_line(command)]
-        elif command.startswith("clear_lines"):
-            msg = [clear_lines()]
-        elif command.startswith("closest_pair_of_points"):
-            msg = [closest_pair()]
-        elif command.startswith('convex_hull'):
-            msg = [convex_hull()]
-        elif command.startswith('largest_empty_circle'):
-            msg = [largest_circle()]
-        elif command.startswith('line_segment'):
-            msg = [line_segment()]
-        elif command.startswith('set_grid'):
-            msg = [set_grid(command)]
-        elif command.startswith('help'):
-            # Display help message with commands
-            msg = ["Add a point or line: add_point x y |"
-                   + " add_line x1 y1 x2 y2",
-                   "Remove a point or line: remove_point x y |"
-                   + " remove_line x1 y1 x2 y2",
-                   "Clear all points or lines: clear_points | clear_lines",
-                   "Algorithms: closest_pair_of_points | convex_hull | "
-                   + "largest_empty_circle | "
-                   + "line_segment",
-                   "Change grid size: set_grid d"]
-        else:
-            msg = ["Invalid Command."]
+        # Call appropriate function based on command input, collecting
+        # counters from the algorithms it runs
+        with profiling.collect() as counters:
+            if command.startswith('add_point'):
+                msg = [add_point(command)]
+            elif command.startswith('remove_point'):
+                msg = [remove_point(command)]
+            elif command.startswith("clear_points"):
+                msg = [clear_points()]
+            elif command.startswith("add_line"):
+                msg = [add_line(command)]
+            elif command.startswith("remove_line"):
+                msg = [remove_line(command)]
+            elif command.startswith("clear_lines"):
+                msg = [clear_lines()]
+            elif command.startswith("closest_pair_of_points"):
+                msg = [closest_pair()]
+            elif command.startswith('convex_hull'):
+                msg = [convex_hull()]
+            elif command.startswith('largest_empty_circle'):
+                msg = [largest_circle()]
+            elif command.startswith('line_segment'):
+                msg = [line_segment()]
+            elif command.startswith('set_grid'):
+                msg = [set_grid(command)]
+            elif command.startswith('help'):
+                # Display help message with commands
+                msg = ["Add a point or line: add_point x y |"
+                       + " add_line x1 y1 x2 y2",
+                       "Remove a point or line: remove_point x y |"
+                       + " remove_line x1 y1 x2 y2",
+                       "Clear all points or lines: clear_points | clear_lines",
+                       "Algorithms: closest_pair_of_points | convex_hull | "
+                       + "largest_empty_circle | "
+                       + "line_segment",
+                       "Change grid size: set_grid d"]
+            else:
+                msg = ["Invalid Command."]
+        if counters:
+            app.logger.info(f"{command}: {counters}")
 
         # Turn points, lines, and circles into json data
         point_data, line_data, circle_data = data_into_json()
@@ -136,6 +157,9 @@ def add_point(command):
         point = Point(int(x), int(y))
         # Add point to points is is_highlighted as False
         points.append(point)
+        scene_changed(0)
+        hull_tracker.add_point(point)
+        delaunay_tracker.add_point(point)
         is_highlighted[0].append(False)
     except Exception as e:
         return f"Error adding point: {e}"
@@ -156,6 +180,9 @@ def remove_point(command):
         index = points.index(point)
         # Remove the point from the points array and highlighted value.
         del points[index]
+        scene_changed(0)
+        hull_tracker.remove_point(point)
+        delaunay_tracker.remove_point(point)
         del is_highlighted[0][index]
     except Exception as e:
         return f"Error removing point: {e}"
@@ -168,10 +195,12 @@ def clear_points():
     Removes all points from points array.
     """
     try:
-        # Remove each point in points array and is_highlighted value.
-        for i in range(len(points)-1, -1, -1):
-            del points[i]
-            del is_highlighted[0][i]
+        # Remove every point and is_highlighted value.
+        points.clear()
+        scene_changed(0)
+        hull_tracker.clear()
+        delaunay_tracker.clear()
+        del is_highlighted[0][:]
     except Exception as e:
         return f"Error clearing point: {e}"
 
@@ -189,6 +218,8 @@ def add_line(command):
         line = Line(Point(int(x1), int(y1)), Point(int(x2), int(y2)))
         # Add line to lines and False to is_highlighted.
         lines.append(line)
+        scene_changed(1)
+        line_tracker.add_line(line)
         is_highlighted[1].append(False)
     except Exception as e:
         return f"Error adding line: {e}"
@@ -209,6 +240,8 @@ def remove_line(command):
         index = lines.index(line)
         # Remove the line from the lines and is_highlighted array.
         del lines[index]
+        scene_changed(1)
+        line_tracker.remove_line(line)
         del is_highlighted[1][index]
     except Exception as e:
         return f"Error removing line: {e}"
@@ -221,10 +254,11 @@ def clear_lines():
     Removes every line from lines array.
     """
     try:
-        # Remove each line in lines and its is_highlighted value.
-        for i in range(len(lines)-1, -1, -1):
-            del lines[i]
-            del is_highlighted[1][i]
+        # Remove every line and is_highlighted value.
+        lines.clear()
+        scene_changed(1)
+        line_tracker.clear()
+        del is_highlighted[1][:]
     except Exception as e:
         return f"Error clearing lines: {e}"
 
@@ -237,27 +271,25 @@ def closest_pair():
     points and displays the closest pair of points as highlighted.
     """
     try:
-        # Turn points in np array
-        np_points = np.array(points)
-
-        # Initalize closest pair of points algorithms
-        # and find closest pair of points
-        closest_pair_finder = ClosestPairOfPoints(np_points)
-        min_distance, best_pair = closest_pair_finder.closest_util(
-            np_points)
-
-        # Highlight the closest pair of points
-        for i in range(len(points)):
-            if points[i] in best_pair:
-                is_highlighted[0][i] = True
+        # Find the closest pair of points with the fastest engine on
+        # this machine
+        result = backends.solve("closest_pair", points)
+        if result.pair is None:
+            return "Not enough points."
+
+        # Highlight the closest pair of points by their indices
+        for i in result.indices:
+            is_highlighted[0][i] = True
+        min_distance = result.distance
+        first, second = (points[i] for i in result.indices)
     except Exception as e:
         return f"Error finding closest pair of points: {e}"
 
     # Generate output message
-    msg = f"({best_pair[0].coords[0]}, " \
-          + f"{best_pair[0].coords[1]}) " \
-          + f"and ({best_pair[1].coords[0]}, "\
-          + f"{best_pair[1].coords[1]}) "\
+    msg = f"({first.x}, " \
+          + f"{first.y}) " \
+          + f"and ({second.x}, "\
+          + f"{second.y}) "\
           + f"are the closest pair of points with"\
           + f" a distance of {min_distance:.3f}."
 
@@ -270,24 +302,27 @@ def convex_hull():
     and creates the convex hull with lines connecting each hull point.
     """
     try:
-        # Turn points into array of tuples
-        tuple_points = [(point.coords[0], point.coords[1])
-                        for point in points]
-
-        # Initialize ConvexHull and do a graham scan on all points
-        ch = ConvexHull(tuple_points)
-        hull = ch.graham_scan(tuple_points)
-
-        # Create Lines based on graham scan's hull values
-        for i in range(len(hull)-1):
-            line = Line(Point(hull[i][0], hull[i][1]),
-                        Point(hull[i+1][0], hull[i+1][1]))
-            lines.append(line)
-            is_highlighted[1].append(False)
+        # Ensure there are at least 3 points.
+        if len(points) < 3:
+            raise ValueError("Not possible for Convex Hull with less than"
+                             + " 3 points.")
+
+        # Read the hull points kept up to date by the hull tracker
+        hull = hull_tracker.hull()
+
+        # Create Lines joining each hull point to the next one
+        hull_coords = np.array(hull)
+        hull_lines = np.hstack((hull_coords,
+                                np.roll(hull_coords, -1, axis=0)))
+        lines.extend(hull_lines)
+        scene_changed(1)
+        for row in hull_lines:
+            line_tracker.add_line(row)
+        is_highlighted[1].extend([False] * len(hull))
     except Exception as e:
         return f"Error finding convex hull: {e}"
 
-    return f"Successfully created convex hull out of {len(hull)-1} points."
+    return f"Successfully created convex hull out of {len(hull)} points."
 
 
 def largest_circle():
@@ -296,12 +331,9 @@ def largest_circle():
     and creates the largest empty circle to be displayed.
     """
     try:
-        # Turn points into np.array of array point values
-        np_points = np.array([[point.coords[0], point.coords[1]]
-                              for point in points])
-
-        # Run LargestEmptyCircle algorithm
-        lec = LargestEmptyCircle(np_points)
+        # Run LargestEmptyCircle algorithm directly on the point buffer,
+        # reusing the scene's triangulation
+        lec = LargestEmptyCircle(points, delaunay_tracker.triangulation())
         center, radius = lec.find_largest_empty_circle()
 
         # Create largest empty circle
@@ -320,26 +352,15 @@ def line_segment():
     lines and highlights all intersecting lines.
     """
     try:
-        # Get each pair of lines
-        line_pairs = []
-        for i, line1 in enumerate(lines):
-            for line2 in lines[i + 1:]:
-                line_pairs.append([line1, line2])
-
-        # For each pair of lines, call LineSegmentIntersection algorithm
-        lsi = LineSegmentIntersection(np.array([]))
-        results = []
-        for pair in line_pairs:
-            result = lsi.do_intersect(pair[0].start, pair[0].end,
-                                      pair[1].start, pair[1].end)
-            results.append(result)
+        # Read the index pairs of every two lines that intersect and
+        # where they meet, kept up to date by the line tracker
+        pairs, where = line_tracker.intersections()
+        overlaps = np.any(where[:, :2] != where[:, 2:], axis=1)
+        crossings = np.unique(where[~overlaps, :2], axis=0)
 
         # Highlight each line that intersects with another line.
-        for i in range(len(line_pairs)):
-            if results[i]:
-                for j in range(len(lines)):
-                    if lines[j] in line_pairs[i]:
-                        is_highlighted[1][j] = True
+        for j in np.unique(pairs):
+            is_highlighted[1][j] = True
 
         # Get number of intersections
         intersect_count = 0
@@ -349,7 +370,10 @@ def line_segment():
     except Exception as e:
         return f"Error finding line segment intersections: {e}"
 
-    return f"{intersect_count} lines intersect."
+    msg = f"{intersect_count} lines intersect at {len(crossings)} point(s)"
+    if np.any(overlaps):
+        msg += f" with {np.count_nonzero(overlaps)} overlap(s)"
+    return msg + "."
 
 
 def set_grid(command):
@@ -370,27 +394,66 @@ def set_grid(command):
     return f"Successfully set new grid size to {grid_size}"
 
 
+def scene_changed(kind):
+    """
+    Function drops the R-tree of points (kind 0) or lines (kind 1) after
+    they change.
+    """
+    scene_index[kind] = None
+    scene_draws[kind] = 0
+
+
+def scene_window(kind, size):
+    """
+    Function returns the indices of the points (kind 0) or lines (kind
+    1) whose bounding boxes meet the displayed grid. Scanning them is
+    O(n), so an R-tree is only built for a large scene drawn again
+    without changing, which later draws then query.
+    """
+    items = points if kind == 0 else lines
+    scene_draws[kind] += 1
+    if (scene_index[kind] is None and len(items) >= SCENE_INDEX_MIN_ITEMS
+            and scene_draws[kind] > 1):
+        scene_index[kind] = RTree(items)
+    if scene_index[kind] is not None:
+        return scene_index[kind].window(0, 0, size, size)
+
+    if kind == 0:
+        low = high = items.coords
+    else:
+        bounds = items.bounds()
+        low, high = bounds[:, :2], bounds[:, 2:]
+    return np.flatnonzero(np.all((high >= 0) & (low <= size), axis=1))
+
+
 def data_into_json():
     """
-    Function turns given point, line, and circle data into json format.
+    Function turns the point, line, and circle data inside the displayed
+    grid into json format.
     """
+    # Only send the points and lines that can be seen on the canvas
+    size = grid_size[0]
+    shown = scene_window(0, size)
     point_data = {
-        "x": [int(point.coords[0]) for point in points],
-        "y": [int(point.coords[1]) for point in points],
-        "is_highlighted": is_highlighted[0],
+        "x": points.coords[shown, 0].astype(int).tolist(),
+        "y": points.coords[shown, 1].astype(int).tolist(),
+        "is_highlighted": [is_highlighted[0][i] for i in shown],
     }
 
+    # Read each column of the shown segments in one pass
+    shown = scene_window(1, size)
+    line_columns = lines.coords[shown].astype(int).reshape(-1, 4).T.tolist()
     line_data = {
-        "start_x": [int(line.start.coords[0]) for line in lines],
-        "start_y": [int(line.start.coords[1]) for line in lines],
-        "end_x": [int(line.end.coords[0]) for line in lines],
-        "end_y": [int(line.end.coords[1]) for line in lines],
-        "is_highlighted": is_highlighted[1],
+        "start_x": line_columns[0],
+        "start_y": line_columns[1],
+        "end_x": line_columns[2],
+        "end_y": line_columns[3],
+        "is_highlighted": [is_highlighted[1][i] for i in shown],
     }
 
     circle_data = {
-        "x": [float(circle.center.coords[0]) for circle in circles],
-        "y": [float(circle.center.coords[1]) for circle in circles],
+        "x": [float(circle.center.x) for circle in circles],
+        "y": [float(circle.center.y) for circle in circles],
         "radius": [float(circle.radius) for circle in circles],
     }
 
@@ -2,7 +2,6 @@
 import os
 import random
 import sys
-import numpy as np
 
 # Personal imports.
 # If this were to be published, this would simply reference the package
@@ -19,12 +18,16 @@ parent_directory = os.path.dirname(app_directory)
 sys.path.append(parent_directory)
 
 # Now you should be able to import modules from geocalc-lib
+from geocalc_lib import backends
 from geocalc_lib.shapes.point import Point
+from geocalc_lib.shapes.point_set import PointSet
 from geocalc_lib.shapes.line import Line
-from geocalc_lib.algorithms.closest_pair_of_points import ClosestPairOfPoints
-from geocalc_lib.algorithms.convex_hull import ConvexHull
+from geocalc_lib.shapes.segment_set import SegmentSet
+from geocalc_lib.algorithms.dynamic_convex_hull import DynamicConvexHull
+from geocalc_lib.algorithms.dynamic_delaunay import DynamicDelaunay
+from geocalc_lib.algorithms.dynamic_line_segment import (
+    DynamicLineSegmentIntersection)
 from geocalc_lib.algorithms.largest_empty_circle import LargestEmptyCircle
-from geocalc_lib.algorithms.line_segment import LineSegmentIntersection
 
 
 class Console:
@@ -35,10 +38,17 @@ class Console:
     ----------
     prompt : 'geocalc1.0> '
         A string at the beginning of each input.
-    points : array
-        An array of points.
-    lines : array
-        An array of lines.
+    points : PointSet
+        A set of points.
+    lines : SegmentSet
+        A set of lines.
+    hull : DynamicConvexHull
+        The convex hull of points, kept up to date as points change.
+    delaunay : DynamicDelaunay
+        The Delaunay triangulation of points, kept up to date as points
+        change.
+    intersections : DynamicLineSegmentIntersection
+        The intersections of lines, kept up to date as lines change.
 
     Methods
     -------
@@ -75,15 +85,18 @@ class Console:
     -----
         import numpy as np
 
+        from geocalc_lib import backends
         from geocalc_lib.shapes.point import Point
         from geocalc_lib.shapes.line import Line
-        from geocalc_lib.algorithms.closest_pair_of_points import (
-            ClosestPairOfPoints)
-        from geocalc_lib.algorithms.convex_hull import ConvexHull
+        from geocalc_lib.shapes.segment_set import SegmentSet
+        from geocalc_lib.algorithms.dynamic_convex_hull import (
+            DynamicConvexHull)
+        from geocalc_lib.algorithms.dynamic_delaunay import (
+            DynamicDelaunay)
+        from geocalc_lib.algorithms.dynamic_line_segment import (
+            DynamicLineSegmentIntersection)
         from geocalc_lib.algorithms.largest_empty_circle import (
             LargestEmptyCircle)
-        from geocalc_lib.algorithms.line_segment import (
-            LineSegmentIntersection)
 
         # Initialize the class
         console = Console()
@@ -122,8 +135,11 @@ class Console:
     def __init__(self) -> None:
         self.prompt = 'geocalc1.0> '
         # Initialize an empty array for storing points and lines.
-        self.points = []
-        self.lines = []
+        self.points = PointSet()
+        self.lines = SegmentSet()
+        self.hull = DynamicConvexHull()
+        self.delaunay = DynamicDelaunay()
+        self.intersections = DynamicLineSegmentIntersection()
 
     def run(self) -> None:
         while True:
@@ -187,6 +203,8 @@ class Console:
                 return
             # Add the point to the points array.
             self.points.append(point)
+            self.hull.add_point(point)
+            self.delaunay.add_point(point)
             # Print a success message in green.
             print("\033[92m" + f"{point} added." + "\033[0m")
         except ValueError:
@@ -209,6 +227,8 @@ class Console:
                 index = self.points.index(point)
                 # Remove the point from the points array.
                 del self.points[index]
+                self.hull.remove_point(point)
+                self.delaunay.remove_point(point)
                 # Print a success message in green.
                 print("\033[92m" + f"{point} removed." + "\033[0m")
             except ValueError:
@@ -227,8 +247,10 @@ class Console:
         try:
             # Assuming the command format is "clear_points"
             _, = command.split()
-            # Clear the list of points.
-            self.points = []
+            # Clear the set of points.
+            self.points.clear()
+            self.hull.clear()
+            self.delaunay.clear()
             # Print a success message in green.
             print("\033[92m" + "Points cleared." + "\033[0m")
         except Exception as e:
@@ -249,6 +271,7 @@ class Console:
                 return
             # Add the line to lines array
             self.lines.append(line)
+            self.intersections.add_line(line)
             # Print a success message in green.
             print("\033[92m" + f"{line} added." + "\033[0m")
         except ValueError:
@@ -270,6 +293,7 @@ class Console:
                 index = self.lines.index(line)
                 # Remove the line from the lines array.
                 del self.lines[index]
+                self.intersections.remove_line(line)
                 # Print a success message in green.
                 print("\033[92m" + f"{line} removed." + "\033[0m")
             except ValueError:
@@ -287,8 +311,9 @@ class Console:
         try:
             # Assuming the command format is "clear_lines"
             _, = command.split()
-            # Clear the list of lines.
-            self.lines = []
+            # Clear the set of lines.
+            self.lines.clear()
+            self.intersections.clear()
             # Print a success message in green.
             print("\033[92m" + "Lines cleared." + "\033[0m")
         except Exception as e:
@@ -306,17 +331,16 @@ class Console:
         try:
             # Assuming command format is "closest_pair_of_points"
             _, = command.split()
-            # Turn points into an np.array
-            # and call ClosestPairOfPoints algorithm
-            np_points = np.array(self.points)
-            closest_pair_finder = ClosestPairOfPoints(np_points)
-            min_distance, best_pair = closest_pair_finder.closest_util(
-                np_points)
+            # Find the closest pair with the fastest engine on this
+            # machine
+            result = backends.solve("closest_pair", self.points)
+            min_distance = result.distance
+            first, second = (self.points[i] for i in result.indices)
             # Print a success message in green displaying algorithm info
-            print("\033[92m" + f"({best_pair[0].coords[0]}, "
-                  + f"{best_pair[0].coords[1]}) "
-                  + f"and ({best_pair[1].coords[0]}, "
-                  + f"{best_pair[1].coords[1]}) "
+            print("\033[92m" + f"({first.x}, "
+                  + f"{first.y}) "
+                  + f"and ({second.x}, "
+                  + f"{second.y}) "
                   + f"are the closest pair of points with"
                   + f" a distance of {min_distance:.3f}."
                   + "\033[0m")
@@ -335,16 +359,13 @@ class Console:
         try:
             # Assuming command format is "convex_hull"
             _, = command.split()
-            # Turn points into array of tuples
-            points = [(point.coords[0], point.coords[1])
-                      for point in self.points]
-            # Call ConvexHull algorithm and perform a graham scan
-            convex_hull_finder = ConvexHull(points)
-            convex_hull = convex_hull_finder.graham_scan(points)
-            # Print a success message in green displaying convex hull info
+            # Read the hull points kept up to date by the hull tracker
+            hull = self.hull.hull()
+            # Print a success message in green displaying convex hull info,
+            # coming back to the starting point to close the shape
             print("\033[92m" + "Convex Hull Shape:" + "\033[0m")
-            for point in convex_hull:
-                print("\033[92m" + f"({point[0]}, {point[1]})" + "\033[0m")
+            for x, y in hull + hull[:1]:
+                print("\033[92m" + f"({x}, {y})" + "\033[0m")
         except Exception as e:
             # Print an error in red.
             print("\033[91m" + f"Error finding convex hull: {e}" + "\033[0m")
@@ -360,11 +381,10 @@ class Console:
         try:
             # Assuming command format is "largest_empty_circle"
             _, = command.split()
-            # Turn points into np.array of array point values
-            np_points = np.array([[point.coords[0], point.coords[1]]
-                                 for point in self.points])
-            # Call LargestEmptyCircle algorithm
-            lec = LargestEmptyCircle(np_points)
+            # Call LargestEmptyCircle algorithm on the point buffer,
+            # reusing the scene's triangulation
+            lec = LargestEmptyCircle(self.points,
+                                     self.delaunay.triangulation())
             center, radius = lec.find_largest_empty_circle()
             # Print a success message in green
             # displaying algorithm information
@@ -388,31 +408,39 @@ class Console:
         try:
             # Assuming command format is "line_segment"
             _, = command.split()
-            # Get each pair of lines
+            # Read the intersecting pairs and where they meet, kept up
+            # to date as lines change
+            pairs, where = self.intersections.intersections()
+            intersecting = dict(zip(map(tuple, pairs.tolist()),
+                                    where.tolist()))
+            # Get each pair of lines and whether they intersect
+            lines = list(self.lines)
             line_pairs = []
-            for i, line1 in enumerate(self.lines):
-                for line2 in self.lines[i + 1:]:
-                    line_pairs.append([line1, line2])
-            # For each pair of lines, call LineSegmentIntersection algorithm
-            lsi = LineSegmentIntersection(np.array(self.points))
             results = []
-            for pair in line_pairs:
-                result = lsi.do_intersect(pair[0].start, pair[0].end,
-                                          pair[1].start, pair[1].end)
-                results.append(result)
+            for i, line1 in enumerate(lines):
+                for j in range(i + 1, len(lines)):
+                    line_pairs.append([line1, lines[j]])
+                    results.append(intersecting.get((i, j)))
             # Print a success message in green displaying line segment info
             print("\033[92m" + f"Line Segment Intersections:" + "\033[0m")
             # For each line_pair, display whether they intersected or not
             for i in range(len(line_pairs)):
-                result = "intersect" if results[i] else "do not intersect"
-                print("\033[92m" + f"[({line_pairs[i][0].start.coords[0]}, "
-                      + f"{line_pairs[i][0].start.coords[1]}),"
-                      + f" ({line_pairs[i][0].end.coords[0]},"
-                      + f" {line_pairs[i][0].end.coords[1]})]"
-                      + f" and [({line_pairs[i][1].start.coords[0]},"
-                      + f" {line_pairs[i][1].start.coords[1]}),"
-                      + f" ({line_pairs[i][1].end.coords[0]},"
-                      + f" {line_pairs[i][1].end.coords[1]})] {result}."
+                x1, y1, x2, y2 = results[i] or (None,) * 4
+                if results[i] is None:
+                    result = "do not intersect"
+                elif (x1, y1) == (x2, y2):
+                    result = f"intersect at ({x1:g}, {y1:g})"
+                else:
+                    result = (f"overlap from ({x1:g}, {y1:g})"
+                              + f" to ({x2:g}, {y2:g})")
+                print("\033[92m" + f"[({line_pairs[i][0].start.x}, "
+                      + f"{line_pairs[i][0].start.y}),"
+                      + f" ({line_pairs[i][0].end.x},"
+                      + f" {line_pairs[i][0].end.y})]"
+                      + f" and [({line_pairs[i][1].start.x},"
+                      + f" {line_pairs[i][1].start.y}),"
+                      + f" ({line_pairs[i][1].end.x},"
+                      + f" {line_pairs[i][1].end.y})] {result}."
                       + "\033[0m")
         except Exception as e:
             # Print an error in red.
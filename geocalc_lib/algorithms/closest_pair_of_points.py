@@ -1,11 +1,28 @@
 # This solution is inspired by Geeksforgeeks solution :
 # https://www.geeksforgeeks.org/closest-pair-of-points-using-divide-and-conquer-algorithm/#
 
+# Standard library imports.
+from functools import lru_cache
+from math import hypot
+
+from geocalc_lib import profiling
 from geocalc_lib.shapes.point import Point
+from geocalc_lib.shapes.point_set import as_coords, point_order
+from geocalc_lib.algorithms.grid_closest_pair import GridClosestPair
+from geocalc_lib.algorithms.results import PairResult
 
 # Thirty party imports.
 import numpy as np
 
+# Subproblems at or below this size are solved by vectorized brute
+# force in closest_pair().
+_LEAF_SIZE = 64
+# In the strip, each point only needs comparing with the next 7 points
+# in y order.
+_STRIP_NEIGHBORS = 7
+# From this many points the grid engine beats divide and conquer.
+_GRID_MIN_POINTS = 2048
+
 
 class ClosestPairOfPoints:
     """
@@ -13,14 +30,14 @@ class ClosestPairOfPoints:
 
     Attributes
     ----------
-    points : np.array
-        An array of points.
+    points : PointSet or list of Point
+        A collection of points.
 
     Methods
     -------
     dist(p1, p2)
         Given two points, calculate the euclidean distance, using
-        linalg.norm.
+        math.hypot.
     brute_force(points)
         This method will return the smallest distance between pairs
         among all points we have.
@@ -30,6 +47,13 @@ class ClosestPairOfPoints:
     closest_util(points, sort_x=True)
         Given a list of points, find if the min distance is among this
         list.
+    closest_pair(points=None, method="auto")
+        Given an (N, 2) array or PointSet, return the min distance and
+        the index pair of the closest points as a PairResult, working
+        on the coordinate array directly.
+    pairs_within(r, points=None)
+        Given a distance r, return every pair of points at most r apart
+        and their distances.
 
     Usage
     -----
@@ -44,6 +68,15 @@ class ClosestPairOfPoints:
 
     # Find the closest pair of points.
     min_distance = closest_pair_finder.closest_util(points)
+
+    # Or find the indices of the closest pair straight from the array.
+    min_distance, (i, j) = closest_pair_finder.closest_pair()
+
+    # The result also holds the pair's coordinates.
+    first, second = closest_pair_finder.closest_pair().coords
+
+    # Find every pair of points within distance 2.
+    pairs, distances = closest_pair_finder.pairs_within(2)
     """
 
     def __init__(self, points: np.array) -> None:
@@ -52,10 +85,12 @@ class ClosestPairOfPoints:
     def dist(self, p1, p2) -> float:
         """
         Given two points, calculate the euclidean distance, using
-        linalg.norm.
+        math.hypot.
         """
 
-        return np.linalg.norm(p1.coords - p2.coords)
+        if profiling.stats is not None:
+            profiling.count("closest_pair.distance_evaluations")
+        return hypot(p1.x - p2.x, p1.y - p2.y)
 
     def brute_force(self, points) -> float:
         """
@@ -85,13 +120,13 @@ class ClosestPairOfPoints:
         # Number of points in the strip.
         size = len(strip)
         # Sort the list according to the y-axis.
-        strip.sort(key=lambda point: point.coords[1])
+        strip.sort(key=lambda point: point.y)
 
         for i in range(size):
             for j in range(i+1, size):
                 # If the y-axis between i and j >= to the min_dist,
                 # increment i and continue.
-                if (strip[j].coords[1] - strip[i].coords[1]) >= min_dist:
+                if (strip[j].y - strip[i].y) >= min_dist:
                     break
                 # Euclidean distance between points i and j
                 dist_ij = self.dist(strip[i], strip[j])
@@ -112,11 +147,15 @@ class ClosestPairOfPoints:
 
         # Check if sorted already or not.
         if sort_x:
-            points = sorted(points, key=lambda point: point.coords[0])
+            points = sorted(points, key=lambda point: point.x)
 
         n = len(points)
+        if profiling.stats is not None:
+            profiling.enter("closest_pair.max_depth")
         # If there are few points, do it directly.
         if n <= 3:
+            if profiling.stats is not None:
+                profiling.leave("closest_pair.max_depth")
             return self.brute_force(points)
 
         # Otherwise, divide it to two parts and recursivly call each
@@ -139,11 +178,16 @@ class ClosestPairOfPoints:
         for p in points:
             # Check if the point is within distance 'd' of the midpoint
             # on the x-axis.
-            if abs(p.coords[0] - midPoint.coords[0]) < d:
+            if abs(p.x - midPoint.x) < d:
                 # Add the point to the strip if it's within the
                 # distance.
                 strip.append(p)
 
+        if profiling.stats is not None:
+            profiling.count("closest_pair.strip_points", len(strip))
+            profiling.record_max("closest_pair.max_strip", len(strip))
+            profiling.leave("closest_pair.max_depth")
+
         # Find the closest distance within the strip using strip
         # closest function.
         strip_dist, strip_pair = self.strip_closest(strip, d, best_pair)
@@ -156,3 +200,143 @@ class ClosestPairOfPoints:
             # Otherwise, return the minimum distance found in the
             # divided sections.
             return d, best_pair
+
+    def closest_pair(self, points=None, method="auto") -> PairResult:
+        """
+        Given an (N, 2) array or PointSet, return the min distance and
+        the index pair (i, j), i < j, of the closest points in it, as a
+        PairResult.
+
+        method "divide" sorts points by x and by y once. Each level of
+        the recursion splits the y order between the halves with a
+        mask, and strips are checked in vectorized blocks, for
+        O(n log n) overall. method "grid" uses GridClosestPair, which
+        runs in expected O(n). "auto" picks one from the input.
+        """
+
+        if points is None:
+            points = self.points
+        coords = as_coords(points)
+        n = len(coords)
+        if n < 2:
+            return PairResult(float("inf"), None, coords)
+        if method == "auto":
+            method = _choose_method(coords)
+        if method == "grid":
+            return GridClosestPair(coords).closest_pair()
+        if method != "divide":
+            raise ValueError(f"Unknown closest pair method: {method}")
+
+        # Work in x rank space, so the halves of every subproblem are
+        # contiguous ranges of positions. A PointSet sorts once for
+        # every run until it changes.
+        by_x = point_order(points, "x")
+        xs = coords[by_x, 0].astype(np.float64)
+        ys = coords[by_x, 1].astype(np.float64)
+        ranks = np.empty(n, dtype=np.intp)
+        ranks[by_x] = np.arange(n)
+        by_y = ranks[point_order(points, "y")]
+
+        # Best squared distance so far and its pair of positions.
+        best = [float("inf"), 0, 1]
+        _closest_recursive(xs, ys, 0, n, by_y, best)
+
+        i, j = sorted((int(by_x[best[1]]), int(by_x[best[2]])))
+        return PairResult(float(np.sqrt(best[0])), (i, j), coords)
+
+    def pairs_within(self, r: float, points=None) -> tuple:
+        """
+        Given a distance r, return a (K, 2) array of the index pairs
+        (i < j) of every two points at most r apart, and a (K,) array
+        of their distances.
+        """
+
+        if points is None:
+            points = self.points
+        return GridClosestPair(points).pairs_within(r)
+
+
+def _choose_method(coords) -> str:
+    # Pick the closest pair engine from the size and spread of the
+    # input.
+    if len(coords) < _GRID_MIN_POINTS:
+        return "divide"
+    # Integer points packed tighter than their lattice must repeat, and
+    # divide and conquer stops at the first duplicate it finds.
+    if coords.dtype.kind in "iu":
+        extent = coords.max(axis=0) - coords.min(axis=0) + 1
+        if len(coords) > int(extent[0]) * int(extent[1]):
+            return "divide"
+    return "grid"
+
+
+def _closest_recursive(xs, ys, lo, hi, by_y, best) -> None:
+    # Solve positions lo..hi, whose y order is by_y, updating best.
+    if best[0] == 0:
+        return
+    if hi - lo <= _LEAF_SIZE:
+        if profiling.stats is not None:
+            # A leaf is one call deeper than its parent.
+            profiling.enter("closest_pair.max_depth")
+            profiling.leave("closest_pair.max_depth")
+            profiling.count("closest_pair.distance_evaluations",
+                            (hi - lo) * (hi - lo - 1) // 2)
+        _closest_brute_force(xs, ys, lo, hi, best)
+        return
+
+    mid = (lo + hi) // 2
+    in_left = by_y < mid
+    if profiling.stats is not None:
+        profiling.enter("closest_pair.max_depth")
+    _closest_recursive(xs, ys, lo, mid, by_y[in_left], best)
+    _closest_recursive(xs, ys, mid, hi, by_y[~in_left], best)
+    if profiling.stats is not None:
+        profiling.leave("closest_pair.max_depth")
+
+    # Any closer pair crosses the midline, so lies in the strip.
+    d = np.sqrt(best[0])
+    strip = by_y[np.abs(xs[by_y] - xs[mid]) < d]
+    if profiling.stats is not None:
+        profiling.count("closest_pair.strip_points", len(strip))
+        profiling.record_max("closest_pair.max_strip", len(strip))
+    _closest_strip(xs, ys, strip, best)
+
+
+def _closest_brute_force(xs, ys, lo, hi, best) -> None:
+    # Compare every pair of positions lo..hi at once.
+    x = xs[lo:hi]
+    y = ys[lo:hi]
+    dx = x[:, None] - x[None, :]
+    dy = y[:, None] - y[None, :]
+    dist = dx * dx + dy * dy
+    dist[_lower_triangle(hi - lo)] = np.inf
+    flat = int(np.argmin(dist))
+    i, j = divmod(flat, hi - lo)
+    if dist[i, j] < best[0]:
+        best[:] = [float(dist[i, j]), lo + i, lo + j]
+
+
+@lru_cache(maxsize=None)
+def _lower_triangle(size: int) -> np.ndarray:
+    # Mask of the diagonal and below, so each pair is counted once.
+    return np.tri(size, dtype=bool)
+
+
+def _closest_strip(xs, ys, strip, best) -> None:
+    # Compare each strip point with its next few neighbors in y order,
+    # one neighbor offset at a time across the whole strip.
+    sx = xs[strip]
+    sy = ys[strip]
+    for k in range(1, min(_STRIP_NEIGHBORS + 1, len(strip))):
+        dy = sy[k:] - sy[:-k]
+        # y is sorted, so once every gap is too big larger offsets
+        # can't help.
+        if dy.min() * dy.min() >= best[0]:
+            break
+        dx = sx[k:] - sx[:-k]
+        dist = dx * dx + dy * dy
+        if profiling.stats is not None:
+            profiling.count("closest_pair.distance_evaluations", len(dist))
+        i = int(np.argmin(dist))
+        if dist[i] < best[0]:
+            best[:] = [float(dist[i]), int(strip[i]), int(strip[i + k])]
@@ -1,10 +1,40 @@
 # Standard library imports.
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from multiprocessing import shared_memory
+from functools import cmp_to_key
 from operator import itemgetter
-from math import atan2
 
 # Third-party imports.
 import numpy as np
 
+# Personal imports.
+from geocalc_lib import profiling
+from geocalc_lib.shapes.point_set import PointSet, as_coords, point_order
+from geocalc_lib.algorithms.results import HullResult, PairResult
+
+# Integer coordinates below this magnitude have cross products that fit
+# in int64, larger ones fall back to Python ints.
+_EXACT_INT_LIMIT = 2 ** 30
+# Vectorized pruning of a hull chain stops once a pass removes less than
+# this fraction of the candidates, and a stack scan finishes the chain.
+_MIN_PRUNE_FRACTION = 0.01
+# Chan's algorithm starts with groups of this many points, and squares
+# the group size whenever the hull turns out to be larger. Past
+# _CHAN_MAX_GROUP the march costs more than hulling a single group.
+_CHAN_MIN_GROUP = 256
+_CHAN_MAX_GROUP = 2 ** 12
+# method "auto" hulls this many sampled points, and uses Chan's
+# algorithm from _CHAN_MIN_POINTS points on when the sample hull has at
+# most _CHAN_MAX_SAMPLE_HULL vertices.
+_HULL_SAMPLE_SIZE = 1024
+_CHAN_MIN_POINTS = 2 ** 18
+_CHAN_MAX_SAMPLE_HULL = 24
+# Inputs smaller than this are hulled in this process, since starting a
+# pool costs more than hulling them.
+_PARALLEL_MIN_POINTS = 2 ** 16
+
 
 class ConvexHull:
     """
@@ -12,7 +42,7 @@ class ConvexHull:
 
     Attributes
     ----------
-    points : np.array
+    points : np.array or PointSet
         An array of points.
 
     Methods
@@ -21,6 +51,25 @@ class ConvexHull:
         Determine the orientation of the the points.
     graham_scan(points)
         This method will return the convex hull of the points.
+    monotone_chain(points=None, prefilter=False)
+        This method will return the indices of the convex hull
+        vertices in counterclockwise order.
+    chan(points=None, group_size=None)
+        This method will return the same indices as monotone_chain(),
+        in O(n log h) for a hull of h vertices.
+    parallel_hull(points=None, workers=None)
+        This method will return the same indices as monotone_chain(),
+        hulling chunks of the points in a process pool.
+    hull(points=None, method="auto", workers=None)
+        This method will return the hull indices, picking monotone_chain
+        or chan from an estimate of the hull size.
+    vertices(points=None, method="auto", workers=None)
+        This method will return the hull indices of hull() with their
+        coordinates, as a HullResult.
+    farthest_pair(points=None)
+        This method will return the max distance and the index pair of
+        the farthest points as a PairResult, using rotating calipers on
+        the hull.
 
     Usage
     -----
@@ -35,12 +84,21 @@ class ConvexHull:
 
     # Find the convex hull of the points.
     convex_hull = convex_hull_finder.graham_scan(points)
+
+    # Or find the indices of the hull vertices in the array.
+    hull_indices = convex_hull_finder.monotone_chain()
+    hull_points = points[hull_indices]
+
+    # Or both at once.
+    hull_indices, hull_points = convex_hull_finder.vertices()
     """
 
     def __init__(self, points: np.array) -> None:
         self.points = points
 
     def orientation(self, a, b, c) -> int:
+        if profiling.stats is not None:
+            profiling.count("convex_hull.orientation_tests")
         # Determine the orienatation of the the points.
         values = (b[1] - a[1]) * (c[0] - b[0]) - (b[0] - a[0]) * (c[1] - b[1])
         if values == 0:
@@ -51,6 +109,10 @@ class ConvexHull:
             return 2
 
     def graham_scan(self, points) -> list:
+        # Work on (x, y) tuples whatever container was passed in.
+        if isinstance(points, (PointSet, np.ndarray)):
+            points = [tuple(point) for point in as_coords(points).tolist()]
+
         # Ensure the user enters at least 3 points.
         if len(points) < 3:
             return "Not possible for Convex Hull with less than 3 points."
@@ -58,9 +120,18 @@ class ConvexHull:
         # Find the pivot point (minimum y-coordinate in the list).
         pivot = min(points, key=itemgetter(1, 0))
 
-        # Sort the points.
-        sorted_points = sorted(points, key=lambda point: (
-            atan2(point[1] - pivot[1], point[0] - pivot[0]), point))
+        # Sort the points by angle around the pivot, nearer ones first
+        # at equal angles so those collinear with the pivot are popped
+        # below. Angles are compared by cross products, since atan2 can
+        # round equal angles apart.
+        def by_angle(a, b):
+            cross = ((a[0] - pivot[0]) * (b[1] - pivot[1])
+                     - (a[1] - pivot[1]) * (b[0] - pivot[0]))
+            if cross:
+                return -1 if cross > 0 else 1
+            return _squared_distance(pivot, a) - _squared_distance(pivot, b)
+
+        sorted_points = sorted(points, key=cmp_to_key(by_angle))
 
         # Initialize the convex hull with the pivot & 1st two sorted
         # points.
@@ -78,3 +149,526 @@ class ConvexHull:
         # point & make a loop.
         hull.append(pivot)
         return hull
+
+    def monotone_chain(self, points=None, prefilter=False) -> np.ndarray:
+        """
+        Given an (N, 2) array or PointSet, return the indices of its
+        convex hull vertices in counterclockwise order, starting from
+        the leftmost (then lowest) point. Collinear points are left
+        out, a repeated point is reported by its smallest index, and
+        the first vertex is not repeated.
+
+        This is Andrew's monotone chain. Points are sorted once into
+        lexicographic order, which a PointSet keeps until it changes,
+        and integer inputs use exact integer cross products. With
+        prefilter, akl_toussaint_filter() first drops points that are
+        clearly interior.
+        """
+
+        if points is None:
+            points = self.points
+        coords = as_coords(points)
+        if len(coords) == 0:
+            return np.empty(0, dtype=np.intp)
+        if prefilter:
+            survivors = akl_toussaint_filter(coords)
+            return survivors[self.monotone_chain(coords[survivors])]
+
+        order = point_order(points, "lexicographic")
+        xs, ys = _exact_columns(coords[order])
+        # Drop repeated points so only one copy can reach the hull.
+        distinct = np.ones(len(order), dtype=bool)
+        distinct[1:] = (xs[1:] != xs[:-1]) | (ys[1:] != ys[:-1])
+        positions = np.flatnonzero(distinct)
+        # The smallest index among the copies of each point.
+        firsts = np.minimum.reduceat(order, positions)
+        if len(positions) < 3:
+            return firsts
+
+        lower = _half_hull(xs, ys, positions)
+        upper = _half_hull(xs, ys, positions[::-1])
+        hull = np.concatenate((lower[:-1], upper[:-1]))
+        return firsts[np.searchsorted(positions, hull)]
+
+    def chan(self, points=None, group_size=None) -> np.ndarray:
+        """
+        Given an (N, 2) array or PointSet, return the same hull indices
+        as monotone_chain(), using Chan's algorithm.
+
+        The points are split into groups of group_size, and every group
+        is sorted and hulled at once. A Jarvis march then finds each
+        hull vertex with a tangent binary search per group hull, for
+        O(n log h) with h hull vertices. The group size starts at
+        group_size, or 256, and is squared while it is less than h.
+        """
+
+        if points is None:
+            points = self.points
+        coords = as_coords(points)
+        n = len(coords)
+        if n == 0:
+            return np.empty(0, dtype=np.intp)
+        xs, ys = _exact_columns(coords)
+        # The march starts from the leftmost, then lowest, point.
+        leftmost = np.flatnonzero(xs == xs.min())
+        start = int(leftmost[np.argmin(ys[leftmost])])
+
+        size = min(max(group_size or _CHAN_MIN_GROUP, 3), n)
+        while True:
+            hull = _chan_march(coords, xs, ys, start, size)
+            if hull is not None:
+                return hull
+            size = size * size if size * size <= _CHAN_MAX_GROUP else n
+
+    def parallel_hull(self, points=None, workers=None) -> np.ndarray:
+        """
+        Given an (N, 2) array or PointSet, return the same hull indices
+        as monotone_chain(), using a pool of workers processes, by
+        default one per CPU.
+
+        The points are copied once into shared memory and split into a
+        chunk per worker. Each worker hulls its chunk in place, and the
+        union of the chunk hulls, which holds every hull vertex, is
+        hulled again here.
+        """
+
+        if points is None:
+            points = self.points
+        coords = as_coords(points)
+        if workers is None:
+            workers = os.cpu_count() or 1
+        n = len(coords)
+        if workers < 2 or n < _PARALLEL_MIN_POINTS:
+            return self.monotone_chain(points)
+
+        bounds = np.linspace(0, n, workers + 1).astype(np.intp)
+        memory = shared_memory.SharedMemory(create=True,
+                                            size=coords.nbytes)
+        try:
+            shared = np.ndarray(coords.shape, dtype=coords.dtype,
+                                buffer=memory.buf)
+            shared[:] = coords
+            del shared
+            with ProcessPoolExecutor(workers) as executor:
+                hulls = executor.map(_chunk_hull, repeat(memory.name),
+                                     repeat(coords.shape),
+                                     repeat(coords.dtype.str),
+                                     bounds[:-1], bounds[1:])
+                # Sorted, so copies of a point keep their smallest index.
+                candidates = np.sort(np.concatenate(list(hulls)))
+        finally:
+            memory.close()
+            memory.unlink()
+        return candidates[self.monotone_chain(coords[candidates])]
+
+    def hull(self, points=None, method="auto", workers=None) -> np.ndarray:
+        """
+        Given an (N, 2) array or PointSet, return the indices of its
+        convex hull vertices, as ordered by monotone_chain().
+
+        method "monotone" runs monotone_chain(), "chan" runs chan() and
+        "parallel" runs parallel_hull() with workers processes. "auto"
+        hulls an evenly spaced sample first, and uses chan() for large
+        inputs whose sample hull is small.
+        """
+
+        if points is None:
+            points = self.points
+        coords = as_coords(points)
+        if method == "auto":
+            method = _choose_method(coords)
+        if method == "chan":
+            return self.chan(coords, _CHAN_MAX_GROUP)
+        if method == "parallel":
+            return self.parallel_hull(points, workers)
+        if method != "monotone":
+            raise ValueError(f"Unknown convex hull method: {method}")
+        return self.monotone_chain(points)
+
+    def vertices(self, points=None, method="auto",
+                 workers=None) -> HullResult:
+        """
+        Given an (N, 2) array or PointSet, return the indices of its
+        convex hull vertices, as hull() finds them, and their
+        coordinates as a HullResult.
+        """
+
+        if points is None:
+            points = self.points
+        coords = as_coords(points)
+        return HullResult(self.hull(points, method, workers), coords)
+
+    def farthest_pair(self, points=None) -> PairResult:
+        """
+        Given an (N, 2) array or PointSet, return the max distance and
+        the index pair (i, j), i < j, of the farthest points, as a
+        PairResult. Returns (0.0, None) for fewer than 2 points.
+
+        Only hull vertices can be farthest apart, so the points are
+        filtered and hulled first, then rotating calipers walk the
+        antipodal vertex pairs in O(h).
+        """
+
+        if points is None:
+            points = self.points
+        coords = as_coords(points)
+        if len(coords) < 2:
+            return PairResult(0.0, None, coords)
+        hull = self.monotone_chain(coords, prefilter=True)
+        if len(hull) == 1:
+            # Every point is the same point.
+            return PairResult(0.0, (0, 1), coords)
+
+        xs, ys = _exact_columns(coords[hull])
+        x, y = xs.tolist(), ys.tolist()
+        h = len(hull)
+
+        def area(a, b, c):
+            # Twice the area of triangle abc.
+            return ((x[b] - x[a]) * (y[c] - y[a])
+                    - (y[b] - y[a]) * (x[c] - x[a]))
+
+        def squared(a, b):
+            return (x[a] - x[b]) ** 2 + (y[a] - y[b]) ** 2
+
+        best = (squared(0, 1), 0, 1)
+        j = 1
+        for i in range(h):
+            following = (i + 1) % h
+            # Advance j while it moves away from edge (i, i + 1).
+            while area(i, following, (j + 1) % h) > area(i, following, j):
+                j = (j + 1) % h
+            for a in (i, following):
+                candidate = squared(a, j)
+                if candidate > best[0]:
+                    best = (candidate, a, j)
+
+        i, j = sorted((int(hull[best[1]]), int(hull[best[2]])))
+        return PairResult(float(np.sqrt(float(best[0]))), (i, j), coords)
+
+
+def _squared_distance(a, b):
+    return (a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2
+
+
+def _chunk_hull(name, shape, dtype, start, stop) -> np.ndarray:
+    # Hull the chunk start:stop of the points in shared memory name,
+    # returning indices into all of the points.
+    memory = shared_memory.SharedMemory(name=name)
+    try:
+        coords = np.ndarray(shape, dtype=dtype, buffer=memory.buf)
+        hull = ConvexHull(None).monotone_chain(coords[start:stop],
+                                               prefilter=True)
+        del coords
+    finally:
+        memory.close()
+    return hull + start
+
+
+def akl_toussaint_filter(points, directions=8) -> np.ndarray:
+    """
+    Given an (N, 2) array or PointSet, return the sorted indices of the
+    points that are not strictly inside the polygon joining the extreme
+    points in 4 or 8 directions. Every convex hull vertex survives.
+    """
+
+    if directions not in (4, 8):
+        raise ValueError("directions must be 4 or 8")
+    coords = as_coords(points)
+    everything = np.arange(len(coords))
+    if len(coords) < 4:
+        return everything
+    xs, ys = _exact_columns(coords)
+
+    # Extreme points counterclockwise from the +x direction, the
+    # diagonals coming from the extremes of x + y and x - y.
+    if directions == 4:
+        extremes = [np.argmax(xs), np.argmax(ys), np.argmin(xs),
+                    np.argmin(ys)]
+    else:
+        sums, diffs = xs + ys, xs - ys
+        extremes = [np.argmax(xs), np.argmax(sums), np.argmax(ys),
+                    np.argmin(diffs), np.argmin(xs), np.argmin(sums),
+                    np.argmin(ys), np.argmax(diffs)]
+    # Keep one copy of points extreme in several directions.
+    polygon = []
+    for index in extremes:
+        vertex = (xs[index], ys[index])
+        if vertex not in polygon:
+            polygon.append(vertex)
+    if len(polygon) < 3:
+        return everything
+
+    # A point is strictly inside when it is strictly left of every
+    # polygon edge, that is when (end - start) x (p - start) > 0. Float
+    # inputs keep a rounding margin so no hull vertex is dropped.
+    scale = 0
+    if xs.dtype.kind == "f":
+        scale = 8 * np.finfo(float).eps * float(np.abs(coords).max())
+    inside = np.ones(len(coords), dtype=bool)
+    for (x0, y0), (x1, y1) in zip(polygon, polygon[1:] + polygon[:1]):
+        dx, dy = x1 - x0, y1 - y0
+        margin = scale * (abs(dx) + abs(dy))
+        inside &= dx * ys - dy * xs > dx * y0 - dy * x0 + margin
+    return np.flatnonzero(~inside)
+
+
+def _group_order(coords, size) -> np.ndarray:
+    """
+    Return the positions of coords sorted by x then y within each run
+    of size consecutive points.
+    """
+
+    # A single argsort on one key is much faster than np.lexsort, which
+    # is only needed for float inputs with equal x.
+    xs, ys = coords[:, 0], coords[:, 1]
+    if coords.dtype.kind in "iu" and len(coords):
+        low_x, low_y = int(xs.min()), int(ys.min())
+        height = int(ys.max()) - low_y + 1
+        if (int(xs.max()) - low_x + 1) * height < 2 ** 62:
+            keys = (xs.astype(np.int64) - low_x) * height + (ys - low_y)
+            return _sort_groups((keys,), size)
+        return _sort_groups((ys, xs), size)
+    order = _sort_groups((xs,), size)
+    sorted_xs = xs[order]
+    tied = sorted_xs[1:] == sorted_xs[:-1]
+    if size < len(order):
+        tied &= order[1:] // size == order[:-1] // size
+    if np.any(tied):
+        return _sort_groups((ys, xs), size)
+    return order
+
+
+def _sort_groups(keys, size) -> np.ndarray:
+    # Sort each run of size positions by keys, the last key first as in
+    # np.lexsort. The last run is padded with the largest key value.
+    n = len(keys[0])
+    groups = -(-n // size)
+    padded = []
+    for key in keys:
+        if groups * size > n:
+            if key.dtype.kind == "f":
+                largest = np.inf
+            else:
+                largest = np.iinfo(key.dtype).max
+            key = np.concatenate((key, np.full(groups * size - n, largest,
+                                               dtype=key.dtype)))
+        padded.append(key.reshape(groups, size))
+    if len(padded) == 1:
+        order = np.argsort(padded[0], axis=1)
+    else:
+        order = np.lexsort(padded, axis=1)
+    order = (order + np.arange(0, groups * size, size)[:, None]).ravel()
+    return order[order < n]
+
+
+def _choose_method(coords) -> str:
+    # Pick the hull engine from the hull size of an evenly spaced
+    # sample. Chan's march pays per hull vertex, so it only wins on
+    # large inputs with small hulls.
+    n = len(coords)
+    if n < _CHAN_MIN_POINTS:
+        return "monotone"
+    sample = coords[::n // _HULL_SAMPLE_SIZE]
+    if len(ConvexHull(sample).monotone_chain()) > _CHAN_MAX_SAMPLE_HULL:
+        return "monotone"
+    return "chan"
+
+
+def _exact_columns(coords) -> tuple:
+    # Return x and y columns in a dtype whose cross products are exact
+    # for integer inputs.
+    if coords.dtype.kind in "iu":
+        if len(coords) and np.abs(coords).max() >= _EXACT_INT_LIMIT:
+            coords = coords.astype(object)
+        else:
+            coords = coords.astype(np.int64)
+    else:
+        coords = coords.astype(np.float64)
+    return coords[:, 0], coords[:, 1]
+
+
+def _half_hull(xs, ys, chain) -> np.ndarray:
+    """
+    Return the positions of one half of the hull, given the candidate
+    positions in the order the chain is walked.
+    """
+
+    first = np.zeros(len(chain), dtype=bool)
+    first[:1] = True
+    return _group_half_hulls(xs, ys, chain, first)[0]
+
+
+def _group_half_hulls(xs, ys, chain, first) -> tuple:
+    """
+    Like _half_hull(), for several chains laid end to end, where first
+    marks the start of each chain. Return the hull positions and the
+    start of each chain's hull in them.
+    """
+
+    last = np.ones(len(chain), dtype=bool)
+    last[:-1] = first[1:]
+    ends = first | last
+    # A point making a right turn or going straight with its neighbors
+    # can't be a hull vertex, so all of them are dropped in one pass.
+    # The ends of each chain always stay. Repeat until few points drop.
+    while len(chain) > 3:
+        x = xs[chain]
+        y = ys[chain]
+        # Cross product of (b - a) and (c - a) for every consecutive
+        # a, b, c, positive for a left turn.
+        keep = ((x[1:-1] - x[:-2]) * (y[2:] - y[:-2])
+                - (y[1:-1] - y[:-2]) * (x[2:] - x[:-2])) > 0
+        keep |= ends[1:-1]
+        removed = len(keep) - int(np.count_nonzero(keep))
+        if removed:
+            keep = np.concatenate(([True], keep, [True]))
+            chain, first, ends = chain[keep], first[keep], ends[keep]
+        if removed <= _MIN_PRUNE_FRACTION * len(chain):
+            break
+
+    # Finish with the usual stack scan over what is left.
+    x = xs[chain].tolist()
+    y = ys[chain].tolist()
+    hull = []
+    starts = []
+    for k, starting in enumerate(first.tolist()):
+        if starting:
+            starts.append(len(hull))
+            base = len(hull) + 1
+        while len(hull) > base:
+            a, b = hull[-2], hull[-1]
+            if ((x[b] - x[a]) * (y[k] - y[a])
+                    - (y[b] - y[a]) * (x[k] - x[a])) > 0:
+                break
+            hull.pop()
+        hull.append(k)
+    return chain[hull], np.array(starts, dtype=np.intp)
+
+
+def _chan_march(coords, xs, ys, start, size):
+    """
+    Return the hull indices of coords, with exact columns xs and ys,
+    found by a Jarvis march from start over hulls of groups of the
+    given size, or None if the hull has more than size vertices.
+    """
+
+    n = len(coords)
+    chain = _group_order(coords, size)
+    first = np.arange(n) % size == 0
+    # Keep one copy of each point in a group, by its smallest index.
+    x, y = xs[chain], ys[chain]
+    keep = np.ones(n, dtype=bool)
+    keep[1:] = (x[1:] != x[:-1]) | (y[1:] != y[:-1]) | first[1:]
+    runs = np.flatnonzero(keep)
+    chain, first = np.minimum.reduceat(chain, runs), first[runs]
+    last = np.ones(len(chain), dtype=bool)
+    last[:-1] = first[1:]
+
+    # Hull every group at once.
+    lower = _group_half_hulls(xs, ys, chain, first)
+    upper = _group_half_hulls(xs, ys, chain[::-1], last[::-1])
+    if size >= n:
+        # A single group is the hull already.
+        if len(lower[0]) == 1:
+            return lower[0]
+        return np.concatenate((lower[0][:-1], upper[0][:-1]))
+
+    # Lay the upper chains after the lower ones, turned half a turn so
+    # they are lower chains too, and search all of them together.
+    vertices = np.concatenate((lower[0], upper[0]))
+    starts = np.concatenate((lower[1], upper[1] + len(lower[0])))
+    signs = np.repeat([1, -1], [len(lower[1]), len(upper[1])])
+    hx = np.concatenate((xs[lower[0]], -xs[upper[0]]))
+    hy = np.concatenate((ys[lower[0]], -ys[upper[0]]))
+    ends = np.append(starts[1:], len(vertices)) - 1
+    # Both ends of every chain are candidates at each step.
+    corners = np.concatenate((vertices[starts], vertices[ends]))
+    # The searches need x to increase along a chain, so a vertical last
+    # edge is left out. Its far end is a corner anyway.
+    ends -= (ends > starts) & (hx[ends] == hx[np.maximum(ends - 1, 0)])
+    steps = int(np.max(ends - starts) + 1).bit_length()
+
+    hull = [start]
+    for _ in range(size):
+        p = hull[-1]
+        tangents = _group_tangents(hx, hy, starts, ends, signs * xs[p],
+                                   signs * ys[p], steps)
+        candidates = np.concatenate((corners, vertices[tangents]))
+        following = _most_clockwise(xs, ys, p, candidates)
+        if following < 0:
+            # Hull the points as a single group instead, which is what
+            # monotone_chain() does.
+            return _chan_march(coords, xs, ys, start, n)
+        # Back at the start, or at a copy of it in another group.
+        if xs[following] == xs[start] and ys[following] == ys[start]:
+            return np.array(hull, dtype=np.intp)
+        hull.append(following)
+    return None
+
+
+def _group_tangents(x, y, starts, ends, px, py, steps) -> np.ndarray:
+    """
+    Given lower hull chains laid end to end and a point per chain,
+    return for each chain the vertex where it stops being visible from
+    its point, walking it left to right. An edge is visible when the
+    point is right of it or on its line. Searches take steps halvings.
+    """
+
+    last = len(x) - 1
+    # Edges visible from p are a run around the edge below or above p,
+    # so find that edge, then the first edge after it p does not see.
+    above = _lower_bound(starts, ends + 1, steps, lambda k: (
+        x[np.minimum(k, last)] >= px))
+
+    def hidden(k):
+        k = np.minimum(k, last - 1)
+        return ((x[k + 1] - x[k]) * (py - y[k])
+                - (y[k + 1] - y[k]) * (px - x[k])) > 0
+
+    return _lower_bound(np.maximum(above - 1, starts), ends, steps, hidden)
+
+
+def _lower_bound(lo, hi, steps, predicate) -> np.ndarray:
+    # Binary search every range [lo, hi) at once for the first position
+    # where predicate holds, returning hi where it never does.
+    for _ in range(steps):
+        middle = (lo + hi) >> 1
+        found = predicate(middle)
+        hi = np.where(found, middle, hi)
+        lo = np.where(found, lo, np.minimum(middle + 1, hi))
+    return lo
+
+
+def _most_clockwise(xs, ys, p, candidates) -> int:
+    """
+    Return the candidate every other candidate is left of, seen from
+    hull vertex p, taking the farthest of any collinear ones and the
+    smallest index of any copies, or -1 if rounding leaves no such
+    candidate.
+    """
+
+    dx = xs[candidates] - xs[p]
+    dy = ys[candidates] - ys[p]
+    moved = np.flatnonzero((dx != 0) | (dy != 0))
+    if len(moved) == 0:
+        return int(candidates[0])
+    candidates, dx, dy = candidates[moved], dx[moved], dy[moved]
+    # Move to a candidate right of the best one so far until there is
+    # none. Candidates lie within less than a half turn around p, so
+    # this only ever turns clockwise, and visits each candidate once.
+    # Float cross products of nearly collinear candidates need not agree
+    # with each other, though, and can send it round in a cycle.
+    best = 0
+    for _ in range(len(candidates)):
+        cross = dx[best] * dy - dy[best] * dx
+        squared = dx * dx + dy * dy
+        beyond = (cross < 0) | ((cross == 0) & (
+            (squared > squared[best])
+            | ((squared == squared[best])
+               & (candidates < candidates[best]))))
+        if not np.any(beyond):
+            return int(candidates[best])
+        beyond = np.flatnonzero(beyond)
+        best = beyond[np.argmin(cross[beyond])]
+    return -1
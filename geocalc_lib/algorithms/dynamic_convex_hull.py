@@ -0,0 +1,179 @@
+# The hull is kept as its lower and upper chains, each sorted the way
+# Andrew's monotone chain walks them. An inserted point is located in a
+# chain by binary search and only its neighbors are repaired, though
+# inserting into and deleting from a list still shifts the chain, so an
+# update costs O(log n + h) for a hull of h vertices. Removing
+# a hull vertex can uncover any interior point, so that marks the hull
+# stale and the next query rebuilds it once.
+
+# Standard library imports.
+from bisect import bisect_left
+
+# Third-party imports.
+import numpy as np
+
+# Personal imports.
+from geocalc_lib.shapes.point import Point
+from geocalc_lib.shapes.point_set import point_key
+from geocalc_lib.algorithms.convex_hull import ConvexHull
+
+
+class DynamicConvexHull:
+    """
+    A class to represent a convex hull kept up to date as points are
+    added and removed.
+
+    Attributes
+    ----------
+    counts : dict
+        How many times each (x, y) point was added.
+
+    Methods
+    -------
+    add_point(point)
+        Add a Point or (x, y) pair, updating the hull in O(log n + h)
+        for a hull of h vertices.
+    remove_point(point)
+        Remove one copy of a point. Raises ValueError if it is missing.
+    clear()
+        Remove every point.
+    hull()
+        Return the hull vertices as (x, y) tuples in counterclockwise
+        order, starting from the leftmost (then lowest) point.
+
+    Usage
+    -----
+    from geocalc_lib.algorithms.dynamic_convex_hull import (
+        DynamicConvexHull)
+
+    # Initialize the class with some points.
+    tracker = DynamicConvexHull([(0, 0), (4, 0), (0, 4)])
+
+    # Update it as the scene changes and ask for the hull at any time.
+    tracker.add_point((4, 4))
+    tracker.add_point((1, 1))
+    tracker.remove_point((0, 4))
+    vertices = tracker.hull()
+    """
+
+    def __init__(self, points=None) -> None:
+        self.counts = {}
+        self._lower = []
+        self._upper = []
+        self._stale = False
+        self._vertices = None
+        if points is not None:
+            for point in points:
+                key = point_key(point)
+                self.counts[key] = self.counts.get(key, 0) + 1
+            self._stale = True
+
+    def __len__(self) -> int:
+        return sum(self.counts.values())
+
+    def __contains__(self, point) -> bool:
+        return point_key(point) in self.counts
+
+    def add_point(self, point) -> None:
+        """Add a Point or (x, y) pair to the hull."""
+
+        key = point_key(point)
+        count = self.counts.get(key, 0)
+        self.counts[key] = count + 1
+        if count or self._stale:
+            return
+        # A hull that stays the same keeps the cached vertices.
+        changed = _insert(self._lower, key, 1)
+        changed = _insert(self._upper, key, -1) or changed
+        if changed:
+            self._vertices = None
+
+    def remove_point(self, point) -> None:
+        """Remove one copy of a Point or (x, y) pair from the hull."""
+
+        key = point_key(point)
+        count = self.counts.get(key, 0)
+        if not count:
+            raise ValueError(f"{Point(*key)} is not in the hull")
+        if count > 1:
+            self.counts[key] = count - 1
+            return
+        del self.counts[key]
+        if not self._stale and (_find(self._lower, key)
+                                or _find(self._upper, key)):
+            self._stale = True
+
+    def clear(self) -> None:
+        """Remove every point."""
+
+        self.counts.clear()
+        self._lower = []
+        self._upper = []
+        self._stale = False
+        self._vertices = None
+
+    def hull(self) -> list:
+        """
+        Return the hull vertices as (x, y) tuples in counterclockwise
+        order, starting from the leftmost (then lowest) point, like
+        ConvexHull.monotone_chain(). Collinear and duplicate points are
+        left out, and the first vertex is not repeated.
+        """
+
+        if self._stale:
+            self._rebuild()
+        if self._vertices is None:
+            if len(self._lower) == 1:
+                self._vertices = list(self._lower)
+            else:
+                self._vertices = self._lower[:-1] + self._upper[:0:-1]
+        return list(self._vertices)
+
+    def _rebuild(self) -> None:
+        # Hull the distinct points from scratch and split the result at
+        # its lexicographically largest vertex.
+        self._stale = False
+        self._vertices = None
+        keys = list(self.counts)
+        if not keys:
+            self._lower = []
+            self._upper = []
+            return
+        hull = ConvexHull(None).monotone_chain(np.array(keys))
+        vertices = [keys[index] for index in hull]
+        last = vertices.index(max(vertices))
+        self._lower = vertices[:last + 1]
+        self._upper = vertices[:1] + vertices[:last - 1:-1]
+
+
+def _cross(a, b, c):
+    # Cross product of (b - a) and (c - a), positive for a left turn.
+    return (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+
+
+def _find(chain, key) -> bool:
+    k = bisect_left(chain, key)
+    return k < len(chain) and chain[k] == key
+
+
+def _insert(chain, key, sign) -> bool:
+    """
+    Insert key into a lexicographically sorted hull chain whose turns
+    all have the given sign, and return whether the chain changed.
+    """
+
+    k = bisect_left(chain, key)
+    # A point on or beyond the edge it falls under is not a vertex.
+    if 0 < k < len(chain) and sign * _cross(chain[k - 1], chain[k],
+                                            key) >= 0:
+        return False
+    chain.insert(k, key)
+    # Drop the neighbors on either side that no longer turn the right
+    # way.
+    while k >= 2 and sign * _cross(chain[k - 2], chain[k - 1], key) <= 0:
+        del chain[k - 1]
+        k -= 1
+    while (k + 2 < len(chain)
+           and sign * _cross(key, chain[k + 1], chain[k + 2]) <= 0):
+        del chain[k + 1]
+    return True
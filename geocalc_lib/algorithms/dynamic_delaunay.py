@@ -0,0 +1,133 @@
+# Qhull's incremental mode lets new points be added to a triangulation
+# in place, but not removed. Removing a point marks the triangulation
+# stale and the next query rebuilds it once from the remaining points.
+# Incremental mode can't take Qhull's option for cocircular points, so
+# a scene that needs it gets a static triangulation, rebuilt on change.
+
+# Third-party imports.
+import numpy as np
+from scipy.spatial import Delaunay, QhullError
+
+# Personal imports.
+from geocalc_lib.shapes.point import Point
+from geocalc_lib.shapes.point_set import point_key
+
+# Qhull inserts points one at a time, so past this fraction of new
+# points rebuilding from scratch is faster.
+_MAX_INSERT_FRACTION = 1 / 256
+
+
+class DynamicDelaunay:
+    """
+    A class to represent a Delaunay triangulation of a scene kept up to
+    date as points are added and removed.
+
+    Attributes
+    ----------
+    points : list
+        The (x, y) points in the order they were added, which is also
+        their index in the triangulation.
+
+    Methods
+    -------
+    add_point(point)
+        Add a Point or (x, y) pair. It is inserted into the existing
+        triangulation at the next query.
+    remove_point(point)
+        Remove the first copy of a point. Raises ValueError if it is
+        missing.
+    clear()
+        Remove every point.
+    triangulation()
+        Return an up to date scipy.spatial.Delaunay of the points.
+
+    Usage
+    -----
+    from geocalc_lib.algorithms.dynamic_delaunay import DynamicDelaunay
+    from geocalc_lib.algorithms.largest_empty_circle import (
+        LargestEmptyCircle)
+
+    # Initialize the class with some points.
+    tracker = DynamicDelaunay([(0, 0), (4, 0), (0, 4)])
+
+    # Update it as the scene changes and reuse the triangulation.
+    tracker.add_point((4, 4))
+    tracker.add_point((1, 1))
+    lec = LargestEmptyCircle(tracker.points, tracker.triangulation())
+    """
+
+    def __init__(self, points=None) -> None:
+        self.points = []
+        self._delaunay = None
+        # How many of the points the triangulation holds.
+        self._size = 0
+        # Whether the triangulation takes new points in place.
+        self._incremental = False
+        if points is not None:
+            for point in points:
+                self.add_point(point)
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def add_point(self, point) -> None:
+        """Add a Point or (x, y) pair to the triangulation."""
+
+        self.points.append(point_key(point))
+
+    def remove_point(self, point) -> None:
+        """Remove the first copy of a Point or (x, y) pair."""
+
+        key = point_key(point)
+        try:
+            index = self.points.index(key)
+        except ValueError:
+            raise ValueError(f"{Point(*key)} is not in the triangulation")
+        del self.points[index]
+        if index < self._size:
+            self._discard()
+
+    def clear(self) -> None:
+        """Remove every point."""
+
+        self.points = []
+        self._discard()
+
+    def triangulation(self) -> Delaunay:
+        """
+        Return a scipy.spatial.Delaunay of the points, in the order they
+        were added. A few points added since the last call are inserted
+        into it; after a removal or many additions it is rebuilt. Like
+        Delaunay itself, this raises if the points are all collinear.
+        """
+
+        pending = len(self.points) - self._size
+        if pending:
+            if (self._incremental
+                    and pending <= _MAX_INSERT_FRACTION * self._size):
+                new = np.array(self.points[self._size:], dtype=np.float64)
+                self._delaunay.add_points(new)
+            else:
+                self._build()
+            self._size = len(self.points)
+        if self._delaunay is None:
+            raise ValueError("There are no points to triangulate!")
+        return self._delaunay
+
+    def _build(self) -> None:
+        # Start over from every point, incrementally if Qhull can.
+        self._discard()
+        points = np.array(self.points, dtype=np.float64)
+        try:
+            self._delaunay = Delaunay(points, incremental=True)
+            self._incremental = True
+        except QhullError:
+            self._delaunay = Delaunay(points)
+
+    def _discard(self) -> None:
+        # Free Qhull's incremental state along with the triangulation.
+        if self._incremental:
+            self._delaunay.close()
+        self._delaunay = None
+        self._size = 0
+        self._incremental = False
@@ -0,0 +1,234 @@
+# Segments are kept in a hashed uniform grid of their bounding boxes,
+# and the intersecting pairs as a graph of edges between segment ids.
+# A new segment is only tested against the segments sharing its cells,
+# and removing one drops only its own edges, so the intersections of
+# the scene are always ready to read. The few segments too long for
+# the grid are kept aside and tested against every new segment.
+
+# Standard library imports.
+from math import floor
+
+# Third-party imports.
+import numpy as np
+
+# Personal imports.
+from geocalc_lib.shapes.line import Line
+from geocalc_lib.shapes.point import Point
+from geocalc_lib.shapes.segment_set import segment_key
+from geocalc_lib.algorithms.line_segment import (LineSegmentIntersection,
+                                                 _exact_arrays,
+                                                 _segments_intersect)
+
+# Segments whose bounding box covers more cells than this are kept out
+# of the grid.
+_MAX_BOX_CELLS = 64
+
+
+class DynamicLineSegmentIntersection:
+    """
+    A class to represent the intersections of a set of segments kept up
+    to date as segments are added and removed.
+
+    Attributes
+    ----------
+    segments : list
+        The (x1, y1, x2, y2) segments in the order they were added,
+        which is also their index in the results.
+
+    Methods
+    -------
+    add_line(line)
+        Add a Line or (x1, y1, x2, y2) segment, testing it against the
+        segments near it.
+    remove_line(line)
+        Remove the first copy of a segment. Raises ValueError if it is
+        missing.
+    clear()
+        Remove every segment.
+    intersecting_pairs()
+        Return the index pairs of every two segments that intersect.
+    intersections()
+        Return the intersecting pairs and where they meet, like
+        LineSegmentIntersection.intersections().
+
+    Usage
+    -----
+    from geocalc_lib.algorithms.dynamic_line_segment import (
+        DynamicLineSegmentIntersection)
+
+    # Initialize the class with some segments.
+    tracker = DynamicLineSegmentIntersection([(0, 0, 4, 4), (0, 4, 4, 0)])
+
+    # Update it as the scene changes and read the results at any time.
+    tracker.add_line((2, 0, 2, 5))
+    tracker.remove_line((0, 0, 4, 4))
+    pairs = tracker.intersecting_pairs()
+    """
+
+    def __init__(self, segments=None) -> None:
+        self.clear()
+        if segments is not None:
+            for segment in segments:
+                self.add_line(segment)
+
+    def __len__(self) -> int:
+        return len(self.segments)
+
+    def add_line(self, line) -> None:
+        """Add a Line or (x1, y1, x2, y2) segment."""
+
+        row = segment_key(line)
+        if len(self.segments) >= 2 * self._sized_for:
+            self._resize(row)
+        segment_id = self._next_id
+        self._next_id += 1
+
+        # Test the segment against those sharing a cell with it, or
+        # against all of them if it is too long for the grid.
+        box = self._box(row)
+        if _box_size(box) > _MAX_BOX_CELLS:
+            candidates = set(self._rows)
+        else:
+            candidates = set(self._long)
+            for cell in _cells(box):
+                candidates.update(self._cells.get(cell, ()))
+        neighbors = set()
+        if candidates:
+            candidates = list(candidates)
+            first, second = _exact_arrays(
+                np.array([row]), np.array([self._rows[k] for k in candidates]))
+            hits = np.flatnonzero(_segments_intersect(first, second))
+            neighbors = {candidates[k] for k in hits}
+        for other in neighbors:
+            self._edges[other].add(segment_id)
+
+        self.segments.append(row)
+        self._ids.append(segment_id)
+        self._rows[segment_id] = row
+        self._edges[segment_id] = neighbors
+        self._insert(segment_id, box)
+        self._pairs = None
+        self._intersections = None
+
+    def remove_line(self, line) -> None:
+        """Remove the first copy of a Line or (x1, y1, x2, y2) segment."""
+
+        row = segment_key(line)
+        try:
+            index = self.segments.index(row)
+        except ValueError:
+            raise ValueError(f"{_as_line(row)} is not in the set")
+        segment_id = self._ids[index]
+        del self.segments[index]
+        del self._ids[index]
+        del self._rows[segment_id]
+        for other in self._edges.pop(segment_id):
+            self._edges[other].discard(segment_id)
+        self._long.discard(segment_id)
+        box = self._boxes.pop(segment_id)
+        if _box_size(box) <= _MAX_BOX_CELLS:
+            for cell in _cells(box):
+                self._cells[cell].discard(segment_id)
+                if not self._cells[cell]:
+                    del self._cells[cell]
+        self._pairs = None
+        self._intersections = None
+
+    def clear(self) -> None:
+        """Remove every segment."""
+
+        self.segments = []
+        # Stable ids of the segments, in the same order.
+        self._ids = []
+        self._next_id = 0
+        self._rows = {}
+        self._edges = {}
+        # The grid, as cell -> ids and id -> covered cell range, and
+        # the ids too long for it.
+        self._cell = None
+        self._cells = {}
+        self._boxes = {}
+        self._long = set()
+        # Segment count the cell size was last picked for.
+        self._sized_for = 0
+        self._pairs = None
+        self._intersections = None
+
+    def intersecting_pairs(self) -> np.ndarray:
+        """
+        Return a (K, 2) array of the index pairs (i < j) of every two
+        segments that intersect, read from the cached intersection
+        graph.
+        """
+
+        if self._pairs is None:
+            position = {segment_id: k for k, segment_id in enumerate(
+                self._ids)}
+            pairs = [(position[a], position[b])
+                     for a, neighbors in self._edges.items()
+                     for b in neighbors if position[a] < position[b]]
+            pairs = np.array(pairs, dtype=np.intp).reshape(-1, 2)
+            self._pairs = pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+        return self._pairs.copy()
+
+    def intersections(self, exact=False) -> tuple:
+        """
+        Return the intersecting index pairs and a (K, 4) array of where
+        each pair meets, as LineSegmentIntersection.intersections()
+        does. Float results are cached until the segments change.
+        """
+
+        if exact:
+            return self._locate(exact=True)
+        if self._intersections is None:
+            self._intersections = self._locate(exact=False)
+        pairs, where = self._intersections
+        return pairs.copy(), where.copy()
+
+    def _locate(self, exact) -> tuple:
+        segments = np.array(self.segments).reshape(-1, 4)
+        return LineSegmentIntersection(segments).intersections(
+            pairs=self.intersecting_pairs(), exact=exact)
+
+    def _resize(self, row) -> None:
+        # Pick the cell size from the median segment extent, and rebuild
+        # the grid. This happens each time the segment count doubles.
+        extents = [max(abs(x2 - x1), abs(y2 - y1))
+                   for x1, y1, x2, y2 in self.segments + [row]]
+        self._cell = float(np.median(extents)) or 1.0
+        self._sized_for = len(extents)
+        self._cells = {}
+        self._boxes = {}
+        self._long = set()
+        for segment_id in self._ids:
+            self._insert(segment_id, self._box(self._rows[segment_id]))
+
+    def _box(self, row) -> tuple:
+        # The range of cells covered by the segment's bounding box.
+        x1, y1, x2, y2 = row
+        cell = self._cell
+        return (floor(min(x1, x2) / cell), floor(min(y1, y2) / cell),
+                floor(max(x1, x2) / cell), floor(max(y1, y2) / cell))
+
+    def _insert(self, segment_id, box) -> None:
+        self._boxes[segment_id] = box
+        if _box_size(box) > _MAX_BOX_CELLS:
+            self._long.add(segment_id)
+            return
+        for cell in _cells(box):
+            self._cells.setdefault(cell, set()).add(segment_id)
+
+
+def _box_size(box) -> int:
+    x0, y0, x1, y1 = box
+    return (x1 - x0 + 1) * (y1 - y0 + 1)
+
+
+def _cells(box):
+    # Every cell in an inclusive range of cells.
+    x0, y0, x1, y1 = box
+    return ((x, y) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1))
+
+
+def _as_line(row) -> Line:
+    return Line(Point(row[0], row[1]), Point(row[2], row[3]))
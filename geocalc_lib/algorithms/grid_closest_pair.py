@@ -0,0 +1,224 @@
+# This solution follows Rabin's randomized closest pair algorithm, as
+# simplified by Khuller and Matias: a random sample bounds the answer
+# and a grid of that cell size leaves only neighboring cells to check.
+
+# Third-party imports.
+import numpy as np
+
+# Personal imports.
+from geocalc_lib.shapes.point_set import as_coords
+from geocalc_lib.algorithms.results import PairResult
+
+# Problems at or below this size are solved by brute force.
+_BRUTE_FORCE_SIZE = 256
+# Upper bound on grid cells along an axis, so cell keys fit in int64.
+_MAX_CELLS_PER_AXIS = 2 ** 30
+# Upper bound on candidate pairs held in memory at once.
+_CHUNK_SIZE = 2 ** 20
+# Offsets of the cells checked from each cell, so every pair of
+# adjacent cells is visited exactly once.
+_NEIGHBOR_OFFSETS = ((0, 0), (0, 1), (1, -1), (1, 0), (1, 1))
+
+
+class GridClosestPair:
+    """
+    A class to represent the grid hashing closest pair algorithm, which
+    runs in expected O(n) time.
+
+    Attributes
+    ----------
+    points : np.ndarray
+        An (N, 2) array of points, shared with the PointSet passed in.
+    rng : np.random.Generator
+        The random generator used to draw samples.
+
+    Methods
+    -------
+    pairs_within(r)
+        Return every pair of points at most r apart and their
+        distances.
+    closest_pair()
+        Return the min distance and the index pair of the closest
+        points, as a PairResult.
+
+    Usage
+    -----
+    import numpy as np
+    from geocalc_lib.algorithms.grid_closest_pair import GridClosestPair
+
+    # Example points.
+    points = np.array([[1, 2], [3, 4], [1, 3], [2, 5], [6, 1]])
+
+    # Initialize the class with the points.
+    grid = GridClosestPair(points, seed=0)
+
+    # Find the closest pair and every pair within distance 2.
+    min_distance, (i, j) = grid.closest_pair()
+    pairs, distances = grid.pairs_within(2)
+    """
+
+    def __init__(self, points, seed=None) -> None:
+        self.points = as_coords(points)
+        self.rng = np.random.default_rng(seed)
+
+    def pairs_within(self, r: float) -> tuple:
+        """
+        Return a (K, 2) array of index pairs (i < j) of the points at
+        most r apart, and a (K,) array of their distances.
+        """
+
+        if r < 0:
+            raise ValueError("Radius must be non-negative!")
+        pairs = []
+        distances = []
+        # Widen the squared bound by a rounding error, then compare the
+        # distances themselves so a pair exactly r apart is kept.
+        r_squared = r * r * (1 + 4 * np.finfo(float).eps)
+        for first, second, squared in _grid_pairs(self.points, r,
+                                                  r_squared):
+            dist = np.sqrt(squared)
+            keep = dist <= r
+            pairs.append(np.column_stack((first[keep], second[keep])))
+            distances.append(dist[keep])
+        if not pairs:
+            return np.empty((0, 2), dtype=np.intp), np.empty(0)
+        pairs = np.concatenate(pairs)
+        # Report pairs in a stable (i, j) order.
+        order = np.lexsort((pairs[:, 1], pairs[:, 0]))
+        return pairs[order], np.concatenate(distances)[order]
+
+    def closest_pair(self) -> PairResult:
+        """
+        Return the min distance and the index pair (i, j), i < j, of the
+        closest points, as a PairResult.
+
+        The closest pair of a random sample of n^(2/3) points, found
+        recursively, bounds the answer. A grid with that cell size then
+        needs an expected O(n) distance checks.
+        """
+
+        coords = self.points
+        n = len(coords)
+        if n < 2:
+            return PairResult(float("inf"), None, coords)
+        if n <= _BRUTE_FORCE_SIZE:
+            return PairResult(*_brute_force(coords), coords)
+
+        sample = self.rng.choice(n, size=max(2, int(n ** (2 / 3))),
+                                 replace=False)
+        dist, (i, j) = GridClosestPair(coords[sample],
+                                       seed=self.rng).closest_pair()
+        best = [_squared_distance(coords, sample[i], sample[j]),
+                int(sample[i]), int(sample[j])]
+        if best[0] > 0:
+            for first, second, squared in _grid_pairs(coords, dist,
+                                                      best[0]):
+                k = int(np.argmin(squared))
+                if squared[k] < best[0]:
+                    best = [float(squared[k]), int(first[k]),
+                            int(second[k])]
+
+        i, j = sorted(best[1:])
+        return PairResult(float(np.sqrt(best[0])), (i, j), coords)
+
+
+def _squared_distance(coords, i, j) -> float:
+    dx = float(coords[i, 0]) - float(coords[j, 0])
+    dy = float(coords[i, 1]) - float(coords[j, 1])
+    return dx * dx + dy * dy
+
+
+def _brute_force(coords) -> tuple:
+    # Compare every pair at once for small inputs.
+    coords = coords.astype(np.float64)
+    dx = coords[:, None, 0] - coords[None, :, 0]
+    dy = coords[:, None, 1] - coords[None, :, 1]
+    dist = dx * dx + dy * dy
+    dist[np.tri(len(coords), dtype=bool)] = np.inf
+    i, j = divmod(int(np.argmin(dist)), len(coords))
+    return float(np.sqrt(dist[i, j])), (i, j)
+
+
+def _grid_pairs(coords, r, r_squared):
+    """
+    Yield chunks of (first, second, squared_distance) arrays for every
+    pair of points whose squared distance is at most r_squared, using a
+    grid of cells at least r wide. first < second in each pair.
+    """
+
+    n = len(coords)
+    if n < 2:
+        return
+    coords = coords.astype(np.float64)
+    low = coords.min(axis=0)
+    span = float((coords.max(axis=0) - low).max())
+    # Pad the cell size so rounding can't put a pair two cells apart,
+    # and cap the cell count so keys fit in int64.
+    cell = max(r * (1 + 1e-9), span / _MAX_CELLS_PER_AXIS)
+    if cell == 0:
+        cell = 1.0
+    cells = np.floor((coords - low) / cell).astype(np.int64)
+
+    # Hash each cell to one integer key, with a spare row on each side
+    # so neighbor keys never wrap. Sorting groups points by cell.
+    width = int(cells[:, 1].max()) + 3
+    keys = cells[:, 0] * width + cells[:, 1] + 1
+    order = np.argsort(keys, kind="stable")
+    keys = keys[order]
+    coords = coords[order]
+    cell_keys, starts, counts = np.unique(keys, return_index=True,
+                                          return_counts=True)
+
+    for dx, dy in _NEIGHBOR_OFFSETS:
+        if (dx, dy) == (0, 0):
+            first_cells = np.flatnonzero(counts > 1)
+            second_cells = first_cells
+        else:
+            target = cell_keys + dx * width + dy
+            found = np.searchsorted(cell_keys, target)
+            found = np.minimum(found, len(cell_keys) - 1)
+            first_cells = np.flatnonzero(cell_keys[found] == target)
+            second_cells = found[first_cells]
+        for first, second in _expand_cell_pairs(
+                starts[first_cells], counts[first_cells],
+                starts[second_cells], counts[second_cells],
+                same_cell=(dx, dy) == (0, 0)):
+            diff = coords[first] - coords[second]
+            squared = diff[:, 0] * diff[:, 0] + diff[:, 1] * diff[:, 1]
+            keep = squared <= r_squared
+            if np.any(keep):
+                first = order[first[keep]]
+                second = order[second[keep]]
+                yield (np.minimum(first, second),
+                       np.maximum(first, second), squared[keep])
+
+
+def _expand_cell_pairs(first_starts, first_counts, second_starts,
+                       second_counts, same_cell):
+    """
+    Yield (first, second) sorted positions for every point pair between
+    the given cell pairs, in chunks of about _CHUNK_SIZE pairs.
+    """
+
+    sizes = first_counts * second_counts
+    ends = np.cumsum(sizes)
+    start = 0
+    while start < len(sizes):
+        offset = ends[start] - sizes[start]
+        stop = int(np.searchsorted(ends, offset + _CHUNK_SIZE,
+                                   side="right"))
+        stop = max(stop, start + 1)
+        chunk = slice(start, stop)
+        chunk_sizes = sizes[chunk]
+        group = np.repeat(np.arange(len(chunk_sizes)), chunk_sizes)
+        local = (np.arange(int(chunk_sizes.sum()))
+                 - np.repeat(np.cumsum(chunk_sizes) - chunk_sizes,
+                             chunk_sizes))
+        columns = second_counts[chunk][group]
+        first = first_starts[chunk][group] + local // columns
+        second = second_starts[chunk][group] + local % columns
+        if same_cell:
+            keep = first < second
+            first, second = first[keep], second[keep]
+        yield first, second
+        start = stop
@@ -3,7 +3,16 @@ import unittest
 
 # Third-party imports.
 import numpy as np
-from scipy.spatial import Delaunay
+from scipy.spatial import Delaunay, cKDTree
+
+# Personal imports.
+from geocalc_lib import profiling
+from geocalc_lib.shapes.point_set import as_coords
+from geocalc_lib.algorithms.convex_hull import ConvexHull
+from geocalc_lib.algorithms.results import CircleResult
+
+# Upper bound on point-edge pairs tested at once against a polygon.
+_CHUNK_SIZE = 2 ** 20
 
 
 class LargestEmptyCircle:
@@ -13,20 +22,29 @@ class LargestEmptyCircle:
     Attributes
     ----------
     points : np.array
-        An array of points.
+        An (N, 2) array of points, shared with the PointSet passed in.
     delaunay : scipy.spatial.Delaunay
-        A Delaunay triangulation of the points.
+        A Delaunay triangulation of the points, either passed in, for
+        example from a DynamicDelaunay, or built from them.
 
     Methods
     -------
-    find_largest_empty_circle()
+    circumcircles()
+        This method will return the centers and radii of the
+        circumcircles of every Delaunay triangle.
+    find_largest_empty_circle(within=None)
         This method will return the center and radius of the largest
-        empty circle.
+        empty circle as a CircleResult, optionally with its center
+        inside the convex hull or a polygon.
+    find_largest_empty_circles(k, within=None)
+        This method will return the centers and radii of the k largest
+        empty circles as a CircleResult, largest first.
 
     Usage
     -----
     import numpy as np
     from geocalc-lib import LargestEmptyCircle
+    from geocalc_lib.algorithms.dynamic_delaunay import DynamicDelaunay
 
     # Example points.
     points = np.array([[1, 2], [3, 4], [1, 3], [2, 5], [6, 1]])
@@ -36,45 +54,233 @@ class LargestEmptyCircle:
 
     # Find the largest empty circle.
     center, radius = lec.find_largest_empty_circle()
+
+    # Or the three largest ones.
+    centers, radii = lec.find_largest_empty_circles(3)
+
+    # Or the largest one centered inside the convex hull of the points.
+    center, radius = lec.find_largest_empty_circle(within="hull")
+
+    # The indices of the points on the circle.
+    corners = lec.find_largest_empty_circle().sites
+
+    # A triangulation kept up to date elsewhere can be reused.
+    tracker = DynamicDelaunay(points)
+    lec = LargestEmptyCircle(points, tracker.triangulation())
+    """
+
+    def __init__(self, points, delaunay=None) -> None:
+        self.points = as_coords(points)
+        if delaunay is None:
+            delaunay = Delaunay(self.points)
+        elif len(delaunay.points) != len(self.points):
+            raise ValueError("The triangulation is of different points!")
+        self.delaunay = delaunay
+
+    def circumcircles(self) -> tuple:
+        """
+        Return an (M, 2) array of the circumcenters and an (M,) array of
+        the circumradii of the M Delaunay triangles. A degenerate
+        triangle has a radius of nan.
+
+        No point lies inside the circumcircle of a Delaunay triangle, so
+        every one of them is an empty circle.
+        """
+
+        simplices = self.delaunay.simplices
+        if profiling.stats is not None:
+            profiling.count("largest_empty_circle.simplices_visited",
+                            len(simplices))
+        xs = self.points[:, 0].astype(np.float64)
+        ys = self.points[:, 1].astype(np.float64)
+        # Work relative to the first vertex of each triangle, which
+        # keeps the products small.
+        x0, y0 = xs[simplices[:, 0]], ys[simplices[:, 0]]
+        ax, ay = xs[simplices[:, 1]] - x0, ys[simplices[:, 1]] - y0
+        bx, by = xs[simplices[:, 2]] - x0, ys[simplices[:, 2]] - y0
+        a_squared = ax * ax + ay * ay
+        b_squared = bx * bx + by * by
+        denominator = 2 * (ax * by - ay * bx)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ux = (by * a_squared - ay * b_squared) / denominator
+            uy = (ax * b_squared - bx * a_squared) / denominator
+        radii = np.hypot(ux, uy)
+        radii[denominator == 0] = np.nan
+        return np.column_stack((x0 + ux, y0 + uy)), radii
+
+    def find_largest_empty_circle(self, within=None) -> CircleResult:
+        """
+        Return the center and radius of the largest empty circle, with
+        the indices of the points on it, as a CircleResult.
+
+        With within=None this is the largest circumcircle of the
+        Delaunay triangles, wherever its center is. within="hull" keeps
+        the center inside the convex hull of the points, and an (K, 2)
+        array or PointSet of polygon vertices keeps it inside that
+        polygon.
+        """
+
+        centers, radii, sites = self._candidates(within)
+        best = int(np.nanargmax(radii))
+        return CircleResult(centers[best], radii[best], sites[best],
+                            self.points)
+
+    def find_largest_empty_circles(self, k: int,
+                                   within=None) -> CircleResult:
+        """
+        Return a (k, 2) array of centers and a (k,) array of radii of
+        the k largest empty circles, largest first, with centers
+        restricted by within as in find_largest_empty_circle(), as a
+        CircleResult. Fewer are returned if there are fewer candidates.
+        """
+
+        if k < 0:
+            raise ValueError("k must be non-negative!")
+        centers, radii, sites = self._candidates(within)
+        # Degenerate triangles sort last.
+        keys = np.where(np.isnan(radii), np.inf, -radii)
+        k = min(k, int(np.count_nonzero(~np.isnan(radii))))
+        top = np.argpartition(keys, k - 1)[:k] if k else np.empty(0, int)
+        top = top[np.argsort(keys[top], kind="stable")]
+        return CircleResult(centers[top], radii[top], sites[top],
+                            self.points)
+
+    def _candidates(self, within) -> tuple:
+        """
+        Return the centers, radii and (M, 3) site indices of the
+        circles find_* pick from.
+
+        Inside a Voronoi cell the empty radius is the distance to the
+        cell's point, which is largest at a corner of the cell clipped
+        to the polygon. So the candidates are the Voronoi vertices, the
+        circumcenters, inside the polygon, the points where the polygon
+        boundary crosses Voronoi edges, and the polygon vertices.
+        """
+
+        centers, radii = self.circumcircles()
+        simplices = self.delaunay.simplices
+        if within is None:
+            return centers, radii, simplices
+        if isinstance(within, str):
+            if within != "hull":
+                raise ValueError(f"Unknown region: {within}")
+            hull = ConvexHull(self.points).monotone_chain()
+            polygon = self.points[hull].astype(np.float64)
+            inside = _inside_convex(centers, polygon)
+        else:
+            polygon = as_coords(within).astype(np.float64)
+            if len(polygon) < 3:
+                raise ValueError("A polygon needs at least 3 vertices!")
+            inside = _inside_polygon(centers, polygon)
+        inside &= ~np.isnan(radii)
+
+        # Repeated points may be left out of the triangulation, so only
+        # its vertices are searched. Their copies are just as near.
+        sites = np.unique(simplices)
+        tree = cKDTree(self.points[sites])
+        boundary = self._boundary_crossings(polygon, sites, tree)
+        distances, nearest = tree.query(boundary)
+        # A boundary circle only touches the point it is nearest to.
+        touching = np.full((len(boundary), 3), -1, dtype=np.intp)
+        touching[:, 0] = sites[nearest]
+        return (np.concatenate((centers[inside], boundary)),
+                np.concatenate((radii[inside], distances)),
+                np.concatenate((simplices[inside], touching)))
+
+    def _boundary_crossings(self, polygon, sites, tree) -> np.ndarray:
+        """
+        Return the polygon vertices and every point where a polygon
+        edge crosses from one Voronoi cell into another.
+
+        Each edge is walked from its start through the cells it
+        crosses. The next cell is the Delaunay neighbor whose bisector
+        with the current point is crossed first, so the walk costs the
+        number of cells crossed times their degree.
+        """
+
+        points = self.points.astype(np.float64)
+        squared = np.sum(points * points, axis=1)
+        indptr, neighbors = self.delaunay.vertex_neighbor_vertices
+        starts = sites[tree.query(polygon)[1]]
+
+        crossings = [polygon]
+        for k, start in enumerate(polygon):
+            direction = polygon[(k + 1) % len(polygon)] - start
+            site = starts[k]
+            t = 0.0
+            while True:
+                near = neighbors[indptr[site]:indptr[site + 1]]
+                # Along the edge, g(t) = |p - q|^2 - |p - s|^2 is linear
+                # and neighbor q becomes closer than site s once it
+                # turns negative.
+                offset = points[site] - points[near]
+                g0 = 2 * offset @ start + squared[near] - squared[site]
+                g1 = 2 * offset @ direction
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    ts = np.where(g1 < 0, -g0 / g1, np.inf)
+                ts[ts <= t] = np.inf
+                if len(ts) == 0 or ts.min() >= 1:
+                    break
+                # Of neighbors crossed together, take the one that gets
+                # closer fastest.
+                first = np.flatnonzero(ts == ts.min())
+                site = near[first[np.argmin(g1[first])]]
+                t = float(ts[first[0]])
+                if profiling.stats is not None:
+                    profiling.count("largest_empty_circle.cells_walked")
+                crossings.append((start + t * direction)[None])
+        return np.concatenate(crossings)
+
+
+def _inside_convex(points, polygon) -> np.ndarray:
+    """
+    Return whether each point is inside or on the convex polygon, given
+    counterclockwise from its leftmost (then lowest) vertex, by a
+    binary search over the wedges around that vertex.
+    """
+
+    if len(polygon) < 3:
+        return np.zeros(len(points), dtype=bool)
+    origin = polygon[0]
+    # Seen from the leftmost vertex, the others are in increasing angle
+    # within a half turn.
+    angles = np.arctan2(*(polygon[1:] - origin).T[::-1])
+    offsets = points - origin
+    wedge = np.searchsorted(angles, np.arctan2(offsets[:, 1],
+                                               offsets[:, 0]))
+    wedge = np.clip(wedge, 1, len(polygon) - 2)
+    a, b = polygon[wedge], polygon[wedge + 1]
+    cross = ((b[:, 0] - a[:, 0]) * (points[:, 1] - a[:, 1])
+             - (b[:, 1] - a[:, 1]) * (points[:, 0] - a[:, 0]))
+    first = polygon[1] - origin
+    last = polygon[-1] - origin
+    # Also stay within the wedge of all the vertices.
+    return ((cross >= 0)
+            & (first[0] * offsets[:, 1] - first[1] * offsets[:, 0] >= 0)
+            & (offsets[:, 0] * last[1] - offsets[:, 1] * last[0] >= 0))
+
+
+def _inside_polygon(points, polygon) -> np.ndarray:
+    """
+    Return whether each point is inside the simple polygon, counting the
+    polygon edges a ray to its right crosses. Blocks of points are
+    tested against every edge at once.
     """
 
-    def __init__(self, points) -> None:
-        self.points = np.array(points)
-        self.delaunay = Delaunay(points)
-
-    def find_largest_empty_circle(self) -> tuple:
-        max_radius = 0
-        best_circle = None
-
-        for simplex in self.delaunay.simplices:
-            # Calculate the circumcenter and radius of the circumcircle
-            # for each simplex (triangle).
-            pts = self.points[simplex, :]
-            A = np.linalg.det(np.c_[pts, np.ones((3, 1))])
-            center = np.linalg.det(np.c_[np.sum(pts*pts, axis=1),
-                                   pts[:, 1],
-                                   np.ones((3, 1))])
-            center = np.array([center,
-                               np.linalg.det(np.c_[pts[:, 0],
-                                             np.sum(pts*pts, axis=1),
-                                             np.ones((3, 1))])]) / (2.0 * A)
-
-            radius = np.sqrt(np.sum(np.square(pts[0] - center)))
-
-            # Check if the circle is empty and larger than the current
-            # largest. Exclude simplex vertices from the check.
-            simplex_points = set(tuple(point) for point in pts)
-            other_points = []
-            for p in self.points:
-                if tuple(p) not in simplex_points:
-                    other_points.append(p)
-
-            if radius > max_radius:
-                if all(np.linalg.norm(p - center) > radius for p in other_points):
-                    max_radius = radius
-                best_circle = (center, radius)
-
-        return best_circle
+    x0, y0 = polygon[:, 0], polygon[:, 1]
+    x1, y1 = np.roll(x0, -1), np.roll(y0, -1)
+    inside = np.zeros(len(points), dtype=bool)
+    block = max(1, _CHUNK_SIZE // len(polygon))
+    for lo in range(0, len(points), block):
+        px = points[lo:lo + block, 0, None]
+        py = points[lo:lo + block, 1, None]
+        # Edges straddling the horizontal line through the point.
+        straddles = (y0 > py) != (y1 > py)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            crossing_x = x0 + (py - y0) * (x1 - x0) / (y1 - y0)
+        crosses = straddles & (px < crossing_x)
+        inside[lo:lo + block] = np.count_nonzero(crosses, axis=1) % 2 == 1
+    return inside
 
 
 class TestLargestEmptyCircle(unittest.TestCase):
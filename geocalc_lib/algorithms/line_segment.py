@@ -1,9 +1,37 @@
 # This solution is inspired by Geeksforgeeks solution :
 # https://www.geeksforgeeks.org/check-if-two-given-line-segments-intersect/
 
+# Standard library imports.
+from fractions import Fraction
+from heapq import heappop, heappush
+
 # Thid-party imports.
 import numpy as np
 
+# Personal imports.
+from geocalc_lib import profiling
+from geocalc_lib.shapes.segment_set import as_segments
+from geocalc_lib.algorithms.grid_closest_pair import _expand_cell_pairs
+from geocalc_lib.spatial.rtree import RTree
+
+# Integer coordinates at or above this size switch orientation tests to
+# Python ints, whose products can't overflow.
+_EXACT_INT_LIMIT = 2 ** 30
+# Upper bound on segment pairs tested at once.
+_CHUNK_SIZE = 2 ** 20
+# Below this many segments, testing every pair is fastest.
+_BRUTE_FORCE_SIZE = 256
+# Segments whose median extent is more than this fraction of the scene
+# share most grid cells, so brute force is used instead.
+_MAX_GRID_EXTENT = 1 / 16
+# Grid cells are widened until the segments cover at most this many
+# cells each on average.
+_MAX_CELLS_PER_SEGMENT = 8
+# Upper bound on grid cells along an axis, so cell keys fit in int64.
+_MAX_CELLS_PER_AXIS = 2 ** 30
+# Segments looked up in the R-tree at once.
+_RTREE_QUERY_SIZE = 2 ** 12
+
 
 class LineSegmentIntersection:
     """
@@ -11,8 +39,8 @@ class LineSegmentIntersection:
 
     Attributes
     ----------
-    points : np.array
-        An array of points.
+    points : np.array or SegmentSet
+        An array of points, or the segments to test.
 
     Methods
     -------
@@ -25,6 +53,19 @@ class LineSegmentIntersection:
     do_intersect(p1, q1, p2, q2)
         Given two line segments p1q1 and p2q2, the function checks if
         they intersect.
+    intersecting_pairs(segments, method="auto")
+        Given a SegmentSet or (N, 4) array, return the index pairs of
+        every two segments that intersect.
+    batch_intersect(first, second, chunked=False)
+        Given two SegmentSets or (N, 4) and (M, 4) arrays, test every
+        segment of one against every segment of the other at once.
+    bentley_ottmann(segments)
+        Given a SegmentSet or (N, 4) array, return the index pairs of
+        every two segments that intersect and a point where they do,
+        in O((n + k) log n) time for k intersecting pairs.
+    intersections(segments, pairs=None, exact=False, method="auto")
+        Return the intersecting index pairs with their crossing points
+        or, for collinear overlaps, the shared pieces.
 
     Usage
     -----
@@ -39,6 +80,10 @@ class LineSegmentIntersection:
 
     # Find the line segment intersection.
     intersect = lsi.do_intersect(points[0], points[1], points[2], points[3])
+
+    # Or sweep a whole set of segments at once.
+    lsi = LineSegmentIntersection(SegmentSet([[0, 0, 4, 4], [0, 4, 4, 0]]))
+    pairs, crossings = lsi.bentley_ottmann()
     """
 
     def __init__(self, points: np.array) -> None:
@@ -51,11 +96,11 @@ class LineSegmentIntersection:
         """
 
         # Check if q is horizontally between p and r (inclusive)
-        horizontal = ((p.coords[0] <= q.coords[0] <= r.coords[0]) or
-                      (r.coords[0] <= q.coords[0] <= p.coords[0]))
+        horizontal = ((p.x <= q.x <= r.x) or
+                      (r.x <= q.x <= p.x))
         # Check if q is vertically between p and r (inclusive)
-        vertical = ((p.coords[1] <= q.coords[1] <= r.coords[1]) or
-                    (r.coords[1] <= q.coords[1] <= p.coords[1]))
+        vertical = ((p.y <= q.y <= r.y) or
+                    (r.y <= q.y <= p.y))
         # if q both horizontally and vertically in range, return
         return horizontal and vertical
 
@@ -70,6 +115,8 @@ class LineSegmentIntersection:
         # If val > 0 -> clockwise (returns 1).
         # If val < 0 -> counterclockwise (returns 2).
         # If val is zero -> collinear (returns 0).
+        if profiling.stats is not None:
+            profiling.count("line_segment.orientation_tests")
         val = np.cross(q.coords - p.coords, r.coords - q.coords)
         return 1 if (val > 0) else (2 if val < 0 else 0)
 
@@ -104,3 +151,510 @@ class LineSegmentIntersection:
 
         # Otherwise ret false.
         return False
+
+    def intersecting_pairs(self, segments=None,
+                           method="auto") -> np.ndarray:
+        """
+        Given a SegmentSet or (N, 4) array of segments, return a (K, 2)
+        array of the index pairs (i < j) of every two segments that
+        intersect.
+
+        method "brute" tests each segment against all later segments in
+        one vectorized step. method "grid" only tests segments whose
+        bounding boxes share a cell of a uniform grid, which suits many
+        short segments. method "rtree" only tests segments whose
+        bounding boxes overlap, found with an RTree, which copes with
+        segments of very different lengths. method "sweep" uses
+        bentley_ottmann(), which suits long segments that rarely cross.
+        "auto" picks the grid unless the input is small or its segments
+        are long.
+        """
+
+        if segments is None:
+            segments = self.points
+        coords = as_segments(segments)
+        if method == "auto":
+            method = _choose_method(coords)
+        if method == "sweep":
+            return self.bentley_ottmann(coords)[0]
+        if method not in ("brute", "grid", "rtree"):
+            raise ValueError(f"Unknown intersection method: {method}")
+
+        exact, = _exact_arrays(coords)
+        pairs = []
+        if method != "brute":
+            candidates = (_grid_candidates(coords) if method == "grid"
+                          else _rtree_candidates(coords))
+            for first, second in candidates:
+                hits = _segments_intersect(exact[first], exact[second])
+                hits = hits.astype(bool)
+                pairs.append(np.column_stack((first[hits], second[hits])))
+        else:
+            for i in range(len(coords) - 1):
+                hits = np.flatnonzero(_segments_intersect(exact[i],
+                                                          exact[i + 1:]))
+                if len(hits):
+                    pairs.append(np.column_stack((np.full(len(hits), i),
+                                                  hits + i + 1)))
+        if not pairs:
+            return np.empty((0, 2), dtype=np.intp)
+        pairs = np.concatenate(pairs).astype(np.intp)
+        if method != "brute":
+            pairs = pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+        return pairs
+
+    def batch_intersect(self, first, second, chunked=False):
+        """
+        Given two SegmentSets or (N, 4) and (M, 4) arrays of segments,
+        return an (N, M) boolean matrix of whether segment i of first
+        and segment j of second intersect.
+
+        With chunked=True, yield (K, 2) arrays of the intersecting
+        (i, j) pairs instead, testing about _CHUNK_SIZE pairs at a time
+        so the matrix is never held in memory.
+        """
+
+        first, second = _exact_arrays(as_segments(first),
+                                      as_segments(second))
+        if chunked:
+            return _intersecting_blocks(first, second)
+        return _segments_intersect(first[:, None], second[None, :])
+
+    def bentley_ottmann(self, segments=None) -> tuple:
+        """
+        Given a SegmentSet or (N, 4) array of segments, return a (K, 2)
+        array of the index pairs (i < j) of every two segments that
+        intersect, and a (K, 2) array of a point where each pair does.
+
+        A line sweeps the segments from left to right, keeping the ones
+        it crosses in order, so only neighbors are tested. Vertical
+        segments, shared endpoints and collinear overlaps are handled;
+        for an overlap the leftmost (then lowest) shared point is given.
+        The sweep runs in exact arithmetic, so it has no rounding
+        errors.
+        """
+
+        if segments is None:
+            segments = self.points
+        rows, scale = _exact_rows(as_segments(segments))
+        pairs, crossings = _sweep(rows)
+        if not pairs:
+            return np.empty((0, 2), dtype=np.intp), np.empty((0, 2))
+        pairs = np.array(pairs, dtype=np.intp)
+        crossings = np.array([(float(Fraction(x) / scale),
+                               float(Fraction(y) / scale))
+                              for x, y in crossings])
+        order = np.lexsort((pairs[:, 1], pairs[:, 0]))
+        return pairs[order], crossings[order]
+
+    def intersections(self, segments=None, pairs=None, exact=False,
+                      method="auto") -> tuple:
+        """
+        Given a SegmentSet or (N, 4) array of segments, return a (K, 2)
+        array of the index pairs of every two segments that intersect
+        and a (K, 4) array of where. A row is (x, y, x, y) for a
+        crossing point, or the (x1, y1, x2, y2) ends of the shared
+        piece, in (x, y) order, for a collinear overlap.
+
+        The pairs are found with intersecting_pairs() and the given
+        method, or only the given (K, 2) candidate pairs are tested.
+        Integer inputs are solved in exact rational arithmetic, and with
+        exact=True the rows are Fractions. Float inputs take a
+        vectorized float path.
+        """
+
+        if segments is None:
+            segments = self.points
+        coords = as_segments(segments)
+        if pairs is None:
+            pairs = self.intersecting_pairs(coords, method)
+        pairs = np.asarray(pairs, dtype=np.intp).reshape(-1, 2)
+        integer = coords.dtype.kind in "iu"
+        coords = coords.astype(object if integer else np.float64)
+        a, b = coords[pairs[:, 0]], coords[pairs[:, 1]]
+        hits = _segments_intersect(a, b).astype(bool)
+        pairs, a, b = pairs[hits], a[hits], b[hits]
+
+        numerators, denominators = _intersection_geometry(a, b)
+        if not integer:
+            return pairs, numerators
+        if exact:
+            fraction = np.frompyfunc(Fraction, 2, 1)
+            return pairs, fraction(numerators, denominators[:, None])
+        # Python int division rounds each coordinate once, correctly.
+        return pairs, (numerators / denominators[:, None]).astype(
+            np.float64).reshape(-1, 4)
+
+
+def _choose_method(coords) -> str:
+    # Pick the intersection engine from the size and shape of the
+    # input.
+    if len(coords) <= _BRUTE_FORCE_SIZE:
+        return "brute"
+    extent = np.abs(coords[:, 2:4] - coords[:, 0:2]).max(axis=1)
+    span = (np.maximum(coords[:, 0:2], coords[:, 2:4]).max(axis=0)
+            - np.minimum(coords[:, 0:2], coords[:, 2:4]).min(axis=0)).max()
+    if np.median(extent) > _MAX_GRID_EXTENT * span:
+        return "brute"
+    return "grid"
+
+
+def _grid_candidates(coords):
+    """
+    Yield (first, second) index arrays, first < second, of every pair of
+    segments whose bounding boxes share a cell of a uniform grid, in
+    chunks of about _CHUNK_SIZE pairs.
+
+    The cell size starts at the median segment extent and doubles
+    until the segments cover few cells. A pair sharing several cells
+    is only kept in the lowest cell of the overlap of their boxes.
+    """
+
+    n = len(coords)
+    if n < 2:
+        return
+    coords = coords.astype(np.float64)
+    lows = np.minimum(coords[:, 0:2], coords[:, 2:4])
+    highs = np.maximum(coords[:, 0:2], coords[:, 2:4])
+    origin = lows.min(axis=0)
+    span = float((highs.max(axis=0) - origin).max())
+    extent = (highs - lows).max(axis=1)
+    cell = max(float(np.median(extent)), span / _MAX_CELLS_PER_AXIS)
+    if cell == 0:
+        cell = span or 1.0
+    while True:
+        low_cells = np.floor((lows - origin) / cell).astype(np.int64)
+        high_cells = np.floor((highs - origin) / cell).astype(np.int64)
+        sizes = np.prod(high_cells - low_cells + 1, axis=1)
+        if sizes.sum() <= _MAX_CELLS_PER_SEGMENT * n or cell >= span:
+            break
+        cell *= 2
+
+    # List every (cell, segment) entry of the boxes, then sort by cell
+    # key so each cell's segments are one run.
+    owner = np.repeat(np.arange(n), sizes)
+    local = np.arange(len(owner)) - np.repeat(np.cumsum(sizes) - sizes,
+                                              sizes)
+    rows = (high_cells - low_cells + 1)[owner, 1]
+    cells_x = low_cells[owner, 0] + local // rows
+    cells_y = low_cells[owner, 1] + local % rows
+    width = int(high_cells[:, 1].max()) + 1
+    keys = cells_x * width + cells_y
+    order = np.argsort(keys, kind="stable")
+    keys = keys[order]
+    owner = owner[order]
+    _, starts, counts = np.unique(keys, return_index=True,
+                                  return_counts=True)
+    shared = counts > 1
+    starts, counts = starts[shared], counts[shared]
+
+    for first, second in _expand_cell_pairs(starts, counts, starts,
+                                            counts, same_cell=True):
+        cell_key = keys[first]
+        first, second = owner[first], owner[second]
+        # The lowest cell both boxes cover.
+        corner = np.maximum(low_cells[first], low_cells[second])
+        keep = corner[:, 0] * width + corner[:, 1] == cell_key
+        # Entries are sorted by segment within a cell.
+        yield first[keep], second[keep]
+
+
+def _rtree_candidates(coords):
+    """
+    Yield (first, second) index arrays, first < second, of every pair of
+    segments whose bounding boxes overlap, looking up _RTREE_QUERY_SIZE
+    segments in an RTree of all of them at a time.
+    """
+
+    tree = RTree(coords)
+    for start in range(0, len(coords), _RTREE_QUERY_SIZE):
+        pairs = tree.overlapping(coords[start:start + _RTREE_QUERY_SIZE])
+        first = pairs[:, 0] + start
+        later = first < pairs[:, 1]
+        yield first[later], pairs[later, 1]
+
+
+def _ordered_ends(segments) -> tuple:
+    # Return each segment's smaller and larger endpoint in (x, y) order.
+    starts = segments[:, 0:2]
+    ends = segments[:, 2:4]
+    swap = _lex_less(ends, starts)[:, None]
+    return np.where(swap, ends, starts), np.where(swap, starts, ends)
+
+
+def _lex_less(a, b) -> np.ndarray:
+    # Whether each (x, y) row of a comes before the row of b.
+    return (a[:, 0] < b[:, 0]) | ((a[:, 0] == b[:, 0]) & (a[:, 1] < b[:, 1]))
+
+
+def _intersection_geometry(a, b) -> tuple:
+    """
+    Return (K, 4) numerators and (K,) denominators of where each pair
+    of intersecting segments a[k] and b[k] meet: the crossing point
+    twice, or the ends of the shared piece of a collinear overlap.
+
+    Python int inputs give exact integer numerators. Float inputs give
+    the coordinates themselves, with denominators of one.
+    """
+
+    a_lo, a_hi = _ordered_ends(a)
+    b_lo, b_hi = _ordered_ends(b)
+    # Segments along one line overlap from the later start to the
+    # earlier end, which is a single point if they only touch.
+    start = np.where(_lex_less(a_lo, b_lo)[:, None], b_lo, a_lo)
+    end = np.where(_lex_less(a_hi, b_hi)[:, None], a_hi, b_hi)
+    numerators = np.concatenate((start, end), axis=1)
+    denominators = np.ones(len(a), dtype=a.dtype)
+
+    d1 = a_hi - a_lo
+    d2 = b_hi - b_lo
+    offset = b_lo - a_lo
+    denom = d1[:, 0] * d2[:, 1] - d1[:, 1] * d2[:, 0]
+    t = offset[:, 0] * d2[:, 1] - offset[:, 1] * d2[:, 0]
+    crossing = np.flatnonzero(denom != 0)
+    denom, t = denom[crossing], t[crossing]
+    if a.dtype == object:
+        # The point a_lo + t / denom * d1, over a positive denominator.
+        sign = np.where(denom < 0, -1, 1)
+        denom, t = denom * sign, t * sign
+        point = a_lo[crossing] * denom[:, None] + t[:, None] * d1[crossing]
+        denominators[crossing] = denom
+    else:
+        # Keep a nearly parallel pair's point on the segment.
+        t = np.clip(t / denom, 0, 1)
+        point = a_lo[crossing] + t[:, None] * d1[crossing]
+    numerators[crossing] = np.concatenate((point, point), axis=1)
+    return numerators, denominators
+
+
+def _exact_arrays(*arrays) -> tuple:
+    # Return the arrays in one dtype whose orientation products are
+    # exact for integer inputs.
+    if all(array.dtype.kind in "iu" for array in arrays):
+        big = any(len(array) and np.abs(array).max() >= _EXACT_INT_LIMIT
+                  for array in arrays)
+        dtype = object if big else np.int64
+    else:
+        dtype = np.float64
+    return tuple(array.astype(dtype) for array in arrays)
+
+
+def _intersecting_blocks(first, second):
+    """
+    Yield (K, 2) arrays of the (i, j) index pairs of intersecting
+    segments of first and second, one block of about _CHUNK_SIZE pairs
+    at a time.
+    """
+
+    columns = max(1, min(len(second), _CHUNK_SIZE))
+    rows = max(1, _CHUNK_SIZE // columns)
+    for i in range(0, len(first), rows):
+        for j in range(0, len(second), columns):
+            hits = np.argwhere(_segments_intersect(
+                first[i:i + rows, None], second[None, j:j + columns]))
+            if len(hits):
+                hits += (i, j)
+                yield hits
+
+
+def _exact_rows(coords) -> tuple:
+    """
+    Return the segments as lists of Python ints and the scale they were
+    multiplied by. Floats are scaled by a power of two so each
+    coordinate stays exact.
+    """
+
+    if coords.dtype.kind in "iu":
+        return coords.tolist(), 1
+    if not np.all(np.isfinite(coords)):
+        raise ValueError("Segment coordinates must be finite!")
+    ratios = [value.as_integer_ratio() for value in coords.ravel().tolist()]
+    scale = max((den for _, den in ratios), default=1)
+    flat = [num * (scale // den) for num, den in ratios]
+    return [flat[k:k + 4] for k in range(0, len(flat), 4)], scale
+
+
+def _sweep(rows) -> tuple:
+    """
+    Run the Bentley-Ottmann sweep over rows of exact (x1, y1, x2, y2)
+    and return the list of intersecting index pairs and the list of
+    exact points where they were found.
+
+    Events are visited in (x, y) order. The status list holds the
+    segments crossing the sweep line from bottom to top, with a
+    vertical segment counted at the current event. Every segment
+    through an event point is found as one run of the status list,
+    and the segments leaving the event are reinserted by slope.
+    """
+
+    # Orient every segment from its smaller to its larger endpoint.
+    segments = [tuple(row) if tuple(row[:2]) <= tuple(row[2:])
+                else (row[2], row[3], row[0], row[1]) for row in rows]
+    lines = [(x1, y1, x2 - x1, y2 - y1) for x1, y1, x2, y2 in segments]
+    events = {}
+    for index, (x1, y1, _, _) in enumerate(segments):
+        events.setdefault((x1, y1), []).append(index)
+    for _, _, x2, y2 in segments:
+        events.setdefault((x2, y2), [])
+    # Endpoints are known up front, so only crossings need a heap.
+    endpoints = sorted(events)
+    queue = []
+    k = 0
+
+    status = []
+    pairs = []
+    crossings = []
+    seen = set()
+    while k < len(endpoints) or queue:
+        if queue and (k == len(endpoints) or queue[0] < endpoints[k]):
+            point = heappop(queue)
+        else:
+            point = endpoints[k]
+            k += 1
+        starting = events.pop(point)
+        px, py = point
+        # The run of segments through the event point.
+        lo = _first_not_below(status, lines, px, py)
+        hi = lo
+        while hi < len(status) and _side(lines[status[hi]], px, py) == 0:
+            hi += 1
+        through = status[lo:hi]
+        found = through + starting
+        if len(found) > 1:
+            for a in range(len(found)):
+                for b in range(a + 1, len(found)):
+                    pair = (min(found[a], found[b]),
+                            max(found[a], found[b]))
+                    if pair not in seen:
+                        seen.add(pair)
+                        pairs.append(pair)
+                        crossings.append(point)
+
+        # Segments that go on past the event, bottom to top just after
+        # it. Zero length segments never enter the status.
+        leaving = [index for index in found
+                   if segments[index][2:] != point]
+        if len(leaving) > 1:
+            leaving.sort(key=lambda index: _slope_key(lines[index], index))
+        status[lo:hi] = leaving
+
+        if leaving:
+            neighbors = ((lo - 1, lo), (lo + len(leaving) - 1,
+                                        lo + len(leaving)))
+        else:
+            neighbors = ((lo - 1, lo),)
+        for below, above in neighbors:
+            if 0 <= below and above < len(status):
+                event = _crossing(lines[status[below]],
+                                  lines[status[above]])
+                if event is not None and event > point and (
+                        event not in events):
+                    events[event] = []
+                    heappush(queue, event)
+    return pairs, crossings
+
+
+def _first_not_below(status, lines, px, py) -> int:
+    """
+    Binary search for the first segment of the status list that is not
+    below the point (px, py) on the sweep line.
+    """
+
+    lo = 0
+    hi = len(status)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        x1, y1, dx, dy = lines[status[mid]]
+        if dx and (y1 - py) * dx + (px - x1) * dy < 0:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def _side(line, px, py) -> int:
+    # The sign of the segment's height above the point on the sweep
+    # line. A vertical segment in the status always holds the point.
+    x1, y1, dx, dy = line
+    if dx == 0:
+        return 0
+    height = (y1 - py) * dx + (px - x1) * dy
+    return (height > 0) - (height < 0)
+
+
+def _slope_key(line, index) -> tuple:
+    # Bottom to top order of segments leaving a common point, with
+    # vertical segments last and overlapping ones by index.
+    _, _, dx, dy = line
+    if dx == 0:
+        return (1, 0, index)
+    return (0, Fraction(dy, dx), index)
+
+
+def _crossing(a, b):
+    """
+    Return the exact point where segments a and b, given as
+    (x, y, dx, dy), cross, or None if
+    they don't or are parallel. Collinear overlaps start at an
+    endpoint, which is an event already.
+    """
+
+    ax, ay, adx, ady = a
+    bx, by, bdx, bdy = b
+    denom = adx * bdy - ady * bdx
+    if denom == 0:
+        return None
+    ex, ey = bx - ax, by - ay
+    t = ex * bdy - ey * bdx
+    u = ex * ady - ey * adx
+    # Both parameters t / denom and u / denom must be within [0, 1].
+    if denom < 0:
+        denom, t, u = -denom, -t, -u
+    if not (0 <= t <= denom and 0 <= u <= denom):
+        return None
+    return (_exact(ax * denom + t * adx, denom),
+            _exact(ay * denom + t * ady, denom))
+
+
+def _exact(numerator, denominator):
+    # Keep whole numbers as ints so they hash and compare like the
+    # endpoints.
+    if numerator % denominator == 0:
+        return numerator // denominator
+    return Fraction(numerator, denominator)
+
+
+def _orientation(px, py, qx, qy, rx, ry) -> np.ndarray:
+    # Vectorized orientation, the sign of cross(q - p, r - q) as used by
+    # orientation(), 0 for collinear.
+    return np.sign((qx - px) * (ry - qy) - (qy - py) * (rx - qx))
+
+
+def _on_segment(px, py, qx, qy, rx, ry) -> np.ndarray:
+    # Vectorized check that q lies within the bounding box of pr.
+    return ((np.minimum(px, rx) <= qx) & (qx <= np.maximum(px, rx))
+            & (np.minimum(py, ry) <= qy) & (qy <= np.maximum(py, ry)))
+
+
+def _segments_intersect(a, b) -> np.ndarray:
+    # The do_intersect test on broadcastable arrays of (x1, y1, x2, y2)
+    # rows, returning a boolean array of the broadcast shape.
+    a = np.asarray(a)
+    b = np.asarray(b)
+    p1x, p1y, q1x, q1y = a[..., 0], a[..., 1], a[..., 2], a[..., 3]
+    p2x, p2y, q2x, q2y = b[..., 0], b[..., 1], b[..., 2], b[..., 3]
+
+    o1 = _orientation(p1x, p1y, q1x, q1y, p2x, p2y)
+    o2 = _orientation(p1x, p1y, q1x, q1y, q2x, q2y)
+    o3 = _orientation(p2x, p2y, q2x, q2y, p1x, p1y)
+    o4 = _orientation(p2x, p2y, q2x, q2y, q1x, q1y)
+
+    # General case, then the collinear special cases.
+    result = (o1 != o2) & (o3 != o4)
+    result |= (o1 == 0) & _on_segment(p1x, p1y, p2x, p2y, q1x, q1y)
+    result |= (o2 == 0) & _on_segment(p1x, p1y, q2x, q2y, q1x, q1y)
+    result |= (o3 == 0) & _on_segment(p2x, p2y, p1x, p1y, q2x, q2y)
+    result |= (o4 == 0) & _on_segment(p2x, p2y, q1x, q1y, q2x, q2y)
+    if profiling.stats is not None:
+        profiling.count("line_segment.orientation_tests", 4 * result.size)
+    return result
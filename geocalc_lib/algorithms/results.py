@@ -0,0 +1,145 @@
+# Results carry indices into the input alongside the coordinates they
+# point at, so a caller can highlight or slice the input in O(k) rather
+# than look result coordinates up again. Each result unpacks the way the
+# method returning it always has.
+
+# Third-party imports.
+import numpy as np
+
+
+class PairResult(tuple):
+    """
+    A class to represent a pair of points found in an input, such as
+    its closest or farthest pair. Unpacks as (distance, pair).
+
+    Attributes
+    ----------
+    distance : float
+        The distance between the two points.
+    pair : tuple of int or None
+        The index pair (i, j), i < j, of the points in the input, or
+        None if the input has fewer than 2 points.
+    indices : np.ndarray
+        The pair as a (2,) array, empty when pair is None.
+    coords : np.ndarray
+        A (2, 2) array of the coordinates of the pair, or (0, 2).
+
+    Usage
+    -----
+    import numpy as np
+    from geocalc_lib.algorithms.closest_pair_of_points import (
+        ClosestPairOfPoints)
+
+    points = np.array([[1, 2], [3, 4], [1, 3], [2, 5], [6, 1]])
+    result = ClosestPairOfPoints(points).closest_pair()
+
+    # Unpack it as before.
+    min_distance, (i, j) = result
+
+    # Or take the indices and coordinates of the pair.
+    highlighted = np.zeros(len(points), dtype=bool)
+    highlighted[result.indices] = True
+    first, second = result.coords
+    """
+
+    def __new__(cls, distance, pair, points):
+        result = super().__new__(cls, (distance, pair))
+        result.indices = np.array(pair if pair is not None else (),
+                                  dtype=np.intp)
+        result.coords = np.asarray(points)[result.indices].reshape(-1, 2)
+        return result
+
+    @property
+    def distance(self) -> float:
+        return self[0]
+
+    @property
+    def pair(self):
+        return self[1]
+
+
+class HullResult(tuple):
+    """
+    A class to represent a convex hull of an input. Unpacks as
+    (indices, coords).
+
+    Attributes
+    ----------
+    indices : np.ndarray
+        The indices of the hull vertices in the input, in
+        counterclockwise order from the leftmost (then lowest) vertex,
+        without repeating it.
+    coords : np.ndarray
+        An (H, 2) array of the coordinates of the hull vertices.
+
+    Usage
+    -----
+    import numpy as np
+    from geocalc_lib.algorithms.convex_hull import ConvexHull
+
+    points = np.array([[1, 2], [3, 4], [1, 3], [2, 5], [6, 1]])
+    indices, coords = ConvexHull(points).vertices()
+    """
+
+    def __new__(cls, indices, points):
+        indices = np.asarray(indices, dtype=np.intp)
+        return super().__new__(cls, (indices,
+                                     np.asarray(points)[indices].reshape(
+                                         -1, 2)))
+
+    @property
+    def indices(self) -> np.ndarray:
+        return self[0]
+
+    @property
+    def coords(self) -> np.ndarray:
+        return self[1]
+
+
+class CircleResult(tuple):
+    """
+    A class to represent the largest empty circle of an input, or its k
+    largest ones. Unpacks as (center, radius), or (centers, radii).
+
+    Attributes
+    ----------
+    center : np.ndarray
+        The center, a (2,) array, or a (k, 2) array of centers.
+    radius : float or np.ndarray
+        The radius, or a (k,) array of radii.
+    sites : np.ndarray
+        The indices of the input points on the circle: the (3,) corners
+        of its Delaunay triangle, or of each circle as a (k, 3) array.
+        A circle whose center was clipped to a region's boundary only
+        has its nearest point, padded with -1.
+    coords : np.ndarray
+        The coordinates of the sites, a (3, 2) or (k, 3, 2) array with
+        nan rows for the padding.
+
+    Usage
+    -----
+    import numpy as np
+    from geocalc_lib.algorithms.largest_empty_circle import (
+        LargestEmptyCircle)
+
+    points = np.array([[1, 2], [3, 4], [1, 3], [2, 5], [6, 1]])
+    result = LargestEmptyCircle(points).find_largest_empty_circle()
+    center, radius = result
+    corners = result.sites
+    """
+
+    def __new__(cls, center, radius, sites, points):
+        result = super().__new__(cls, (center, radius))
+        result.sites = np.asarray(sites, dtype=np.intp)
+        coords = np.asarray(points, dtype=np.float64)[result.sites]
+        coords[result.sites < 0] = np.nan
+        result.coords = coords
+        return result
+
+    @property
+    def center(self) -> np.ndarray:
+        return self[0]
+
+    @property
+    def radius(self):
+        return self[1]
@@ -0,0 +1,343 @@
+# Every problem has several engines that take the same input and give
+# the same answer in the same form. solve() picks one from thresholds
+# that calibrate() measured on this machine and stored in a JSON file:
+# for each problem and coordinate kind, the engines ranked fastest first
+# at each size. Without a calibration file, or for a problem it doesn't
+# cover, each problem's own "auto" method decides.
+
+# Standard library imports.
+import json
+import os
+from math import hypot, sqrt
+from time import perf_counter
+
+# Third-party imports.
+import numpy as np
+from scipy.spatial import Delaunay
+
+# Personal imports.
+from geocalc_lib.shapes.point import Point
+from geocalc_lib.shapes.point_set import PointSet, as_coords
+from geocalc_lib.shapes.segment_set import as_segments
+from geocalc_lib.algorithms.closest_pair_of_points import ClosestPairOfPoints
+from geocalc_lib.algorithms.convex_hull import ConvexHull
+from geocalc_lib.algorithms.largest_empty_circle import LargestEmptyCircle
+from geocalc_lib.algorithms.line_segment import LineSegmentIntersection
+from geocalc_lib.algorithms.results import (CircleResult, HullResult,
+                                            PairResult)
+
+# Environment variable naming the calibration file to use instead of
+# the default one.
+CONFIG_VARIABLE = "GEOCALC_BACKENDS"
+# Where the calibration file is kept by default.
+DEFAULT_CONFIG_PATH = os.path.join(os.path.expanduser("~"), ".geocalc",
+                                   "backends.json")
+# Sizes calibrate() times the engines at.
+CALIBRATION_SIZES = (10 ** 2, 10 ** 3, 10 ** 4, 10 ** 5)
+# An engine that would take more than this many seconds at the next
+# size, growing at least linearly, is not timed there, nor ranked.
+_CALIBRATION_BUDGET = 1.0
+# Side of the square calibration inputs are spread over.
+_CALIBRATION_SCALE = 10 ** 6
+
+# problem -> engine name -> (function, cores it needs). Every function
+# takes an (N, 2) array or PointSet, or an (N, 4) array.
+_ENGINES = {}
+# Loaded calibration, by path.
+_configs = {}
+
+
+def register(problem, name, function, min_cores=1) -> None:
+    """
+    Add an engine for a problem, replacing any of the same name. The
+    dispatcher only picks it on machines with at least min_cores cores.
+    """
+
+    _ENGINES.setdefault(problem, {})[name] = (function, min_cores)
+
+
+def engines(problem) -> list:
+    """Return the names of the engines registered for a problem."""
+
+    if problem not in _ENGINES:
+        raise ValueError(f"Unknown problem: {problem}")
+    return list(_ENGINES[problem])
+
+
+def solve(problem, data, engine=None, config_path=None):
+    """
+    Solve a problem on a PointSet, SegmentSet or array with the named
+    engine, or with the engine choose() picks. The result has the same
+    form whichever engine runs:
+
+    closest_pair
+        A PairResult, (distance, (i, j)) with i < j, or (inf, None).
+    convex_hull
+        A HullResult of the hull vertices, as ConvexHull.monotone_chain()
+        orders them.
+    largest_empty_circle
+        A CircleResult, (center, radius).
+    line_segment
+        A (K, 2) array of the index pairs (i < j) that intersect.
+    """
+
+    coords = _as_input(problem, data)
+    if engine is None:
+        engine = choose(problem, coords, config_path)
+    if engine not in _ENGINES[problem]:
+        raise ValueError(f"Unknown {problem} engine: {engine}")
+    return _ENGINES[problem][engine][0](coords)
+
+
+def choose(problem, data, config_path=None) -> str:
+    """
+    Return the name of the fastest engine for a problem on this input,
+    from the calibration file's ranking for the nearest calibrated size
+    and the input's coordinate kind, skipping engines that need more
+    cores than there are. Falls back to "auto".
+    """
+
+    coords = _as_input(problem, data)
+    ranking = load_config(config_path).get("problems", {}).get(
+        problem, {}).get(_kind(coords))
+    if not ranking:
+        return "auto"
+    n = len(coords)
+    # Each calibrated size covers inputs up to the geometric middle of
+    # it and the next size.
+    ranked = ranking[-1][1]
+    for (size, names), (next_size, _) in zip(ranking, ranking[1:]):
+        if n <= sqrt(size * next_size):
+            ranked = names
+            break
+    cores = os.cpu_count() or 1
+    for name in ranked:
+        if name in _ENGINES[problem] and (
+                _ENGINES[problem][name][1] <= cores):
+            return name
+    return "auto"
+
+
+def load_config(path=None) -> dict:
+    """
+    Return the calibration stored at path, the file named by the
+    GEOCALC_BACKENDS environment variable or the default file, or an
+    empty dict if there is none or it can't be read. Files are read
+    once.
+    """
+
+    path = _config_path(path)
+    if path not in _configs:
+        try:
+            with open(path) as file:
+                config = json.load(file)
+        except (OSError, ValueError):
+            # A missing, unreadable or corrupt file (JSONDecodeError is a
+            # ValueError) leaves every problem on "auto".
+            return {}
+        if not isinstance(config, dict):
+            return {}
+        _configs[path] = config
+    return _configs[path]
+
+
+def calibrate(path=None, sizes=CALIBRATION_SIZES, repeat=3, seed=0,
+              problems=None) -> dict:
+    """
+    Time every engine of the given problems (all by default) on uniform
+    random integer and float inputs of each size, rank them fastest
+    first, write the rankings to path (or the default file) and return
+    them. Engines that would go over the time budget drop out of the
+    larger sizes.
+    """
+
+    sizes = sorted(sizes)
+    config = {"cpus": os.cpu_count(), "problems": {}}
+    for problem in problems or _ENGINES:
+        names = [name for name in _ENGINES[problem] if name != "auto"]
+        config["problems"][problem] = {}
+        for kind in ("i", "f"):
+            ranking = []
+            timed = names
+            for n, next_n in zip(sizes, sizes[1:] + sizes[-1:]):
+                data = _calibration_input(problem, kind, n, seed)
+                seconds = {name: _best_time(_ENGINES[problem][name][0],
+                                            data, repeat)
+                           for name in timed}
+                ranked = sorted(seconds, key=seconds.get)
+                ranking.append([n, ranked])
+                timed = [name for name in ranked
+                         if seconds[name] * next_n / n <= _CALIBRATION_BUDGET]
+            config["problems"][problem][kind] = ranking
+
+    path = _config_path(path)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as file:
+        json.dump(config, file, indent=2)
+        file.write("\n")
+    _configs[path] = config
+    return config
+
+
+def _config_path(path) -> str:
+    return path or os.environ.get(CONFIG_VARIABLE) or DEFAULT_CONFIG_PATH
+
+
+def _as_input(problem, data):
+    # PointSets are passed on as they are, so engines can reuse the
+    # orders they keep.
+    if problem not in _ENGINES:
+        raise ValueError(f"Unknown problem: {problem}")
+    if problem == "line_segment":
+        return as_segments(data)
+    if isinstance(data, PointSet):
+        return data
+    return as_coords(data)
+
+
+def _kind(coords) -> str:
+    # Integer and float inputs are ranked separately, since the exact
+    # integer paths cost differently.
+    return "f" if coords.dtype.kind == "f" else "i"
+
+
+def _calibration_input(problem, kind, n, seed) -> np.ndarray:
+    # Uniform random points, or segments short enough that each meets a
+    # few others, over a square of side _CALIBRATION_SCALE.
+    rng = np.random.default_rng(seed)
+    if problem == "line_segment":
+        middles = rng.random((n, 2)) * _CALIBRATION_SCALE
+        angles = rng.random(n) * np.pi
+        half = (_CALIBRATION_SCALE / np.sqrt(max(n, 1))
+                * np.column_stack((np.cos(angles), np.sin(angles))))
+        data = np.hstack((middles - half, middles + half))
+    else:
+        data = rng.random((n, 2)) * _CALIBRATION_SCALE
+    return np.round(data).astype(np.int64) if kind == "i" else data
+
+
+def _best_time(function, data, repeat) -> float:
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        start = perf_counter()
+        function(data)
+        best = min(best, perf_counter() - start)
+    return best
+
+
+def _closest_pair_reference(coords) -> PairResult:
+    # ClosestPairOfPoints.closest_util on Point objects, whose identity
+    # gives back their indices.
+    points = [Point(x, y) for x, y in coords.tolist()]
+    if len(points) < 2:
+        return PairResult(float("inf"), None, coords)
+    distance, pair = ClosestPairOfPoints(None).closest_util(points)
+    index = {id(point): k for k, point in enumerate(points)}
+    i, j = sorted((index[id(pair[0])], index[id(pair[1])]))
+    return PairResult(distance, (i, j), coords)
+
+
+def _hull_reference(coords) -> HullResult:
+    # ConvexHull.graham_scan on the distinct points, given as the first
+    # index of each, from the leftmost (then lowest) vertex.
+    firsts = {}
+    for k, point in enumerate(map(tuple, coords.tolist())):
+        firsts.setdefault(point, k)
+    if len(firsts) < 3:
+        return HullResult([firsts[point] for point in sorted(firsts)],
+                          coords)
+    hull = ConvexHull(None).graham_scan(list(firsts))[:-1]
+    start = hull.index(min(hull))
+    return HullResult([firsts[point] for point in hull[start:] + hull[:start]],
+                      coords)
+
+
+def _largest_empty_circle_reference(coords) -> CircleResult:
+    # The circumcircle of one Delaunay triangle at a time, in Python
+    # floats, keeping the first largest as np.nanargmax() would.
+    points = as_coords(coords)
+    xy = points.astype(np.float64).tolist()
+    best = None
+    for simplex in Delaunay(points).simplices.tolist():
+        (x0, y0), (x1, y1), (x2, y2) = (xy[k] for k in simplex)
+        ax, ay, bx, by = x1 - x0, y1 - y0, x2 - x0, y2 - y0
+        denominator = 2 * (ax * by - ay * bx)
+        if denominator == 0:
+            continue
+        a_squared = ax * ax + ay * ay
+        b_squared = bx * bx + by * by
+        ux = (by * a_squared - ay * b_squared) / denominator
+        uy = (ax * b_squared - bx * a_squared) / denominator
+        radius = hypot(ux, uy)
+        if best is None or radius > best[1]:
+            best = ((x0 + ux, y0 + uy), radius, simplex)
+    if best is None:
+        raise ValueError("Every Delaunay triangle is degenerate!")
+    center, radius, simplex = best
+    return CircleResult(np.array(center), radius, simplex, points)
+
+
+def _line_segment_reference(coords) -> np.ndarray:
+    # LineSegmentIntersection.do_intersect on every pair of segments.
+    lsi = LineSegmentIntersection(None)
+    ends = [(Point(x1, y1), Point(x2, y2))
+            for x1, y1, x2, y2 in coords.tolist()]
+    pairs = [(i, j) for i in range(len(ends)) for j in range(i + 1, len(ends))
+             if lsi.do_intersect(*ends[i], *ends[j])]
+    return np.array(pairs, dtype=np.intp).reshape(-1, 2)
+
+
+def _closest_pair_engine(method):
+    return lambda coords: ClosestPairOfPoints(coords).closest_pair(
+        method=method)
+
+
+def _hull_engine(method):
+    return lambda coords: ConvexHull(coords).vertices(method=method)
+
+
+def _largest_empty_circle_engine(coords) -> CircleResult:
+    return LargestEmptyCircle(coords).find_largest_empty_circle()
+
+
+def _line_segment_engine(method):
+    return lambda coords: LineSegmentIntersection(
+        coords).intersecting_pairs(method=method)
+
+
+register("closest_pair", "auto", _closest_pair_engine("auto"))
+register("closest_pair", "reference", _closest_pair_reference)
+register("closest_pair", "divide", _closest_pair_engine("divide"))
+register("closest_pair", "grid", _closest_pair_engine("grid"))
+
+register("convex_hull", "auto", _hull_engine("auto"))
+register("convex_hull", "reference", _hull_reference)
+register("convex_hull", "monotone", _hull_engine("monotone"))
+register("convex_hull", "chan", _hull_engine("chan"))
+register("convex_hull", "parallel", _hull_engine("parallel"), min_cores=2)
+
+# Circles restricted to a region are a different answer for the same
+# points, so they are not engines of this problem.
+register("largest_empty_circle", "auto", _largest_empty_circle_engine)
+register("largest_empty_circle", "reference",
+         _largest_empty_circle_reference)
+register("largest_empty_circle", "vectorized", _largest_empty_circle_engine)
+
+register("line_segment", "auto", _line_segment_engine("auto"))
+register("line_segment", "reference", _line_segment_reference)
+for _method in ("brute", "grid", "rtree", "sweep"):
+    register("line_segment", _method, _line_segment_engine(_method))
+
+
+if __name__ == "__main__":
+    config = calibrate()
+    print(f"Calibrated for {config['cpus']} cores, written to "
+          f"{_config_path(None)}")
+    for problem, kinds in config["problems"].items():
+        for kind, ranking in kinds.items():
+            fastest = ", ".join(f"{n}: {names[0]}"
+                                for n, names in ranking if names)
+            print(f"{problem} ({'int' if kind == 'i' else 'float'})"
+                  f" -> {fastest}")
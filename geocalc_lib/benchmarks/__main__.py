@@ -0,0 +1,75 @@
+"""
+Runs the benchmark suite from the command line, writes the timings to
+JSON and compares them against a stored baseline. For example
+
+    python -m geocalc_lib.benchmarks --sizes 100 10000 --output run.json
+    python -m geocalc_lib.benchmarks --baseline baseline.json
+
+exits with status 1 and lists the slower cases when any case is more
+than the tolerance slower than in the baseline. Use --save-baseline to
+store a run as the new baseline.
+"""
+
+# Standard library imports.
+import argparse
+import sys
+
+# Personal imports.
+from geocalc_lib.benchmarks import suite
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m geocalc_lib.benchmarks",
+                                     description="Time the geocalc "
+                                     "algorithms on seeded workloads.")
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=list(suite.DEFAULT_SIZES))
+    parser.add_argument("--algorithms", nargs="+",
+                        choices=sorted(suite.ALGORITHMS))
+    parser.add_argument("--workloads", nargs="+")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--time-budget", type=float,
+                        default=suite.DEFAULT_TIME_BUDGET)
+    parser.add_argument("--output", help="write the results to this file")
+    parser.add_argument("--baseline", help="compare against this file")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="write the results to --baseline instead")
+    parser.add_argument("--tolerance", type=float,
+                        default=suite.DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+    if args.save_baseline and not args.baseline:
+        parser.error("--save-baseline needs --baseline")
+
+    results = suite.run(args.sizes, args.algorithms, args.workloads,
+                        args.repeat, args.seed, args.time_budget)
+    for case in results["results"]:
+        if case["seconds"] is not None:
+            outcome = f"{case['seconds']:.4f} s"
+        else:
+            outcome = case.get("error") or case["skipped"]
+        print(f"{case['algorithm']:>22} {case['workload']:>16}"
+              f" {case['n']:>9}: {outcome}")
+    if args.output:
+        suite.save(results, args.output)
+    if args.save_baseline:
+        suite.save(results, args.baseline)
+        return 0
+    if args.baseline:
+        regressions = suite.compare(results, suite.load(args.baseline),
+                                    args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} case(s) regressed against "
+                  f"{args.baseline}:", file=sys.stderr)
+            for case in regressions:
+                now = (f"{case['seconds']:.4f} s" if case["seconds"]
+                       is not None else case["error"])
+                print(f"  {case['algorithm']} {case['workload']} "
+                      f"n={case['n']}: {case['baseline']:.4f} s -> {now}",
+                      file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
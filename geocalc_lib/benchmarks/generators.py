@@ -0,0 +1,126 @@
+# Every generator takes the number of items and a seed and returns a
+# NumPy array, so the same workload can be rebuilt exactly on any
+# machine. Points are (n, 2) arrays and segments (n, 4) arrays.
+
+# Third-party imports.
+import numpy as np
+
+# Side of the square the workloads are spread over.
+_SCALE = 10 ** 6
+
+
+def uniform_points(n, seed=0) -> np.ndarray:
+    """Return n float points spread uniformly over the square."""
+
+    rng = np.random.default_rng(seed)
+    return rng.random((n, 2)) * _SCALE
+
+
+def clustered_points(n, seed=0, clusters=16) -> np.ndarray:
+    """
+    Return n float points drawn from Gaussian clusters with random
+    centers and spreads.
+    """
+
+    rng = np.random.default_rng(seed)
+    centers = rng.random((clusters, 2)) * _SCALE
+    spreads = rng.uniform(0.001, 0.02, size=clusters) * _SCALE
+    owner = rng.integers(0, clusters, size=n)
+    return centers[owner] + rng.normal(size=(n, 2)) * spreads[owner, None]
+
+
+def circle_points(n, seed=0) -> np.ndarray:
+    """
+    Return n float points on a circle, in random order, which puts every
+    point on the convex hull.
+    """
+
+    rng = np.random.default_rng(seed)
+    angles = rng.random(n) * 2 * np.pi
+    radius = _SCALE / 2
+    return np.column_stack((radius + radius * np.cos(angles),
+                            radius + radius * np.sin(angles)))
+
+
+def collinear_points(n, seed=0) -> np.ndarray:
+    """Return n integer points on one diagonal line, in random order."""
+
+    rng = np.random.default_rng(seed)
+    steps = rng.integers(0, _SCALE, size=n)
+    return np.column_stack((steps, 2 * steps + 7))
+
+
+def grid_points(n, seed=0) -> np.ndarray:
+    """
+    Return n integer points on a grid with about four points per grid
+    node, so most points have exact duplicates and ties.
+    """
+
+    rng = np.random.default_rng(seed)
+    side = max(1, int(np.ceil(np.sqrt(n / 4))))
+    return rng.integers(0, side, size=(n, 2))
+
+
+def random_segments(n, seed=0) -> np.ndarray:
+    """
+    Return n float segments with uniform random midpoints and
+    directions. Their lengths shrink with n so that each segment meets
+    a few others on average, not a fixed fraction of them.
+    """
+
+    rng = np.random.default_rng(seed)
+    middles = rng.random((n, 2)) * _SCALE
+    angles = rng.random(n) * np.pi
+    lengths = rng.exponential(2 * _SCALE / np.sqrt(max(n, 1)), size=n)
+    half = 0.5 * lengths[:, None] * np.column_stack((np.cos(angles),
+                                                     np.sin(angles)))
+    return np.hstack((middles - half, middles + half))
+
+
+def road_segments(n, seed=0) -> np.ndarray:
+    """
+    Return n integer segments shaped like a road map: polylines that
+    mostly run along the axes, turn now and then and share their
+    endpoints, with a few long highways crossing the rest.
+    """
+
+    rng = np.random.default_rng(seed)
+    highways = n // 100
+    streets = n - highways
+    # Each road is a walk of short steps that keeps its heading with
+    # high probability.
+    roads = max(1, streets // 50)
+    road = np.sort(rng.integers(0, roads, size=streets))
+    first = np.r_[True, road[1:] != road[:-1]][:streets]
+    # Index of the first segment of each segment's road.
+    road_first = np.maximum.accumulate(np.where(first, np.arange(streets),
+                                                0))
+    turns = np.cumsum((rng.random(streets) < 0.15)
+                      * rng.choice([-1, 1], size=streets))
+    headings = (turns - turns[road_first]) % 4
+    step = max(1, int(_SCALE / np.sqrt(max(streets, 1))))
+    lengths = rng.integers(step // 2 + 1, step + 2, size=streets)
+    moves = np.array([(1, 0), (0, 1), (-1, 0), (0, -1)])[headings]
+    moves = moves * lengths[:, None]
+    # A segment starts where the one before it on the same road ended.
+    walked = np.cumsum(moves, axis=0) - moves
+    starts = (rng.integers(0, _SCALE, size=(roads, 2))[road]
+              + walked - walked[road_first])
+    pieces = np.hstack((starts, starts + moves))
+    long_roads = rng.integers(0, _SCALE, size=(highways, 4))
+    return np.vstack((pieces, long_roads)).astype(np.int64)
+
+
+# Point workloads by name.
+POINT_WORKLOADS = {
+    "uniform": uniform_points,
+    "clustered": clustered_points,
+    "circle": circle_points,
+    "collinear": collinear_points,
+    "grid": grid_points,
+}
+# Segment workloads by name.
+SEGMENT_WORKLOADS = {
+    "random_segments": random_segments,
+    "roads": road_segments,
+}
@@ -0,0 +1,70 @@
+"""
+Times KDTree against scipy's cKDTree building over the same points and
+answering the same batched queries. Run it with
+
+    python -m geocalc_lib.benchmarks.kdtree [n] [queries]
+"""
+
+# Standard library imports.
+import sys
+from time import perf_counter
+
+# Third-party imports.
+import numpy as np
+from scipy.spatial import cKDTree
+
+# Personal imports.
+from geocalc_lib.spatial.kdtree import KDTree
+
+
+def compare_with_ckdtree(n=10 ** 5, queries=10 ** 4, k=4, radius=None,
+                         seed=0) -> dict:
+    """
+    Time building both trees over n uniform random points, then k-NN
+    and radius queries from the given number of query points. The
+    default radius expects about k points around each query. Returns
+    the seconds taken by each step of each tree, and whether their
+    answers agree.
+    """
+
+    rng = np.random.default_rng(seed)
+    points = rng.random((n, 2))
+    targets = rng.random((queries, 2))
+    if radius is None:
+        radius = np.sqrt(k / (np.pi * n))
+
+    timings = {}
+    start = perf_counter()
+    tree = KDTree(points)
+    timings["kdtree_build"] = perf_counter() - start
+    start = perf_counter()
+    indices, _ = tree.nearest(targets, k)
+    timings["kdtree_nearest"] = perf_counter() - start
+    start = perf_counter()
+    pairs, _ = tree.within(targets, radius)
+    timings["kdtree_within"] = perf_counter() - start
+
+    start = perf_counter()
+    reference = cKDTree(points)
+    timings["ckdtree_build"] = perf_counter() - start
+    start = perf_counter()
+    _, expected = reference.query(targets, k)
+    timings["ckdtree_nearest"] = perf_counter() - start
+    start = perf_counter()
+    neighbors = reference.query_ball_point(targets, radius)
+    timings["ckdtree_within"] = perf_counter() - start
+
+    expected = np.asarray(expected).reshape(queries, -1)
+    timings["agree"] = bool(
+        np.array_equal(indices, expected)
+        and len(pairs) == sum(len(found) for found in neighbors))
+    return timings
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:3]]
+    for step, value in compare_with_ckdtree(*sizes).items():
+        if step == "agree":
+            print(f"{step:>16}: {value}")
+        else:
+            print(f"{step:>16}: {value:.4f} s")
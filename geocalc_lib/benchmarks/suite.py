@@ -0,0 +1,168 @@
+# Each case times one algorithm on one workload at one size, taking the
+# best of a few runs so that noise only ever makes a case look slower.
+# Sizes grow until a case takes longer than the time budget; the larger
+# sizes of that case are recorded as skipped rather than run.
+
+# Standard library imports.
+import json
+import os
+import platform
+from time import perf_counter
+
+# Third-party imports.
+import numpy as np
+
+# Personal imports.
+from geocalc_lib.benchmarks.generators import (POINT_WORKLOADS,
+                                               SEGMENT_WORKLOADS)
+from geocalc_lib.algorithms.closest_pair_of_points import ClosestPairOfPoints
+from geocalc_lib.algorithms.convex_hull import ConvexHull
+from geocalc_lib.algorithms.largest_empty_circle import LargestEmptyCircle
+from geocalc_lib.algorithms.line_segment import LineSegmentIntersection
+from geocalc_lib.shapes.point import Point
+
+# Sizes timed by default, from 10^2 up to 10^7.
+DEFAULT_SIZES = tuple(10 ** power for power in range(2, 8))
+# A case slower than this many seconds skips its larger sizes.
+DEFAULT_TIME_BUDGET = 30.0
+# A case is a regression when it is this many times slower than the
+# baseline.
+DEFAULT_TOLERANCE = 1.5
+# Cases faster than this many seconds in both runs are too noisy to
+# compare.
+_NOISE_FLOOR = 0.01
+
+# Algorithms by name, with the workloads they run on and how to run
+# them.
+ALGORITHMS = {
+    "point_creation": (POINT_WORKLOADS,
+                       lambda points: [Point(x, y)
+                                       for x, y in points.tolist()]),
+    "closest_pair": (POINT_WORKLOADS,
+                     lambda points: ClosestPairOfPoints(
+                         points).closest_pair()),
+    "convex_hull": (POINT_WORKLOADS,
+                    lambda points: ConvexHull(points).hull()),
+    "largest_empty_circle": (POINT_WORKLOADS,
+                             lambda points: LargestEmptyCircle(
+                                 points).find_largest_empty_circle()),
+    "line_segment": (SEGMENT_WORKLOADS,
+                     lambda segments: LineSegmentIntersection(
+                         segments).intersecting_pairs()),
+}
+
+
+def run(sizes=DEFAULT_SIZES, algorithms=None, workloads=None, repeat=3,
+        seed=0, time_budget=DEFAULT_TIME_BUDGET) -> dict:
+    """
+    Time the given algorithms (all by default) on each of their
+    workloads (or only the named ones) at each size, and return the
+    results with a description of the machine they ran on.
+
+    Every result records the algorithm, workload, size and the best
+    time in seconds out of repeat runs. A case that raises records the
+    error instead, and the sizes above a case slower than time_budget
+    are recorded as skipped.
+    """
+
+    results = []
+    for algorithm in algorithms or ALGORITHMS:
+        generators, solve = ALGORITHMS[algorithm]
+        for workload, generate in generators.items():
+            if workloads is not None and workload not in workloads:
+                continue
+            over_budget = False
+            for n in sorted(sizes):
+                case = {"algorithm": algorithm, "workload": workload,
+                        "n": n, "seconds": None}
+                if over_budget:
+                    case["skipped"] = f"over the {time_budget:g} s budget"
+                else:
+                    data = generate(n, seed)
+                    try:
+                        case["seconds"] = _best_time(solve, data, repeat)
+                    except Exception as e:
+                        # Only the first line: Qhull errors run on.
+                        message = str(e).strip().splitlines()
+                        case["error"] = (f"{type(e).__name__}: "
+                                         + (message[0] if message else ""))
+                    else:
+                        over_budget = case["seconds"] > time_budget
+                results.append(case)
+    return {"environment": _environment(), "seed": seed, "repeat": repeat,
+            "results": results}
+
+
+def save(results, path) -> None:
+    """Write benchmark results to a JSON file."""
+
+    with open(path, "w") as file:
+        json.dump(results, file, indent=2)
+        file.write("\n")
+
+
+def load(path) -> dict:
+    """Read benchmark results written by save()."""
+
+    with open(path) as file:
+        return json.load(file)
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE) -> list:
+    """
+    Return the cases of results that are more than tolerance times
+    slower than the same case in baseline, as dicts with both times
+    and their ratio, slowest first. A case that fails now but was
+    timed in the baseline is always a regression. Cases missing from
+    either side, and those too fast to time reliably, are ignored.
+    """
+
+    before = {_case_key(case): case for case in baseline["results"]}
+    regressions = []
+    for case in results["results"]:
+        old = before.get(_case_key(case))
+        if old is None or old["seconds"] is None:
+            continue
+        new_seconds = case["seconds"]
+        if new_seconds is None:
+            if "error" in case:
+                regressions.append({**_case_id(case),
+                                    "baseline": old["seconds"],
+                                    "seconds": None, "ratio": np.inf,
+                                    "error": case["error"]})
+            continue
+        if max(old["seconds"], new_seconds) < _NOISE_FLOOR:
+            continue
+        ratio = new_seconds / max(old["seconds"], 1e-9)
+        if ratio > tolerance:
+            regressions.append({**_case_id(case),
+                                "baseline": old["seconds"],
+                                "seconds": new_seconds, "ratio": ratio})
+    return sorted(regressions, key=lambda case: -case["ratio"])
+
+
+def _best_time(solve, data, repeat) -> float:
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        start = perf_counter()
+        solve(data)
+        best = min(best, perf_counter() - start)
+    return best
+
+
+def _case_id(case) -> dict:
+    return {"algorithm": case["algorithm"], "workload": case["workload"],
+            "n": case["n"]}
+
+
+def _case_key(case) -> tuple:
+    return case["algorithm"], case["workload"], case["n"]
+
+
+def _environment() -> dict:
+    # Enough about the machine to tell whether two runs are comparable.
+    return {"python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "cpus": os.cpu_count()}
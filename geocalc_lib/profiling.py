@@ -0,0 +1,78 @@
+# Counters are only kept while a collect() block is open. Hot paths test
+# `profiling.stats is not None` before calling in here, so when nobody
+# is collecting the instrumentation costs one attribute load and a
+# comparison.
+
+# Standard library imports.
+from contextlib import contextmanager
+
+# The dict counters are collected into, or None when nobody collects.
+stats = None
+# Current recursion depth of each depth counter.
+_depths = {}
+
+
+@contextmanager
+def collect():
+    """
+    Collect counters from the algorithms run inside the block into a
+    dict of counter name to value, which the block receives and keeps
+    when it ends. Names are "<algorithm>.<counter>", and counters named
+    max_* hold the largest value seen rather than a total. A block
+    nested in another also adds its counts to the outer one.
+
+    Usage
+    -----
+    from geocalc_lib import profiling
+
+    with profiling.collect() as counters:
+        ConvexHull(points).graham_scan(points)
+    print(counters["convex_hull.orientation_tests"])
+    """
+
+    global stats, _depths
+    outer, outer_depths = stats, _depths
+    stats, _depths = {}, {}
+    collected = stats
+    try:
+        yield collected
+    finally:
+        stats, _depths = outer, outer_depths
+        if outer is not None:
+            for name, value in collected.items():
+                if name.rpartition(".")[2].startswith("max_"):
+                    outer[name] = max(outer.get(name, value), value)
+                else:
+                    outer[name] = outer.get(name, 0) + value
+
+
+def count(name, amount=1) -> None:
+    """Add amount to a counter, if collecting."""
+
+    if stats is not None:
+        stats[name] = stats.get(name, 0) + amount
+
+
+def record_max(name, value) -> None:
+    """Raise a max_* counter to value, if collecting."""
+
+    if stats is not None and value > stats.get(name, value - 1):
+        stats[name] = value
+
+
+def enter(name) -> None:
+    """
+    Note a recursive call starting, recording the deepest nesting in
+    the max_* counter name. Each enter() needs a matching leave().
+    """
+
+    if stats is not None:
+        _depths[name] = _depths.get(name, 0) + 1
+        record_max(name, _depths[name])
+
+
+def leave(name) -> None:
+    """Note a recursive call started by enter() returning."""
+
+    if stats is not None and _depths.get(name):
+        _depths[name] -= 1
@@ -0,0 +1,237 @@
+# Standard library imports.
+from __future__ import annotations
+
+# Third-party imports.
+import numpy as np
+
+
+class CoordinateSet:
+    """
+    A base class for collections of shapes stored as rows of a single
+    contiguous (N, width) NumPy buffer.
+
+    Subclasses set the row width and convert between rows and shape
+    objects, this class handles growth, removal and views.
+
+    Attributes
+    ----------
+    coords : np.ndarray
+        A zero-copy (N, width) view of the stored rows.
+    dtype : np.dtype
+        The dtype of the buffer, int64 or float64.
+    capacity : int
+        The number of rows the buffer can hold before it grows.
+
+    Methods
+    -------
+    extend(items)
+        Add many rows to the end of the set.
+    remove(index)
+        Remove the row at the given index.
+    index(item)
+        Return the index of the first row equal to the given item.
+    clear()
+        Remove every row from the set.
+    copy()
+        Return a set owning a copy of the rows.
+    tolist()
+        Return the rows as a list of tuples.
+    """
+
+    # Number of values stored per row.
+    _WIDTH = 2
+    # Smallest buffer allocated once a row is added.
+    _MIN_CAPACITY = 16
+
+    def __init__(self, items=None, dtype=None) -> None:
+        self._buffer = np.empty((0, self._WIDTH),
+                                dtype=np.int64 if dtype is None else dtype)
+        self._size = 0
+        # Views share a parent's buffer and copy it before mutating.
+        self._owner = True
+        self._fixed_dtype = dtype is not None
+        if items is not None:
+            self.extend(items)
+
+    @classmethod
+    def _from_view(cls, view: np.ndarray) -> CoordinateSet:
+        # Wrap an existing (N, width) array without copying it.
+        coordinate_set = cls.__new__(cls)
+        coordinate_set._buffer = view
+        coordinate_set._size = len(view)
+        coordinate_set._owner = False
+        coordinate_set._fixed_dtype = False
+        return coordinate_set
+
+    @property
+    def coords(self) -> np.ndarray:
+        return self._buffer[:self._size]
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._buffer.dtype
+
+    @property
+    def capacity(self) -> int:
+        return len(self._buffer)
+
+    def _reserve(self, size: int, dtype=None) -> None:
+        # Grow (or re-type) the buffer so it holds at least size rows,
+        # doubling the capacity to keep appends amortized O(1).
+        dtype = self.dtype if dtype is None else np.dtype(dtype)
+        if (self._owner and size <= len(self._buffer)
+                and dtype == self.dtype):
+            return
+        capacity = max(size, 2 * len(self._buffer), self._MIN_CAPACITY)
+        buffer = np.empty((capacity, self._WIDTH), dtype=dtype)
+        buffer[:self._size] = self._buffer[:self._size]
+        self._buffer = buffer
+        self._owner = True
+
+    def _item_to_row(self, item) -> tuple:
+        # Subclasses turn a shape object into a tuple of row values.
+        return tuple(item)
+
+    def _row_to_item(self, row: list):
+        # Subclasses turn a list of row values into a shape object.
+        return tuple(row)
+
+    def _validate(self, array: np.ndarray) -> None:
+        # Subclasses reject rows that do not describe a valid shape.
+        pass
+
+    def _as_array(self, items) -> np.ndarray:
+        # Turn the supported inputs into an (N, width) array.
+        if isinstance(items, CoordinateSet):
+            array = items.coords
+        elif isinstance(items, np.ndarray) and items.dtype != object:
+            array = items
+        else:
+            array = np.array([self._item_to_row(item) for item in items])
+        if array.size == 0:
+            return array.reshape(0, self._WIDTH)
+        if array.ndim != 2 or array.shape[1] != self._WIDTH:
+            raise ValueError(f"{type(self).__name__} rows must have shape "
+                             f"(N, {self._WIDTH})")
+        return array
+
+    def _result_dtype(self, array: np.ndarray) -> np.dtype:
+        # Integers stay int64 until a float arrives, then the whole
+        # set is promoted to float64.
+        if self._fixed_dtype or array.size == 0:
+            return self.dtype
+        if array.dtype.kind in "iub" and (self._size == 0
+                                          or self.dtype.kind == "i"):
+            return np.dtype(np.int64)
+        return np.dtype(np.float64)
+
+    def _changed(self) -> None:
+        # Called after every mutation.
+        pass
+
+    def append(self, item) -> None:
+        """Add a single item to the end of the set."""
+
+        self.extend(np.asarray(self._item_to_row(item)).reshape(1, -1))
+
+    def extend(self, items) -> None:
+        """
+        Add another set, an (N, width) array or an iterable of items to
+        the end of the set.
+        """
+
+        array = self._as_array(items)
+        count = len(array)
+        if count == 0:
+            return
+        self._validate(array)
+        self._reserve(self._size + count, self._result_dtype(array))
+        self._buffer[self._size:self._size + count] = array
+        self._size += count
+        self._changed()
+
+    def remove(self, index: int) -> None:
+        """Remove the row at the given index."""
+
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError(f"{type(self).__name__} index out of range")
+        self._reserve(self._size)
+        # Shift the tail down by one row in place.
+        self._buffer[index:self._size - 1] = \
+            self._buffer[index + 1:self._size]
+        self._size -= 1
+        self._changed()
+
+    def index(self, item) -> int:
+        """
+        Return the index of the first row equal to the given item,
+        raising ValueError if there is none.
+        """
+
+        row = self._item_to_row(item)
+        matches = np.flatnonzero(np.all(self.coords == row, axis=1))
+        if len(matches) == 0:
+            raise ValueError(f"{item} is not in {type(self).__name__}")
+        return int(matches[0])
+
+    def clear(self) -> None:
+        """Remove every row from the set."""
+
+        self._size = 0
+        if not self._owner:
+            self._buffer = np.empty((0, self._WIDTH), dtype=self.dtype)
+            self._owner = True
+        self._changed()
+
+    def copy(self) -> CoordinateSet:
+        """Return a set owning a copy of the rows."""
+
+        return type(self)(self.coords.copy(), dtype=self.dtype)
+
+    def tolist(self) -> list:
+        """Return the rows as a list of tuples."""
+
+        return [tuple(row) for row in self.coords.tolist()]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            if key < 0:
+                key += self._size
+            if not 0 <= key < self._size:
+                raise IndexError(f"{type(self).__name__} index out of range")
+            return self._row_to_item(self._buffer[key].tolist())
+        if isinstance(key, slice):
+            # Basic slicing is a view onto the same buffer.
+            return self._from_view(self.coords[key])
+        # Fancy indexing always copies in NumPy.
+        return type(self)(self.coords[key], dtype=self.dtype)
+
+    def __delitem__(self, index: int) -> None:
+        self.remove(index)
+
+    def __iter__(self):
+        for row in self.coords.tolist():
+            yield self._row_to_item(row)
+
+    def __contains__(self, item) -> bool:
+        try:
+            self.index(item)
+        except ValueError:
+            return False
+        return True
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        if dtype is None:
+            return self.coords
+        return self.coords.astype(dtype, copy=False)
+
+    def __str__(self) -> str:
+        return f"{type(self).__name__}({self.tolist()})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
@@ -1,24 +1,38 @@
-# Third party imports.
+# Standard library imports.
+from math import hypot
+
+# Third-party imports.
 import numpy as np
 
 
 class Point:
     """
-    A class to represent a point in 2D space.
-    
+    A class to represent an immutable point in 2D space.
+
     Attributes
     ----------
+    x : int or float
+        The x coordinate of the point.
+    y : int or float
+        The y coordinate of the point.
     coords : np.ndarray
-        The coordinates of the point in 2D space.
-    
+        The coordinates of the point in 2D space, created on first
+        access and kept for compatibility.
+
     Methods
     -------
+    distance_to(other)
+        Return the euclidean distance to another point.
+
     __eq__(other)
         Check if two points are equal.
-        
+
     __lt__(other)
         Check if the current point is less than another point.
 
+    __hash__
+        Hash the point so it can be used in sets and as a dict key.
+
     __str__
         Convert Point object to string
 
@@ -26,18 +40,68 @@ class Point:
         Show the string instead of address memory
     """
 
+    __slots__ = ("x", "y", "_coords")
+
     def __init__(self, x: int, y: int) -> None:
-        self.coords = np.array([x, y])
+        # Store plain Python numbers, whole ints stay ints so integer
+        # scenes keep exact arithmetic. Plain ints and floats, by far
+        # the most common, skip the conversion, and the slots are set
+        # through their descriptors rather than object.__setattr__.
+        _set_x(self, x if type(x) is int or type(x) is float
+               else _plain(x))
+        _set_y(self, y if type(y) is int or type(y) is float
+               else _plain(y))
+
+    @property
+    def coords(self) -> np.ndarray:
+        try:
+            return self._coords
+        except AttributeError:
+            coords = np.array([self.x, self.y])
+            coords.flags.writeable = False
+            _set_coords(self, coords)
+            return coords
+
+    def distance_to(self, other: 'Point') -> float:
+        """Returns the euclidean distance to another point."""
+
+        return hypot(self.x - other.x, self.y - other.y)
+
+    def __setattr__(self, name, value) -> None:
+        raise AttributeError("Point is immutable")
+
+    def __delattr__(self, name) -> None:
+        raise AttributeError("Point is immutable")
 
     def __eq__(self, other: 'Point') -> bool:
-        return np.array_equal(self.coords, other.coords)
+        if not isinstance(other, Point):
+            return NotImplemented
+        return self.x == other.x and self.y == other.y
 
     def __lt__(self, other) -> bool:
-        return (self.coords[0], self.coords[1]) < (other.coords[0],
-                                                   other.coords[1])
+        return (self.x, self.y) < (other.x, other.y)
+
+    def __hash__(self) -> int:
+        return hash((self.x, self.y))
+
+    def __reduce__(self):
+        return (Point, (self.x, self.y))
 
     def __str__(self) -> str:
-        return f"Point({self.coords[0]}, {self.coords[1]})"
+        return f"Point({self.x}, {self.y})"
 
     def __repr__(self) -> str:
         return self.__str__()
+
+
+# Setters of the Point slots, which bypass Point.__setattr__.
+_set_x = Point.x.__set__
+_set_y = Point.y.__set__
+_set_coords = Point._coords.__set__
+
+
+def _plain(value):
+    # Turn NumPy scalars and other numbers into an int or a float.
+    if isinstance(value, (int, np.integer)) and not isinstance(value, bool):
+        return int(value)
+    return float(value)
@@ -0,0 +1,235 @@
+# Third-party imports.
+import numpy as np
+
+# Personal imports.
+from geocalc_lib.shapes.coordinate_set import CoordinateSet
+from geocalc_lib.shapes.point import Point
+
+# Morton and Hilbert orders quantize each axis to this many bits.
+_CURVE_BITS = 16
+
+
+class PointSet(CoordinateSet):
+    """
+    A class to represent a collection of points in 2D space, stored in
+    a single contiguous (N, 2) NumPy buffer.
+
+    Attributes
+    ----------
+    coords : np.ndarray
+        A zero-copy (N, 2) view of the stored coordinates.
+    dtype : np.dtype
+        The dtype of the buffer, int64 or float64.
+
+    Methods
+    -------
+    append(point)
+        Add a single point to the end of the set.
+    extend(points)
+        Add many points to the end of the set.
+    remove(index)
+        Remove the point at the given index.
+    index(point)
+        Return the index of the first point equal to the given point.
+    clear()
+        Remove every point from the set.
+    copy()
+        Return a PointSet owning a copy of the coordinates.
+    tolist()
+        Return the points as a list of (x, y) tuples.
+    order(kind)
+        Return the indices of the points in x, y, lexicographic,
+        Morton or Hilbert order, computed once until the set changes.
+
+    Usage
+    -----
+    from geocalc_lib.shapes.point_set import PointSet
+
+    # Build a set from coordinates and grow it one point at a time.
+    points = PointSet([[1, 2], [3, 4], [1, 3]])
+    points.append((2, 5))
+
+    # Slices share the underlying buffer.
+    first_two = points[:2]
+
+    # Orders are sorted once and shared by every algorithm run on the
+    # set until it changes.
+    by_x = points.order("x")
+    """
+
+    _WIDTH = 2
+    # Orders sorted so far, by kind. Only sets owning their buffer keep
+    # them, since a view's rows change with its parent's.
+    _orders = None
+
+    def order(self, kind: str) -> np.ndarray:
+        """
+        Return the indices of the points sorted by kind, as a read-only
+        array kept until the set next changes:
+
+        "x" or "lexicographic"
+            By x, then y.
+        "y"
+            By y, then x.
+        "morton", "hilbert"
+            Along a Z-order or Hilbert curve over the bounding box,
+            which keeps points that are near in the order near in the
+            plane.
+
+        Points that tie come in index order. Writing to coords directly
+        does not reset the orders, so change the set through its
+        methods.
+        """
+
+        if kind == "lexicographic":
+            kind = "x"
+        if kind not in _ORDERS:
+            raise ValueError(f"Unknown point order: {kind}")
+        if not self._owner:
+            return _ORDERS[kind](self.coords)
+        if self._orders is None:
+            self._orders = {}
+        if kind not in self._orders:
+            order = _ORDERS[kind](self.coords)
+            order.setflags(write=False)
+            self._orders[kind] = order
+        return self._orders[kind]
+
+    def _changed(self) -> None:
+        self._orders = None
+
+    def _item_to_row(self, point) -> tuple:
+        if isinstance(point, Point):
+            return (point.x, point.y)
+        x, y = point
+        return (x, y)
+
+    def _row_to_item(self, row: list) -> Point:
+        return Point(row[0], row[1])
+
+
+def point_order(points, kind: str) -> np.ndarray:
+    """
+    Return the indices of the given points sorted by kind, as
+    PointSet.order() does. A PointSet's cached order is reused, other
+    inputs are sorted every time.
+    """
+
+    if isinstance(points, PointSet):
+        return points.order(kind)
+    if kind == "lexicographic":
+        kind = "x"
+    if kind not in _ORDERS:
+        raise ValueError(f"Unknown point order: {kind}")
+    return _ORDERS[kind](as_coords(points))
+
+
+def point_key(point) -> tuple:
+    """
+    Return a Point or (x, y) pair as an (x, y) tuple of plain Python
+    numbers, so equal points hash alike whatever type they came in.
+    """
+
+    if not isinstance(point, Point):
+        point = Point(*point)
+    return point.x, point.y
+
+
+def as_coords(points) -> np.ndarray:
+    """
+    Return the given points as an (N, 2) array. PointSets and arrays
+    are returned without copying.
+    """
+
+    if isinstance(points, PointSet):
+        return points.coords
+    return PointSet()._as_array(points)
+
+
+def _lexicographic(first, second) -> np.ndarray:
+    # Sort by first, then second, then index. Integers fold into one
+    # int64 key when they fit, with the index too when that fits, which
+    # sorts much faster than np.lexsort.
+    n = len(first)
+    if first.dtype.kind in "iu" and n:
+        low, low_second = int(first.min()), int(second.min())
+        height = int(second.max()) - low_second + 1
+        cells = (int(first.max()) - low + 1) * height
+        if cells < 2 ** 62:
+            keys = ((first.astype(np.int64) - low) * height
+                    + (second.astype(np.int64) - low_second))
+            if cells * n < 2 ** 62:
+                # Unique keys sort the same however they are sorted.
+                return np.argsort(keys * n + np.arange(n))
+            return np.argsort(keys, kind="stable")
+        return np.lexsort((second, first))
+    order = np.argsort(first, kind="stable")
+    ordered = first[order]
+    if np.any(ordered[1:] == ordered[:-1]):
+        return np.lexsort((second, first))
+    return order
+
+
+def _x_order(coords) -> np.ndarray:
+    return _lexicographic(coords[:, 0], coords[:, 1])
+
+
+def _y_order(coords) -> np.ndarray:
+    return _lexicographic(coords[:, 1], coords[:, 0])
+
+
+def _grid_cells(coords) -> tuple:
+    # Quantize each axis of the bounding box to _CURVE_BITS bits.
+    side = 2 ** _CURVE_BITS - 1
+    cells = []
+    for axis in (0, 1):
+        values = coords[:, axis].astype(np.float64)
+        low = values.min() if len(values) else 0.0
+        extent = (values.max() - low) if len(values) else 0.0
+        scale = side / extent if extent > 0 else 0.0
+        cells.append(((values - low) * scale).astype(np.uint64))
+    return cells
+
+
+def _spread_bits(values) -> np.ndarray:
+    # Move bit k of each value to bit 2k.
+    values = values & np.uint64(0xFFFFFFFF)
+    for shift, mask in ((16, 0x0000FFFF0000FFFF), (8, 0x00FF00FF00FF00FF),
+                        (4, 0x0F0F0F0F0F0F0F0F), (2, 0x3333333333333333),
+                        (1, 0x5555555555555555)):
+        values = (values | (values << np.uint64(shift))) & np.uint64(mask)
+    return values
+
+
+def _morton_order(coords) -> np.ndarray:
+    xs, ys = _grid_cells(coords)
+    keys = _spread_bits(xs) | (_spread_bits(ys) << np.uint64(1))
+    return np.argsort(keys, kind="stable")
+
+
+def _hilbert_order(coords) -> np.ndarray:
+    # The distance along the curve, one bit of each axis at a time from
+    # the top, rotating the quadrant as the curve does.
+    xs, ys = _grid_cells(coords)
+    keys = np.zeros(len(coords), dtype=np.uint64)
+    last = np.uint64(2 ** _CURVE_BITS - 1)
+    for bit in range(_CURVE_BITS - 1, -1, -1):
+        s = np.uint64(1 << bit)
+        rx = (xs & s) > 0
+        ry = (ys & s) > 0
+        keys += s * s * ((3 * rx) ^ ry).astype(np.uint64)
+        flip = rx & ~ry
+        xs = np.where(flip, last - xs, xs)
+        ys = np.where(flip, last - ys, ys)
+        swap = ~ry
+        xs, ys = np.where(swap, ys, xs), np.where(swap, xs, ys)
+    return np.argsort(keys, kind="stable")
+
+
+# How each order is sorted, by kind.
+_ORDERS = {
+    "x": _x_order,
+    "y": _y_order,
+    "morton": _morton_order,
+    "hilbert": _hilbert_order,
+}
@@ -0,0 +1,142 @@
+# Third-party imports.
+import numpy as np
+
+# Personal imports.
+from geocalc_lib.shapes.coordinate_set import CoordinateSet
+from geocalc_lib.shapes.line import Line
+from geocalc_lib.shapes.point import Point
+
+
+class SegmentSet(CoordinateSet):
+    """
+    A class to represent a collection of line segments in 2D space,
+    stored as rows of (start_x, start_y, end_x, end_y) in a single
+    contiguous (N, 4) NumPy buffer.
+
+    Attributes
+    ----------
+    coords : np.ndarray
+        A zero-copy (N, 4) view of the stored segments.
+    starts : np.ndarray
+        A zero-copy (N, 2) view of the start points.
+    ends : np.ndarray
+        A zero-copy (N, 2) view of the end points.
+    dtype : np.dtype
+        The dtype of the buffer, int64 or float64.
+
+    Methods
+    -------
+    append(line)
+        Add a single Line or (x1, y1, x2, y2) row to the end of the set.
+    extend(lines)
+        Add many segments to the end of the set.
+    remove(index)
+        Remove the segment at the given index.
+    index(line)
+        Return the index of the first segment equal to the given line.
+    length()
+        Return the length of every segment.
+    midpoint()
+        Return the midpoint of every segment.
+    slope()
+        Return the slope of every segment.
+    bounds()
+        Return the bounding box of every segment.
+
+    Usage
+    -----
+    from geocalc_lib.shapes.segment_set import SegmentSet
+
+    # Build a set from rows of start and end coordinates.
+    segments = SegmentSet([[0, 0, 4, 4], [0, 4, 4, 0]])
+
+    # Vectorized measurements over every segment at once.
+    lengths = segments.length()
+    """
+
+    _WIDTH = 4
+
+    def _item_to_row(self, line) -> tuple:
+        if isinstance(line, Line):
+            return (line.start.x, line.start.y, line.end.x, line.end.y)
+        x1, y1, x2, y2 = line
+        return (x1, y1, x2, y2)
+
+    def _row_to_item(self, row: list) -> Line:
+        return Line(Point(row[0], row[1]), Point(row[2], row[3]))
+
+    def _validate(self, array: np.ndarray) -> None:
+        # Match Line, which rejects zero length segments.
+        if np.any((array[:, 0] == array[:, 2]) & (array[:, 1] == array[:, 3])):
+            raise ValueError("Start and end points cannot be the same")
+
+    @property
+    def starts(self) -> np.ndarray:
+        return self.coords[:, 0:2]
+
+    @property
+    def ends(self) -> np.ndarray:
+        return self.coords[:, 2:4]
+
+    def length(self) -> np.ndarray:
+        """Returns the length of every segment."""
+
+        coords = self.coords
+        return np.hypot(coords[:, 2] - coords[:, 0],
+                        coords[:, 3] - coords[:, 1])
+
+    def midpoint(self) -> np.ndarray:
+        """Returns the (N, 2) midpoints of every segment."""
+
+        return (self.starts + self.ends) / 2
+
+    def slope(self) -> np.ndarray:
+        """Returns the slope of every segment, inf for vertical ones."""
+
+        coords = self.coords
+        dx = (coords[:, 2] - coords[:, 0]).astype(np.float64)
+        dy = (coords[:, 3] - coords[:, 1]).astype(np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            slopes = dy / dx
+        slopes[dx == 0] = np.inf
+        return slopes
+
+    def bounds(self) -> np.ndarray:
+        """
+        Returns the (N, 4) bounding boxes of every segment as rows of
+        (min_x, min_y, max_x, max_y).
+        """
+
+        starts, ends = self.starts, self.ends
+        return np.hstack((np.minimum(starts, ends), np.maximum(starts, ends)))
+
+    def total_bounds(self) -> np.ndarray:
+        """Returns the bounding box of the whole set."""
+
+        if self._size == 0:
+            raise ValueError("SegmentSet is empty")
+        bounds = self.bounds()
+        return np.concatenate((bounds[:, :2].min(axis=0),
+                               bounds[:, 2:].max(axis=0)))
+
+
+def segment_key(line) -> tuple:
+    """
+    Return a Line or (x1, y1, x2, y2) row as a tuple of plain Python
+    numbers, so equal segments hash alike whatever type they came in.
+    """
+
+    if isinstance(line, Line):
+        return line.start.x, line.start.y, line.end.x, line.end.y
+    return tuple(np.asarray(line).tolist())
+
+
+def as_segments(segments) -> np.ndarray:
+    """
+    Return the given segments as an (N, 4) array. SegmentSets and
+    arrays are returned without copying.
+    """
+
+    if isinstance(segments, SegmentSet):
+        return segments.coords
+    return SegmentSet()._as_array(segments)
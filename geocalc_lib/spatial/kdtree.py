@@ -0,0 +1,304 @@
+# Nodes are stored breadth first in flat arrays: the range of the point
+# order each one covers, the tight bounding box of those points and the
+# index of its left child, whose sibling follows it. Queries are run for
+# many points at once by carrying (query, node) pairs down the tree and
+# dropping every pair whose box is farther than the query's bound.
+
+# Third-party imports.
+import numpy as np
+
+# Personal imports.
+from geocalc_lib.shapes.point_set import as_coords, point_order
+
+# Default largest number of points in a leaf.
+_LEAF_SIZE = 32
+# Upper bound on queries walked through the tree at once.
+_QUERY_CHUNK = 2 ** 14
+
+
+class KDTree:
+    """
+    A class to represent a 2D KD-tree over points, with its nodes stored
+    in flat arrays.
+
+    Attributes
+    ----------
+    points : np.ndarray
+        The (N, 2) points the tree was built from, shared with the
+        PointSet or array passed in.
+    leaf_size : int
+        The largest number of points in a leaf.
+
+    Methods
+    -------
+    nearest(points, k=1)
+        Return the indices of and distances to the k nearest points to
+        each query point.
+    within(points, radius)
+        Return the (query, point) index pairs of every point within a
+        distance of each query point.
+
+    Usage
+    -----
+    import numpy as np
+    from geocalc_lib.spatial.kdtree import KDTree
+
+    # Build the tree once.
+    tree = KDTree(np.array([[1, 2], [3, 4], [1, 3], [2, 5], [6, 1]]))
+
+    # Ask for the nearest point to one location, or the two nearest to
+    # many at once.
+    index, distance = tree.nearest((2, 2))
+    indices, distances = tree.nearest(np.array([[0, 0], [5, 5]]), k=2)
+    """
+
+    def __init__(self, points, leaf_size=_LEAF_SIZE) -> None:
+        if leaf_size < 1:
+            raise ValueError("leaf_size must be at least 1!")
+        self.points = as_coords(points)
+        self.leaf_size = leaf_size
+        self._build(points)
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def nearest(self, points, k=1) -> tuple:
+        """
+        Given an (x, y) point or an (M, 2) array of points, return the
+        indices of the k nearest points to each and their distances,
+        nearest first and ties by index, as (k,) or (M, k) arrays.
+        """
+
+        if k < 0:
+            raise ValueError("k must be non-negative!")
+        queries, single = _as_queries(points)
+        k = min(k, len(self.points))
+        indices = np.empty((len(queries), k), dtype=np.intp)
+        distances = np.empty((len(queries), k))
+        if k:
+            for start in range(0, len(queries), _QUERY_CHUNK):
+                chunk = slice(start, start + _QUERY_CHUNK)
+                indices[chunk], distances[chunk] = self._nearest(
+                    queries[chunk], k)
+        if single:
+            return indices[0], distances[0]
+        return indices, distances
+
+    def within(self, points, radius) -> tuple:
+        """
+        Given an (x, y) point or an (M, 2) array of points, return a
+        sorted (K, 2) array of the (query, point) index pairs of every
+        point within the radius of each query, edge included, and a
+        (K,) array of their distances. For a single (x, y) point the
+        query column is all zeros.
+        """
+
+        if radius < 0:
+            raise ValueError("radius must be non-negative!")
+        queries, _ = _as_queries(points)
+        pairs, distances = [], []
+        for start in range(0, len(queries), _QUERY_CHUNK):
+            chunk_pairs, chunk_distances = self._within(
+                queries[start:start + _QUERY_CHUNK], radius)
+            chunk_pairs[:, 0] += start
+            pairs.append(chunk_pairs)
+            distances.append(chunk_distances)
+        if not pairs:
+            return np.empty((0, 2), dtype=np.intp), np.empty(0)
+        return np.concatenate(pairs), np.concatenate(distances)
+
+    def _build(self, points) -> None:
+        # Split every node of a level at once, at the median along its
+        # widest side, until the leaves are small. The points are kept
+        # sorted along both axes within each node, so the medians and
+        # the tight boxes are read off the orders and every level is a
+        # linear stable partition.
+        coords = self.points.astype(np.float64)
+        self._coords = coords
+        n = len(coords)
+        # Copies, since the partitions below reorder them in place.
+        by_axis = [point_order(points, "x").copy(),
+                   point_order(points, "y").copy()]
+        ranges, lows, highs, lefts = [], [], [], []
+        level = np.array([[0, n]] if n else [], dtype=np.intp).reshape(-1, 2)
+        count = len(level)
+        while len(level):
+            starts, ends = level[:, 0], level[:, 1]
+            low = np.column_stack((coords[by_axis[0][starts], 0],
+                                   coords[by_axis[1][starts], 1]))
+            high = np.column_stack((coords[by_axis[0][ends - 1], 0],
+                                    coords[by_axis[1][ends - 1], 1]))
+            split = ends - starts > self.leaf_size
+            left = np.full(len(level), -1, dtype=np.intp)
+            left[split] = count + 2 * np.arange(np.count_nonzero(split))
+            ranges.append(level)
+            lows.append(low)
+            highs.append(high)
+            lefts.append(left)
+
+            starts, ends = starts[split], ends[split]
+            middles = (starts + ends) // 2
+            axes = np.argmax(high[split] - low[split], axis=1)
+            sizes = ends - starts
+            node = np.repeat(np.arange(len(starts)), sizes)
+            positions = np.repeat(starts, sizes) + np.arange(
+                sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+            # The first half of each node along its axis goes left.
+            goes_left = np.zeros(n, dtype=bool)
+            on_axis = np.where(axes[node] == 0, by_axis[0][positions],
+                               by_axis[1][positions])
+            goes_left[on_axis] = positions < middles[node]
+            for order in by_axis:
+                items = order[positions]
+                flags = goes_left[items]
+                before = np.cumsum(flags) - flags
+                lefts_before = before - np.repeat(
+                    before[np.cumsum(sizes) - sizes], sizes)
+                order[np.where(flags, starts[node] + lefts_before,
+                               middles[node] + positions - starts[node]
+                               - lefts_before)] = items
+            level = np.column_stack((starts, middles, middles,
+                                     ends)).reshape(-1, 2)
+            count += len(level)
+        self._order = by_axis[0]
+        self._ranges = np.concatenate(ranges) if ranges else level
+        self._lows = np.concatenate(lows) if lows else np.empty((0, 2))
+        self._highs = np.concatenate(highs) if highs else np.empty((0, 2))
+        self._lefts = (np.concatenate(lefts) if lefts
+                       else np.empty(0, dtype=np.intp))
+
+    def _descend(self, queries) -> np.ndarray:
+        # The leaf each query reaches by always taking the nearer child.
+        nodes = np.zeros(len(queries), dtype=np.intp)
+        inner = np.flatnonzero(self._lefts[nodes] >= 0)
+        while len(inner):
+            left = self._lefts[nodes[inner]]
+            near_left = (_min_distances(queries[inner], self._lows[left],
+                                        self._highs[left])
+                         <= _min_distances(queries[inner],
+                                           self._lows[left + 1],
+                                           self._highs[left + 1]))
+            nodes[inner] = np.where(near_left, left, left + 1)
+            inner = inner[self._lefts[nodes[inner]] >= 0]
+        return nodes
+
+    def _leaf_points(self, owner, nodes) -> tuple:
+        # Expand (query, leaf) pairs into (query, point) pairs.
+        starts, ends = self._ranges[nodes, 0], self._ranges[nodes, 1]
+        sizes = ends - starts
+        local = np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes,
+                                                   sizes)
+        return (np.repeat(owner, sizes),
+                self._order[np.repeat(starts, sizes) + local])
+
+    def _nearest(self, queries, k) -> tuple:
+        m = len(queries)
+        best_indices = np.full((m, k), -1, dtype=np.intp)
+        best_distances = np.full((m, k), np.inf)
+
+        # The leaf each query falls in gives it a first bound, so the
+        # walk from the root can prune straight away.
+        first = self._descend(queries)
+        starts, ends = self._ranges[first, 0], self._ranges[first, 1]
+        slots = starts[:, None] + np.arange((ends - starts).max())
+        filled = slots < ends[:, None]
+        items = self._order[np.where(filled, slots, starts[:, None])]
+        distances = np.hypot(self._coords[items, 0] - queries[:, 0, None],
+                             self._coords[items, 1] - queries[:, 1, None])
+        distances[~filled] = np.inf
+        # Only the k nearest of the leaf need sorting: those no farther
+        # than its k-th smallest distance.
+        if k < distances.shape[1]:
+            bound = np.partition(distances, k - 1, axis=1)[:, k - 1]
+            filled &= distances <= bound[:, None]
+        owner = np.nonzero(filled)[0]
+        _merge(best_indices, best_distances, owner, items[filled],
+               distances[filled])
+
+        owner = np.arange(m)
+        nodes = np.zeros(m, dtype=np.intp)
+        while len(owner):
+            bound = best_distances[owner, k - 1]
+            keep = ((_min_distances(queries[owner], self._lows[nodes],
+                                    self._highs[nodes]) <= bound)
+                    & (nodes != first[owner]))
+            owner, nodes = owner[keep], nodes[keep]
+            leaf = self._lefts[nodes] < 0
+            if np.any(leaf):
+                leaf_owner, items = self._leaf_points(owner[leaf],
+                                                      nodes[leaf])
+                _merge(best_indices, best_distances, leaf_owner, items,
+                       _distances(queries[leaf_owner], self._coords[items]))
+            owner, nodes = owner[~leaf], self._lefts[nodes[~leaf]]
+            owner = np.repeat(owner, 2)
+            nodes = np.column_stack((nodes, nodes + 1)).ravel()
+        return best_indices, best_distances
+
+    def _within(self, queries, radius) -> tuple:
+        found_owner, found_items = [], []
+        owner = np.arange(len(queries)) if len(self.points) else []
+        nodes = np.zeros(len(owner), dtype=np.intp)
+        while len(owner):
+            keep = _min_distances(queries[owner], self._lows[nodes],
+                                  self._highs[nodes]) <= radius
+            owner, nodes = owner[keep], nodes[keep]
+            leaf = self._lefts[nodes] < 0
+            if np.any(leaf):
+                leaf_owner, items = self._leaf_points(owner[leaf],
+                                                      nodes[leaf])
+                found_owner.append(leaf_owner)
+                found_items.append(items)
+            owner, nodes = owner[~leaf], self._lefts[nodes[~leaf]]
+            owner = np.repeat(owner, 2)
+            nodes = np.column_stack((nodes, nodes + 1)).ravel()
+        if not found_owner:
+            return np.empty((0, 2), dtype=np.intp), np.empty(0)
+        owner = np.concatenate(found_owner)
+        items = np.concatenate(found_items)
+        distances = _distances(queries[owner], self._coords[items])
+        close = distances <= radius
+        owner, items, distances = owner[close], items[close], distances[close]
+        # One int64 key sorts by query and then point.
+        order = np.argsort(owner.astype(np.int64) * len(self.points) + items)
+        pairs = np.column_stack((owner[order], items[order])).astype(np.intp)
+        return pairs, distances[order]
+
+
+def _as_queries(points) -> tuple:
+    # Query points as an (M, 2) float array, and whether a single point
+    # was given.
+    queries = np.asarray(points, dtype=np.float64)
+    return queries.reshape(-1, 2), queries.ndim == 1
+
+
+def _distances(a, b) -> np.ndarray:
+    return np.hypot(a[:, 0] - b[:, 0], a[:, 1] - b[:, 1])
+
+
+def _min_distances(queries, lows, highs) -> np.ndarray:
+    # Distance from each query to the box in the same row.
+    gap = np.maximum(np.maximum(lows - queries, queries - highs), 0)
+    return np.hypot(gap[:, 0], gap[:, 1])
+
+
+def _merge(best_indices, best_distances, owner, items, distances) -> None:
+    """
+    Merge (query, point) candidates into each query's k best, kept
+    sorted by distance and then index, in place.
+    """
+
+    m, k = best_indices.shape
+    close = distances <= best_distances[owner, k - 1]
+    owner, items, distances = owner[close], items[close], distances[close]
+    touched = np.unique(owner)
+    owner = np.concatenate((owner, np.repeat(touched, k)))
+    items = np.concatenate((items, best_indices[touched].ravel()))
+    distances = np.concatenate((distances, best_distances[touched].ravel()))
+    order = np.lexsort((items, distances, owner))
+    owner, items, distances = owner[order], items[order], distances[order]
+    starts = np.searchsorted(owner, touched)
+    rank = np.arange(len(owner)) - np.repeat(
+        starts, np.diff(np.append(starts, len(owner))))
+    kept = rank < k
+    best_indices[owner[kept], rank[kept]] = items[kept]
+    best_distances[owner[kept], rank[kept]] = distances[kept]
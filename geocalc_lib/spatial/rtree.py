@@ -0,0 +1,276 @@
+# The tree is packed with Sort-Tile-Recursive (Leutenegger, Lopez and
+# Edgington): items are sorted into vertical slices by x, each slice by
+# y, and runs of node_size make the leaves. The same tiling packs each
+# level into the one above, so every leaf is at the same depth and the
+# children of a node are one contiguous range.
+
+# Standard library imports.
+from math import ceil, sqrt
+
+# Third-party imports.
+import numpy as np
+
+# Personal imports.
+from geocalc_lib.shapes.point_set import PointSet, as_coords
+from geocalc_lib.shapes.segment_set import SegmentSet, as_segments
+
+# Default number of children per node.
+_NODE_SIZE = 16
+
+
+class RTree:
+    """
+    A class to represent a static R-tree over points or segments, with
+    its nodes stored in flat arrays.
+
+    Attributes
+    ----------
+    items : np.ndarray
+        The (N, 2) points or (N, 4) segments the tree was built from,
+        shared with the PointSet or SegmentSet passed in.
+    boxes : np.ndarray
+        An (N, 4) float array of the (xmin, ymin, xmax, ymax) bounding
+        box of every item.
+    node_size : int
+        The largest number of children of a node.
+
+    Methods
+    -------
+    window(xmin, ymin, xmax, ymax)
+        Return the indices of the items whose boxes meet a rectangle.
+    overlapping(segments)
+        Return the (query, item) index pairs of the given segments and
+        the items whose boxes overlap theirs.
+    nearest(points, k=1)
+        Return the indices of and distances to the k items nearest to
+        each point.
+
+    Usage
+    -----
+    import numpy as np
+    from geocalc_lib.spatial.rtree import RTree
+
+    # Build the tree from points in one pass.
+    tree = RTree(np.array([[1, 2], [3, 4], [1, 3], [2, 5], [6, 1]]))
+
+    # Everything in the unit square at (1, 2), and the nearest two
+    # points to (2, 2).
+    inside = tree.window(1, 2, 2, 3)
+    indices, distances = tree.nearest((2, 2), k=2)
+    """
+
+    def __init__(self, items, node_size=_NODE_SIZE) -> None:
+        if node_size < 2:
+            raise ValueError("node_size must be at least 2!")
+        self.node_size = node_size
+        if isinstance(items, SegmentSet):
+            self.items = as_segments(items)
+        elif isinstance(items, PointSet):
+            self.items = as_coords(items)
+        else:
+            items = np.asarray(items)
+            if items.ndim == 2 and items.shape[1] == 4:
+                self.items = as_segments(items)
+            else:
+                self.items = as_coords(items)
+        coords = self.items.astype(np.float64)
+        if coords.shape[1] == 2:
+            self.boxes = np.hstack((coords, coords))
+        else:
+            self.boxes = np.hstack((
+                np.minimum(coords[:, 0:2], coords[:, 2:4]),
+                np.maximum(coords[:, 0:2], coords[:, 2:4])))
+        self._build()
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def window(self, xmin, ymin, xmax, ymax) -> np.ndarray:
+        """
+        Return the sorted indices of the items whose bounding boxes meet
+        the rectangle, edges included. For points that is every point
+        inside it.
+        """
+
+        query = np.array([[xmin, ymin, xmax, ymax]], dtype=np.float64)
+        return self._overlapping(query)[:, 1]
+
+    def overlapping(self, segments) -> np.ndarray:
+        """
+        Given a SegmentSet or (M, 4) array of segments, return a (K, 2)
+        array of (query, item) index pairs, sorted, of each segment and
+        every item whose bounding box overlaps the segment's. These are
+        the candidates an exact intersection test needs to check.
+        """
+
+        coords = as_segments(segments).astype(np.float64)
+        boxes = np.hstack((np.minimum(coords[:, 0:2], coords[:, 2:4]),
+                           np.maximum(coords[:, 0:2], coords[:, 2:4])))
+        return self._overlapping(boxes)
+
+    def nearest(self, points, k=1) -> tuple:
+        """
+        Given an (x, y) point or an (M, 2) array of points, return the
+        indices of the k nearest items to each and their distances,
+        nearest first and ties by index, as (k,) or (M, k) arrays.
+        Distances to segments are to their closest point.
+
+        Each level keeps only the nodes that may hold one of the k
+        nearest items: those no farther than the distance that some k
+        items are known to be within.
+        """
+
+        queries = np.asarray(points, dtype=np.float64)
+        single = queries.ndim == 1
+        queries = queries.reshape(-1, 2)
+        k = min(k, len(self.items))
+        if k < 0:
+            raise ValueError("k must be non-negative!")
+        indices = np.empty((len(queries), k), dtype=np.intp)
+        distances = np.empty((len(queries), k))
+        for row, query in enumerate(queries):
+            indices[row], distances[row] = self._nearest(query, k)
+        if single:
+            return indices[0], distances[0]
+        return indices, distances
+
+    def _build(self) -> None:
+        # Pack the leaves over the items, then each level over the one
+        # below, and store the levels root first.
+        n = len(self.items)
+        size = self.node_size
+        self._order = _tile(self.boxes, np.arange(n), size)
+        boxes = self.boxes[self._order]
+        levels = [_pack(boxes, np.ones(n, dtype=np.intp), size)]
+        while len(levels[-1][0]) > 1:
+            boxes, starts, ends, counts = levels[-1]
+            tiled = _tile(boxes, np.arange(len(boxes)), size)
+            levels[-1] = (boxes[tiled], starts[tiled], ends[tiled],
+                          counts[tiled])
+            levels.append(_pack(boxes[tiled], counts[tiled], size))
+        levels.reverse()
+
+        # A node's children are an index range into the next level, or
+        # into the item order for leaves.
+        offsets = np.cumsum([0] + [len(level[0]) for level in levels])
+        self._boxes = np.concatenate([level[0] for level in levels])
+        self._starts = np.concatenate([level[1] + offsets[depth + 1]
+                                       if depth + 1 < len(levels)
+                                       else level[1]
+                                       for depth, level in enumerate(levels)])
+        self._ends = np.concatenate([level[2] + offsets[depth + 1]
+                                     if depth + 1 < len(levels)
+                                     else level[2]
+                                     for depth, level in enumerate(levels)])
+        self._counts = np.concatenate([level[3] for level in levels])
+        self._height = len(levels)
+        self._first_leaf = int(offsets[-2]) if n else 0
+
+    def _children(self, nodes) -> tuple:
+        # Expand nodes into (parent position, child) pairs.
+        sizes = self._ends[nodes] - self._starts[nodes]
+        parents = np.repeat(np.arange(len(nodes)), sizes)
+        local = np.arange(len(parents)) - np.repeat(np.cumsum(sizes) - sizes,
+                                                    sizes)
+        return parents, self._starts[nodes][parents] + local
+
+    def _overlapping(self, queries) -> np.ndarray:
+        # Walk the levels with every (query, node) pair whose boxes
+        # overlap, then test the items of the leaves reached.
+        if not len(self.items) or not len(queries):
+            return np.empty((0, 2), dtype=np.intp)
+        owner = np.arange(len(queries))
+        nodes = np.zeros(len(queries), dtype=np.intp)
+        keep = _overlap(queries[owner], self._boxes[nodes])
+        owner, nodes = owner[keep], nodes[keep]
+        for _ in range(self._height):
+            parents, children = self._children(nodes)
+            owner = owner[parents]
+            if nodes.size and nodes[0] >= self._first_leaf:
+                children = self._order[children]
+                boxes = self.boxes[children]
+            else:
+                boxes = self._boxes[children]
+            keep = _overlap(queries[owner], boxes)
+            owner, nodes = owner[keep], children[keep]
+        pairs = np.column_stack((owner, nodes)).astype(np.intp)
+        return pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+
+    def _nearest(self, query, k) -> tuple:
+        if k == 0:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+        nodes = np.zeros(1, dtype=np.intp)
+        for _ in range(self._height - 1):
+            _, nodes = self._children(nodes)
+            boxes = self._boxes[nodes]
+            low, high = _box_distances(query, boxes)
+            # Some k items lie within the distance where the farthest
+            # corners, nearest first, have covered k items.
+            by_high = np.argsort(high)
+            covered = np.searchsorted(np.cumsum(self._counts[nodes][by_high]),
+                                      k)
+            nodes = nodes[low <= high[by_high[covered]]]
+        _, positions = self._children(nodes)
+        items = self._order[positions]
+        distances = self._distances(query, items)
+        best = np.lexsort((items, distances))[:k]
+        return items[best], distances[best]
+
+    def _distances(self, query, items) -> np.ndarray:
+        # Distances from the query to the items, or to the closest point
+        # of each segment.
+        coords = self.items[items].astype(np.float64)
+        if coords.shape[1] == 2:
+            return np.hypot(coords[:, 0] - query[0], coords[:, 1] - query[1])
+        start = coords[:, 0:2]
+        direction = coords[:, 2:4] - start
+        length = np.sum(direction * direction, axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = np.sum((query - start) * direction, axis=1) / length
+        t = np.clip(np.nan_to_num(t), 0, 1)
+        closest = start + t[:, None] * direction
+        return np.hypot(closest[:, 0] - query[0], closest[:, 1] - query[1])
+
+
+def _tile(boxes, members, size) -> np.ndarray:
+    """
+    Return members ordered by Sort-Tile-Recursive: by box center x into
+    slices of whole nodes, and by center y within each slice.
+    """
+
+    n = len(members)
+    if n <= size:
+        return members
+    centers = (boxes[members, 0:2] + boxes[members, 2:4]) / 2
+    nodes = ceil(n / size)
+    slice_size = size * ceil(nodes / ceil(sqrt(nodes)))
+    by_x = np.argsort(centers[:, 0], kind="stable")
+    slices = np.arange(n) // slice_size
+    return members[by_x[np.lexsort((centers[by_x, 1], slices))]]
+
+
+def _pack(boxes, counts, size) -> tuple:
+    # Group runs of size boxes into parent nodes, returning the parents'
+    # boxes, child ranges and item counts.
+    starts = np.arange(0, len(boxes), size)
+    ends = np.minimum(starts + size, len(boxes))
+    if not len(boxes):
+        return np.empty((0, 4)), starts, ends, np.empty(0, dtype=np.intp)
+    parents = np.hstack((np.minimum.reduceat(boxes[:, 0:2], starts),
+                         np.maximum.reduceat(boxes[:, 2:4], starts)))
+    return parents, starts, ends, np.add.reduceat(counts, starts)
+
+
+def _overlap(a, b) -> np.ndarray:
+    # Whether the boxes in each row of a and b overlap, edges included.
+    return ((a[:, 0] <= b[:, 2]) & (b[:, 0] <= a[:, 2])
+            & (a[:, 1] <= b[:, 3]) & (b[:, 1] <= a[:, 3]))
+
+
+def _box_distances(query, boxes) -> tuple:
+    # The smallest and largest distance from the query to each box.
+    low = np.maximum(np.maximum(boxes[:, 0:2] - query, query - boxes[:, 2:4]),
+                     0)
+    high = np.maximum(np.abs(boxes[:, 0:2] - query),
+                      np.abs(boxes[:, 2:4] - query))
+    return np.hypot(low[:, 0], low[:, 1]), np.hypot(high[:, 0], high[:, 1])
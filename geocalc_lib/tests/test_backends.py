@@ -0,0 +1,177 @@
+import json
+import pytest
+import numpy as np
+from geocalc_lib import backends
+from geocalc_lib.shapes.point import Point
+from geocalc_lib.shapes.point_set import PointSet
+
+
+class TestEngines:
+    @pytest.fixture(params=["int", "float", "collinear", "duplicates"])
+    def points(self, request):
+        rng = np.random.default_rng(1)
+        if request.param == "int":
+            return rng.integers(0, 1000, size=(300, 2))
+        if request.param == "float":
+            return rng.random((300, 2)) * 1000
+        if request.param == "collinear":
+            steps = rng.integers(0, 1000, size=100)
+            return np.column_stack((steps, 3 * steps + 1))
+        return rng.integers(0, 10, size=(200, 2))
+
+    @pytest.fixture
+    def segments(self):
+        rng = np.random.default_rng(2)
+        return rng.integers(0, 1000, size=(150, 4))
+
+    def test_closest_pair_engines_agree(self, points):
+        expected = backends.solve("closest_pair", points, "reference")
+        for name in backends.engines("closest_pair"):
+            distance, pair = backends.solve("closest_pair", points, name)
+            assert distance == pytest.approx(expected[0])
+            i, j = pair
+            assert i < j
+            assert np.hypot(*(points[i] - points[j])) == pytest.approx(
+                expected[0])
+
+    def test_convex_hull_engines_agree(self, points):
+        expected = backends.solve("convex_hull", points, "reference")
+        for name in backends.engines("convex_hull"):
+            hull = backends.solve("convex_hull", points, name)
+            assert np.array_equal(hull.coords, points[expected.indices])
+
+    def test_convex_hull_engines_agree_on_collinear_points(self):
+        # (1, 2) lies on the hull edge from (4, -4) to (0, 4).
+        cases = [np.array([[1, 2], [4, -4], [0, 4], [-2, -1]])]
+        rng = np.random.default_rng(7)
+        for _ in range(300):
+            points = rng.integers(-4, 5, size=(rng.integers(3, 15), 2))
+            # Halves are exact in floating point too.
+            cases.append(points * 0.5 if rng.random() < 0.5 else points)
+        for points in cases:
+            expected = backends.solve("convex_hull", points, "monotone")
+            for name in backends.engines("convex_hull"):
+                hull = backends.solve("convex_hull", points, name)
+                assert np.array_equal(hull.coords, expected.coords), name
+
+    def test_line_segment_engines_agree(self, segments):
+        expected = backends.solve("line_segment", segments, "reference")
+        assert len(expected) > 0
+        for name in backends.engines("line_segment"):
+            pairs = backends.solve("line_segment", segments, name)
+            assert np.array_equal(pairs, expected)
+
+    def test_largest_empty_circle(self):
+        center, radius = backends.solve("largest_empty_circle",
+                                        np.random.default_rng(3).random(
+                                            (50, 2)))
+        assert radius > 0
+
+    def test_largest_empty_circle_engines_agree(self):
+        rng = np.random.default_rng(3)
+        for points in (rng.random((300, 2)) * 1000,
+                       rng.integers(0, 50, size=(300, 2)),
+                       np.array([[0, 0], [0, 1], [1, 0], [1, 1]])):
+            expected = backends.solve("largest_empty_circle", points,
+                                      "reference")
+            for name in backends.engines("largest_empty_circle"):
+                result = backends.solve("largest_empty_circle", points,
+                                        name)
+                assert np.allclose(result.center, expected.center)
+                assert result.radius == pytest.approx(expected.radius)
+                assert np.allclose(np.hypot(*(result.coords
+                                              - result.center).T),
+                                   result.radius)
+
+    def test_point_set_input(self):
+        points = PointSet([Point(0, 0), Point(5, 5), Point(1, 1)])
+        assert backends.solve("closest_pair", points, "grid")[1] == (0, 2)
+
+    def test_too_few_points(self):
+        assert backends.solve("closest_pair", [[1, 2]], "divide") == (
+            float("inf"), None)
+
+    def test_unknown_problem(self):
+        with pytest.raises(ValueError):
+            backends.solve("voronoi", [[0, 0]])
+        with pytest.raises(ValueError):
+            backends.engines("voronoi")
+
+    def test_unknown_engine(self):
+        with pytest.raises(ValueError):
+            backends.solve("closest_pair", [[0, 0], [1, 1]], "quantum")
+
+
+class TestDispatch:
+    @pytest.fixture
+    def config_path(self, tmp_path):
+        path = str(tmp_path / "backends.json")
+        ranking = [[100, ["divide", "grid"]], [10000, ["grid", "divide"]]]
+        with open(path, "w") as file:
+            json.dump({"cpus": 1, "problems": {"closest_pair": {
+                "i": ranking, "f": [[100, ["parallel_only", "grid"]]]},
+                "convex_hull": {"i": [[100, ["parallel", "monotone"]]]}}},
+                file)
+        yield path
+        backends._configs.pop(path, None)
+
+    def test_by_size(self, config_path):
+        small = np.zeros((500, 2), dtype=np.int64)
+        large = np.zeros((2000, 2), dtype=np.int64)
+        assert backends.choose("closest_pair", small, config_path) == "divide"
+        assert backends.choose("closest_pair", large, config_path) == "grid"
+
+    def test_by_dtype(self, config_path):
+        # Engines the registry doesn't know are passed over.
+        points = np.zeros((10, 2))
+        assert backends.choose("closest_pair", points, config_path) == "grid"
+
+    def test_by_cores(self, config_path, monkeypatch):
+        points = np.zeros((10, 2), dtype=np.int64)
+        monkeypatch.setattr(backends.os, "cpu_count", lambda: 1)
+        assert backends.choose("convex_hull", points,
+                               config_path) == "monotone"
+        monkeypatch.setattr(backends.os, "cpu_count", lambda: 4)
+        assert backends.choose("convex_hull", points,
+                               config_path) == "parallel"
+
+    def test_fallback(self, config_path, tmp_path):
+        points = np.zeros((10, 2))
+        assert backends.choose("convex_hull", points, config_path) == "auto"
+        assert backends.choose("closest_pair", points,
+                               str(tmp_path / "missing.json")) == "auto"
+
+    @pytest.mark.parametrize("contents", ['{"problems": {"closest', "[]",
+                                          b"\xff\xfe"])
+    def test_corrupt_file(self, tmp_path, monkeypatch, contents):
+        path = tmp_path / "corrupt.json"
+        if isinstance(contents, bytes):
+            path.write_bytes(contents)
+        else:
+            path.write_text(contents)
+        monkeypatch.setenv(backends.CONFIG_VARIABLE, str(path))
+        points = np.zeros((10, 2), dtype=np.int64)
+        assert backends.load_config() == {}
+        assert backends.choose("closest_pair", points) == "auto"
+        assert backends.solve("closest_pair", [[0, 0], [3, 4]])[0] == 5
+
+    def test_environment_variable(self, config_path, monkeypatch):
+        monkeypatch.setenv(backends.CONFIG_VARIABLE, config_path)
+        points = np.zeros((500, 2), dtype=np.int64)
+        assert backends.choose("closest_pair", points) == "divide"
+
+    def test_calibrate(self, tmp_path):
+        path = str(tmp_path / "calibrated" / "backends.json")
+        config = backends.calibrate(path, sizes=(50, 20), repeat=1,
+                                    problems=["closest_pair"])
+        try:
+            with open(path) as file:
+                assert json.load(file) == config
+            ranking = config["problems"]["closest_pair"]["i"]
+            assert [n for n, _ in ranking] == [20, 50]
+            assert sorted(ranking[0][1]) == ["divide", "grid", "reference"]
+            points = np.zeros((20, 2), dtype=np.int64)
+            assert backends.choose("closest_pair", points,
+                                   path) == ranking[0][1][0]
+        finally:
+            backends._configs.pop(path, None)
@@ -0,0 +1,121 @@
+import pytest
+import numpy as np
+from geocalc_lib.benchmarks import suite
+from geocalc_lib.benchmarks.__main__ import main
+from geocalc_lib.benchmarks.generators import (POINT_WORKLOADS,
+                                               SEGMENT_WORKLOADS,
+                                               grid_points, road_segments)
+
+
+class TestGenerators:
+    @pytest.mark.parametrize("name", sorted(POINT_WORKLOADS))
+    def test_points_are_seeded(self, name):
+        generate = POINT_WORKLOADS[name]
+        assert generate(500, seed=1).shape == (500, 2)
+        assert np.array_equal(generate(500, seed=1), generate(500, seed=1))
+        assert not np.array_equal(generate(500, seed=1),
+                                  generate(500, seed=2))
+
+    @pytest.mark.parametrize("name", sorted(SEGMENT_WORKLOADS))
+    def test_segments_are_seeded(self, name):
+        generate = SEGMENT_WORKLOADS[name]
+        assert generate(500, seed=1).shape == (500, 4)
+        assert np.array_equal(generate(500, seed=1), generate(500, seed=1))
+
+    @pytest.mark.parametrize("n", [0, 1, 2])
+    def test_tiny_sizes(self, n):
+        for generate in {**POINT_WORKLOADS, **SEGMENT_WORKLOADS}.values():
+            assert len(generate(n)) == n
+
+    def test_grid_has_duplicates(self):
+        points = grid_points(1000)
+        assert len(np.unique(points, axis=0)) < 500
+
+    def test_roads_share_endpoints(self):
+        segments = road_segments(1000)
+        joined = np.all(segments[1:, :2] == segments[:-1, 2:], axis=1)
+        assert joined.mean() > 0.9
+
+
+class TestSuite:
+    @pytest.fixture
+    def results(self):
+        return suite.run(sizes=[50, 200], workloads=["uniform", "roads"],
+                         repeat=1)
+
+    def test_run(self, results):
+        cases = results["results"]
+        assert len(cases) == 2 * len(suite.ALGORITHMS)
+        assert all(case["seconds"] > 0 for case in cases)
+        assert {case["workload"] for case in cases} == {"uniform", "roads"}
+        assert results["environment"]["cpus"] >= 1
+
+    def test_errors_are_recorded(self):
+        results = suite.run(sizes=[20], algorithms=["largest_empty_circle"],
+                            workloads=["collinear"], repeat=1)
+        case, = results["results"]
+        assert case["seconds"] is None
+        assert case["error"].startswith("QhullError")
+        assert "\n" not in case["error"]
+
+    def test_over_budget_skips_larger_sizes(self):
+        results = suite.run(sizes=[100, 10, 1000], algorithms=["convex_hull"],
+                            workloads=["uniform"], repeat=1, time_budget=0)
+        assert [case["n"] for case in results["results"]] == [10, 100, 1000]
+        assert [case["seconds"] is None
+                for case in results["results"]] == [False, True, True]
+
+    def test_save_and_load(self, results, tmp_path):
+        path = tmp_path / "results.json"
+        suite.save(results, path)
+        assert suite.load(path) == results
+
+    def test_compare(self, results):
+        baseline = {"results": [dict(case) for case in results["results"]]}
+        assert suite.compare(results, baseline) == []
+        slow = baseline["results"][0]
+        slow["seconds"] = 1.0
+        baseline["results"][1]["seconds"] = 1e-4
+        results["results"][1]["seconds"] = 1e-3
+        fast = {**results, "results": [dict(case)
+                                       for case in results["results"]]}
+        fast["results"][0]["seconds"] = 2.0
+        regressions = suite.compare(fast, baseline)
+        # The tenfold slowdown under the noise floor is ignored.
+        assert [(case["algorithm"], case["ratio"])
+                for case in regressions] == [(slow["algorithm"], 2.0)]
+
+    def test_failures_regress(self, results):
+        failed = {"results": [dict(case, seconds=None, error="ValueError")
+                              for case in results["results"]]}
+        assert len(suite.compare(failed, results)) == len(
+            results["results"])
+
+
+class TestCommandLine:
+    def test_baseline_round_trip(self, tmp_path):
+        baseline = tmp_path / "baseline.json"
+        output = tmp_path / "run.json"
+        args = ["--sizes", "50", "--algorithms", "convex_hull",
+                "--workloads", "uniform", "--repeat", "1",
+                "--baseline", str(baseline)]
+        assert main(args + ["--save-baseline"]) == 0
+        assert main(args + ["--output", str(output)]) == 0
+        assert len(suite.load(output)["results"]) == 1
+
+    def test_regression_fails(self, tmp_path, capsys, monkeypatch):
+        baseline = tmp_path / "baseline.json"
+        args = ["--sizes", "50", "--algorithms", "convex_hull",
+                "--workloads", "uniform", "--repeat", "1",
+                "--baseline", str(baseline)]
+        main(args + ["--save-baseline"])
+        monkeypatch.setattr(suite, "_NOISE_FLOOR", 0)
+        saved = suite.load(baseline)
+        saved["results"][0]["seconds"] = 1e-12
+        suite.save(saved, baseline)
+        assert main(args) == 1
+        assert "convex_hull uniform n=50" in capsys.readouterr().err
+
+    def test_save_baseline_needs_path(self):
+        with pytest.raises(SystemExit):
+            main(["--save-baseline"])
@@ -0,0 +1,79 @@
+import pytest
+import numpy as np
+from geocalc_lib.shapes.point import Point
+from geocalc_lib.shapes.point_set import PointSet
+from geocalc_lib.algorithms.closest_pair_of_points import ClosestPairOfPoints
+
+
+def brute_force_distance(coords):
+    coords = np.asarray(coords, dtype=float)
+    diff = coords[:, None, :] - coords[None, :, :]
+    dist = np.sqrt((diff ** 2).sum(axis=-1))
+    dist[np.tril_indices(len(coords))] = np.inf
+    return dist.min()
+
+
+class TestClosestPairArray:
+    @pytest.fixture
+    def cpp(self):
+        return ClosestPairOfPoints(np.empty((0, 2)))
+
+    def test_two_points(self, cpp):
+        dist, pair = cpp.closest_pair(np.array([[0, 0], [3, 4]]))
+        assert dist == 5
+        assert pair == (0, 1)
+
+    def test_returns_indices_into_input(self, cpp):
+        points = np.array([[10, 10], [0, 0], [5, 5], [5, 6], [20, 0]])
+        dist, pair = cpp.closest_pair(points)
+        assert dist == 1
+        assert pair == (2, 3)
+
+    def test_empty_and_single(self, cpp):
+        assert cpp.closest_pair(np.empty((0, 2))) == (float("inf"), None)
+        assert cpp.closest_pair(np.array([[1, 1]])) == (float("inf"), None)
+
+    def test_duplicates(self, cpp):
+        points = np.array([[1, 1], [4, 4], [1, 1], [2, 2]])
+        dist, pair = cpp.closest_pair(points)
+        assert dist == 0
+        assert pair == (0, 2)
+
+    def test_collinear_vertical(self, cpp):
+        points = np.array([[0, i * i] for i in range(200)])
+        dist, pair = cpp.closest_pair(points)
+        assert dist == 1
+        assert pair == (0, 1)
+
+    def test_crossing_midpoint(self, cpp):
+        points = np.array([[-2, 0], [-1, 0], [1, 0], [2, 0]])
+        assert cpp.closest_pair(points)[0] == 1
+
+    def test_accepts_point_set_and_points(self):
+        points = PointSet([[0, 0], [4, 0], [4, 3], [9, 9]])
+        cpp = ClosestPairOfPoints(points)
+        assert cpp.closest_pair() == (3.0, (1, 2))
+        cpp = ClosestPairOfPoints([Point(0, 0), Point(4, 0), Point(4, 3)])
+        assert cpp.closest_pair() == (3.0, (1, 2))
+
+    def test_matches_closest_util(self):
+        rng = np.random.default_rng(3)
+        points = PointSet(rng.integers(-50, 50, size=(300, 2)))
+        cpp = ClosestPairOfPoints(points)
+        assert cpp.closest_pair()[0] == pytest.approx(
+            cpp.closest_util(points)[0])
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_random_float_against_brute_force(self, cpp, seed):
+        rng = np.random.default_rng(seed)
+        points = rng.random((500, 2))
+        dist, (i, j) = cpp.closest_pair(points)
+        assert dist == pytest.approx(brute_force_distance(points))
+        assert np.hypot(*(points[i] - points[j])) == pytest.approx(dist)
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_random_grid_against_brute_force(self, cpp, seed):
+        rng = np.random.default_rng(seed)
+        points = rng.integers(0, 2000, size=(700, 2))
+        dist, _ = cpp.closest_pair(points)
+        assert dist == pytest.approx(brute_force_distance(points))
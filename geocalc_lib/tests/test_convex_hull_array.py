@@ -0,0 +1,256 @@
+import pytest
+import numpy as np
+from geocalc_lib.shapes.point_set import PointSet
+from geocalc_lib.algorithms.convex_hull import (ConvexHull,
+                                                akl_toussaint_filter)
+
+
+def hull_set(points, indices):
+    return sorted(map(tuple, np.asarray(points)[indices].tolist()))
+
+
+class TestMonotoneChain:
+    @pytest.fixture
+    def ch(self):
+        return ConvexHull(np.empty((0, 2)))
+
+    def test_square(self, ch):
+        points = np.array([(0, 0), (1, 0), (1, 1), (0, 1)])
+        assert ch.monotone_chain(points).tolist() == [0, 1, 2, 3]
+
+    def test_counterclockwise_from_lowest_leftmost(self, ch):
+        points = np.array([(0, 1), (1, 0), (0, -1), (-1, 0)])
+        assert ch.monotone_chain(points).tolist() == [3, 2, 1, 0]
+
+    def test_interior_and_collinear_points_dropped(self, ch):
+        points = np.array([(0, 0), (2, 0), (4, 0), (4, 4), (2, 2), (0, 4),
+                           (0, 2), (1, 3)])
+        assert ch.monotone_chain(points).tolist() == [0, 2, 3, 5]
+
+    def test_line(self, ch):
+        points = np.array([(4, 4), (3, 3), (2, 2), (1, 1), (0, 0)])
+        assert ch.monotone_chain(points).tolist() == [4, 0]
+
+    def test_duplicates(self, ch):
+        points = np.array([(0, 0), (1, 1), (1, 1), (2, 0), (0, 0), (1, 3)])
+        assert hull_set(points, ch.monotone_chain(points)) == [
+            (0, 0), (1, 3), (2, 0)]
+
+    def test_single_and_empty(self, ch):
+        assert ch.monotone_chain(np.array([[5, 5], [5, 5]])).tolist() == [0]
+        assert len(ch.monotone_chain(np.empty((0, 2)))) == 0
+
+    def test_point_set_input(self):
+        points = PointSet([(0, 0), (3, 0), (1, 1), (0, 3)])
+        ch = ConvexHull(points)
+        assert ch.monotone_chain().tolist() == [0, 1, 3]
+
+    def test_matches_graham_scan(self, ch):
+        rng = np.random.default_rng(1)
+        points = rng.integers(0, 100, size=(200, 2))
+        graham = ch.graham_scan(points)
+        assert hull_set(points, ch.monotone_chain(points)) == sorted(
+            set(graham))
+
+    def test_large_integer_coordinates_exact(self, ch):
+        # Cross products of these overflow int64, so exact Python ints
+        # are used.
+        big = 2 ** 40
+        points = np.array([(0, 0), (big, 1), (2 * big, 2), (big, big)])
+        assert ch.monotone_chain(points).tolist() == [0, 2, 3]
+
+    def test_float_ties_in_x(self, ch):
+        points = np.array([(0.5, 0.0), (0.5, 1.0), (0.5, 0.5), (1.5, 0.5)])
+        assert ch.monotone_chain(points).tolist() == [0, 3, 1]
+
+    @pytest.mark.parametrize("seed", range(4))
+    def test_convex_position(self, ch, seed):
+        rng = np.random.default_rng(seed)
+        angles = np.sort(rng.choice(3600, size=300, replace=False))
+        points = np.column_stack((np.round(1000 * np.cos(angles / 10)),
+                                  np.round(1000 * np.sin(angles / 10))))
+        hull = ch.monotone_chain(points)
+        # Every point is on the hull or inside it.
+        xs, ys = points[hull, 0], points[hull, 1]
+        edges_x = np.roll(xs, -1) - xs
+        edges_y = np.roll(ys, -1) - ys
+        cross = (edges_x[:, None] * (points[None, :, 1] - ys[:, None])
+                 - edges_y[:, None] * (points[None, :, 0] - xs[:, None]))
+        assert np.all(cross >= 0)
+        # And consecutive hull edges always turn left.
+        turns = edges_x * np.roll(edges_y, -1) - edges_y * np.roll(edges_x,
+                                                                   -1)
+        assert np.all(turns > 0)
+
+
+class TestGrahamScan:
+    @pytest.fixture
+    def ch(self):
+        return ConvexHull(None)
+
+    def test_point_on_edge_from_pivot(self, ch):
+        # (1, 2) lies on the edge from the pivot (4, -4) to (0, 4), at
+        # the same angle, and must not replace (0, 4).
+        points = [(1, 2), (4, -4), (0, 4), (-2, -1)]
+        assert ch.graham_scan(points) == [(4, -4), (0, 4), (-2, -1),
+                                          (4, -4)]
+
+    def test_small_grids_match_monotone_chain(self, ch):
+        rng = np.random.default_rng(8)
+        for _ in range(200):
+            points = rng.integers(-4, 5, size=(rng.integers(3, 15), 2))
+            if len(np.unique(points, axis=0)) < 3:
+                continue
+            hull = ch.graham_scan(points)[:-1]
+            assert sorted(hull) == hull_set(points,
+                                            ch.monotone_chain(points))
+
+
+class TestAklToussaint:
+    @pytest.fixture
+    def ch(self):
+        return ConvexHull(np.empty((0, 2)))
+
+    def test_interior_points_removed(self):
+        points = np.array([(0, 0), (4, 0), (4, 4), (0, 4), (2, 2), (1, 3),
+                           (2, 0)])
+        assert akl_toussaint_filter(points).tolist() == [0, 1, 2, 3, 6]
+
+    def test_four_directions_keeps_hull(self):
+        points = np.array([(0, 2), (2, 0), (4, 2), (2, 4), (2, 2), (1, 2),
+                           (2, 3)])
+        assert akl_toussaint_filter(points, 4).tolist() == [0, 1, 2, 3]
+
+    def test_small_input_kept(self):
+        points = np.array([(0, 0), (1, 1), (2, 0)])
+        assert akl_toussaint_filter(points).tolist() == [0, 1, 2]
+
+    def test_degenerate_polygon_keeps_everything(self):
+        points = np.array([(0, 0), (1, 1), (2, 2), (3, 3)])
+        assert akl_toussaint_filter(points).tolist() == [0, 1, 2, 3]
+
+    def test_bad_directions(self):
+        with pytest.raises(ValueError):
+            akl_toussaint_filter(np.zeros((5, 2)), directions=5)
+
+    @pytest.mark.parametrize("seed", range(4))
+    def test_prefilter_same_hull(self, ch, seed):
+        rng = np.random.default_rng(seed)
+        points = (rng.integers(-500, 500, size=(2000, 2)) if seed % 2
+                  else rng.normal(size=(2000, 2)))
+        hull = ch.monotone_chain(points)
+        assert ch.monotone_chain(points, prefilter=True).tolist() == (
+            hull.tolist())
+        assert set(hull) <= set(akl_toussaint_filter(points))
+
+    @pytest.mark.parametrize("seed", range(4))
+    def test_farthest_pair_against_brute_force(self, ch, seed):
+        rng = np.random.default_rng(seed)
+        points = rng.integers(0, 100, size=(300, 2))
+        diff = points[:, None, :] - points[None, :, :]
+        dist = np.sqrt((diff ** 2).sum(axis=-1))
+        best, (i, j) = ch.farthest_pair(points)
+        assert i < j
+        assert best == pytest.approx(dist.max())
+        assert dist[i, j] == pytest.approx(best)
+
+    def test_farthest_pair_degenerate(self, ch):
+        assert ch.farthest_pair(np.array([[1, 1]])) == (0.0, None)
+        assert ch.farthest_pair(np.array([[1, 1], [1, 1]])) == (0.0, (0, 1))
+
+
+class TestChan:
+    @pytest.fixture
+    def ch(self):
+        return ConvexHull(np.empty((0, 2)))
+
+    @pytest.mark.parametrize("group_size", [3, 5, 16, None])
+    def test_matches_monotone_chain(self, ch, group_size):
+        rng = np.random.default_rng(2)
+        for points in (rng.integers(-30, 30, size=(500, 2)),
+                       rng.random((500, 2)),
+                       rng.integers(-2 ** 40, 2 ** 40, size=(500, 2))):
+            expected = points[ch.monotone_chain(points)]
+            assert np.array_equal(points[ch.chan(points, group_size)],
+                                  expected)
+
+    def test_group_size_grows(self, ch):
+        # A circle has every point on the hull, so small groups fail
+        # the march and are squared.
+        angles = np.arange(200) * 2 * np.pi / 200
+        points = np.column_stack((np.cos(angles), np.sin(angles)))
+        assert np.array_equal(ch.chan(points, 4), ch.monotone_chain(points))
+
+    def test_degenerate(self, ch):
+        assert len(ch.chan(np.empty((0, 2)))) == 0
+        assert ch.chan(np.zeros((5, 2))).tolist() == [0]
+        line = np.array([(3, 3), (1, 1), (4, 4), (2, 2), (0, 0)])
+        assert ch.chan(line, 3).tolist() == [4, 2]
+        assert ch.chan(np.array([(0, 0), (0, 2), (0, 1)]), 3).tolist() == [
+            0, 1]
+
+    def test_point_set_input(self):
+        points = PointSet([(0, 0), (3, 0), (1, 1), (0, 3)])
+        assert ConvexHull(points).chan().tolist() == [0, 1, 3]
+
+    def test_nearly_collinear_floats(self, ch):
+        # Rounded cross products along a float line disagree with each
+        # other, which used to send the march round in a cycle.
+        x = np.linspace(0, 1, 143)
+        points = np.column_stack((x, 0.1 + 0.3 * x))
+        assert np.array_equal(ch.chan(points, 16), ch.monotone_chain(points))
+        rng = np.random.default_rng(6)
+        for _ in range(50):
+            x = np.linspace(rng.random(), 10 * rng.random(),
+                            rng.integers(3, 400))
+            rng.shuffle(x)
+            points = np.column_stack((x, rng.random() + rng.random() * x))
+            for group_size in (3, 16, None):
+                hull = ch.chan(points, group_size).tolist()
+                assert len(set(hull)) == len(hull)
+                assert {np.argmin(x), np.argmax(x)} <= set(hull)
+
+    def test_nearly_collinear_floats_auto(self, ch):
+        x = np.linspace(0, 1, 300000)
+        points = np.column_stack((x, 0.1 + 0.3 * x))
+        assert np.array_equal(ch.hull(points), ch.monotone_chain(points))
+
+    @pytest.mark.parametrize("method", ["auto", "monotone", "chan"])
+    def test_hull_methods(self, ch, method):
+        rng = np.random.default_rng(3)
+        points = rng.normal(size=(3000, 2))
+        assert np.array_equal(ch.hull(points, method=method),
+                              ch.monotone_chain(points))
+
+    def test_unknown_method(self, ch):
+        with pytest.raises(ValueError):
+            ch.hull(np.zeros((3, 2)), method="quickhull")
+
+
+class TestParallelHull:
+    @pytest.fixture
+    def ch(self):
+        return ConvexHull(np.empty((0, 2)))
+
+    @pytest.mark.parametrize("workers", [2, 3])
+    def test_matches_serial(self, ch, workers):
+        rng = np.random.default_rng(4)
+        points = rng.integers(0, 300, size=(2 ** 17, 2))
+        assert np.array_equal(ch.parallel_hull(points, workers),
+                              ch.monotone_chain(points))
+
+    def test_small_input_runs_serially(self, ch):
+        points = np.array([(0, 0), (3, 0), (1, 1), (0, 3)])
+        assert ch.parallel_hull(points, workers=4).tolist() == [0, 1, 3]
+
+    def test_hull_method(self):
+        rng = np.random.default_rng(5)
+        points = PointSet(rng.normal(size=(2 ** 16, 2)))
+        ch = ConvexHull(points)
+        assert np.array_equal(ch.hull(method="parallel", workers=2),
+                              ch.monotone_chain())
+
+    def test_repeated_points_use_smallest_index(self, ch):
+        points = np.array([(1, 1), (0, 0), (2, 0), (0, 0), (2, 0), (1, 3)])
+        assert ch.monotone_chain(points).tolist() == [1, 2, 5]
+        assert ch.chan(points, 3).tolist() == [1, 2, 5]
@@ -0,0 +1,74 @@
+import random
+import pytest
+import numpy as np
+from geocalc_lib.shapes.point import Point
+from geocalc_lib.algorithms.convex_hull import ConvexHull
+from geocalc_lib.algorithms.dynamic_convex_hull import DynamicConvexHull
+
+
+def static_hull(points):
+    if not points:
+        return []
+    hull = ConvexHull(None).monotone_chain(np.array(points))
+    return [tuple(points[index]) for index in hull]
+
+
+class TestDynamicConvexHull:
+    @pytest.fixture
+    def tracker(self):
+        return DynamicConvexHull([(0, 0), (4, 0), (4, 4), (0, 4), (3, 2)])
+
+    def test_initial_hull(self, tracker):
+        assert tracker.hull() == [(0, 0), (4, 0), (4, 4), (0, 4)]
+        assert len(tracker) == 5
+
+    def test_add_outside_point(self, tracker):
+        tracker.add_point(Point(6, 2))
+        assert tracker.hull() == [(0, 0), (4, 0), (6, 2), (4, 4), (0, 4)]
+
+    def test_add_point_removes_vertices(self, tracker):
+        tracker.add_point((8, -1))
+        tracker.add_point((8, 8))
+        assert tracker.hull() == [(0, 0), (8, -1), (8, 8), (0, 4)]
+
+    def test_add_inside_and_collinear(self, tracker):
+        tracker.add_point((1, 3))
+        tracker.add_point((2, 0))
+        assert tracker.hull() == [(0, 0), (4, 0), (4, 4), (0, 4)]
+
+    def test_remove_vertex_uncovers_interior(self, tracker):
+        tracker.remove_point((4, 4))
+        assert tracker.hull() == [(0, 0), (4, 0), (3, 2), (0, 4)]
+
+    def test_remove_duplicate_keeps_vertex(self, tracker):
+        tracker.add_point((4, 4))
+        tracker.remove_point((4, 4))
+        assert (4, 4) in tracker
+        assert tracker.hull() == [(0, 0), (4, 0), (4, 4), (0, 4)]
+
+    def test_remove_missing_point(self, tracker):
+        with pytest.raises(ValueError):
+            tracker.remove_point((9, 9))
+
+    def test_clear_and_small_hulls(self, tracker):
+        tracker.clear()
+        assert tracker.hull() == []
+        tracker.add_point((1, 1))
+        assert tracker.hull() == [(1, 1)]
+        tracker.add_point((3, 3))
+        tracker.add_point((2, 2))
+        assert tracker.hull() == [(1, 1), (3, 3)]
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_static_hull(self, seed):
+        rng = random.Random(seed)
+        tracker = DynamicConvexHull()
+        points = []
+        for _ in range(300):
+            if points and rng.random() < 0.3:
+                tracker.remove_point(points.pop(rng.randrange(len(points))))
+            else:
+                point = (rng.randint(-20, 20), rng.randint(-20, 20))
+                points.append(point)
+                tracker.add_point(point)
+            assert tracker.hull() == static_hull(points)
@@ -0,0 +1,104 @@
+import pytest
+import numpy as np
+from geocalc_lib.shapes.point import Point
+from geocalc_lib.algorithms.dynamic_delaunay import DynamicDelaunay
+from geocalc_lib.algorithms.largest_empty_circle import LargestEmptyCircle
+
+
+def largest_radius(points, delaunay=None):
+    lec = LargestEmptyCircle(np.array(points), delaunay)
+    return lec.find_largest_empty_circle()[1]
+
+
+class TestDynamicDelaunay:
+    @pytest.fixture
+    def tracker(self):
+        return DynamicDelaunay([(0, 0), (4, 0), (4, 4), (0, 4), (3, 2)])
+
+    def test_points_in_order(self, tracker):
+        tracker.add_point(Point(1, 3))
+        assert tracker.points[-2:] == [(3, 2), (1, 3)]
+        assert len(tracker) == 6
+        assert np.array_equal(tracker.triangulation().points,
+                              tracker.points)
+
+    def test_cocircular_start(self):
+        # Qhull's incremental mode can't start from four cocircular
+        # points, so the first triangulation is static.
+        tracker = DynamicDelaunay([(0, 0), (4, 0), (4, 4), (0, 4)])
+        assert len(tracker.triangulation().simplices) == 2
+        tracker.add_point((1, 2))
+        assert len(tracker.triangulation().simplices) == 4
+
+    def test_added_points_reuse_triangulation(self):
+        rng = np.random.default_rng(1)
+        tracker = DynamicDelaunay(map(tuple, rng.random((1000, 2))))
+        delaunay = tracker.triangulation()
+        for point in [(1, 1), (2, 3), (5, 5)]:
+            tracker.add_point(point)
+            assert tracker.triangulation() is delaunay
+        assert largest_radius(tracker.points, delaunay) == pytest.approx(
+            largest_radius(tracker.points))
+
+    def test_many_added_points_rebuild(self, tracker):
+        delaunay = tracker.triangulation()
+        tracker.add_point((1, 1))
+        tracker.add_point((2, 3))
+        assert tracker.triangulation() is not delaunay
+        assert len(tracker.triangulation().points) == 7
+
+    def test_remove_rebuilds(self, tracker):
+        delaunay = tracker.triangulation()
+        tracker.remove_point((3, 2))
+        assert tracker.triangulation() is not delaunay
+        assert len(tracker.triangulation().points) == 4
+        assert largest_radius(tracker.points, tracker.triangulation()) == (
+            pytest.approx(np.sqrt(8)))
+
+    def test_remove_pending_point_keeps_triangulation(self, tracker):
+        delaunay = tracker.triangulation()
+        tracker.add_point((1, 1))
+        tracker.remove_point((1, 1))
+        assert tracker.triangulation() is delaunay
+
+    def test_remove_missing(self, tracker):
+        with pytest.raises(ValueError):
+            tracker.remove_point((9, 9))
+
+    def test_clear_and_empty(self, tracker):
+        tracker.clear()
+        assert len(tracker) == 0
+        with pytest.raises(ValueError):
+            tracker.triangulation()
+
+    def test_collinear_then_recovers(self):
+        tracker = DynamicDelaunay([(0, 0), (1, 1), (2, 2)])
+        with pytest.raises(Exception):
+            tracker.triangulation()
+        tracker.add_point((0, 2))
+        assert len(tracker.triangulation().simplices) == 2
+
+    def test_random_updates_match_fresh(self):
+        rng = np.random.default_rng(0)
+        tracker = DynamicDelaunay()
+        for step in range(300):
+            if len(tracker) > 10 and rng.random() < 0.2:
+                tracker.remove_point(tracker.points[rng.integers(
+                    len(tracker))])
+            else:
+                tracker.add_point(tuple(rng.integers(0, 50, size=2)))
+            if step % 25 == 24:
+                assert largest_radius(tracker.points,
+                                      tracker.triangulation()) == (
+                    pytest.approx(largest_radius(tracker.points)))
+
+    def test_bounded_circle_with_repeated_points(self):
+        points = [(0, 0), (4, 0), (4, 4), (0, 4), (0, 0), (4, 4)]
+        tracker = DynamicDelaunay(points)
+        lec = LargestEmptyCircle(np.array(points), tracker.triangulation())
+        assert lec.find_largest_empty_circle(within="hull")[1] == (
+            pytest.approx(np.sqrt(8)))
+
+    def test_mismatched_triangulation(self, tracker):
+        with pytest.raises(ValueError):
+            LargestEmptyCircle(np.zeros((3, 2)), tracker.triangulation())
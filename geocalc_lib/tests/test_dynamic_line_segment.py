@@ -0,0 +1,92 @@
+import pytest
+import numpy as np
+from geocalc_lib.shapes.point import Point
+from geocalc_lib.shapes.line import Line
+from geocalc_lib.algorithms.line_segment import LineSegmentIntersection
+from geocalc_lib.algorithms.dynamic_line_segment import (
+    DynamicLineSegmentIntersection)
+
+
+def static_pairs(segments):
+    lsi = LineSegmentIntersection(None)
+    return lsi.intersecting_pairs(np.array(segments).reshape(-1, 4),
+                                  method="brute").tolist()
+
+
+class TestDynamicLineSegmentIntersection:
+    @pytest.fixture
+    def tracker(self):
+        return DynamicLineSegmentIntersection([(0, 0, 4, 4), (0, 4, 4, 0),
+                                               (5, 5, 6, 6)])
+
+    def test_initial_pairs(self, tracker):
+        assert tracker.intersecting_pairs().tolist() == [[0, 1]]
+        assert len(tracker) == 3
+
+    def test_add_line(self, tracker):
+        tracker.add_line(Line(Point(2, 0), Point(2, 9)))
+        assert tracker.intersecting_pairs().tolist() == [[0, 1], [0, 3],
+                                                         [1, 3]]
+
+    def test_remove_line_shifts_indices(self, tracker):
+        tracker.add_line((5, 6, 6, 5))
+        tracker.remove_line((0, 4, 4, 0))
+        assert tracker.segments == [(0, 0, 4, 4), (5, 5, 6, 6),
+                                    (5, 6, 6, 5)]
+        assert tracker.intersecting_pairs().tolist() == [[1, 2]]
+
+    def test_remove_missing(self, tracker):
+        with pytest.raises(ValueError):
+            tracker.remove_line((9, 9, 8, 8))
+
+    def test_clear(self, tracker):
+        tracker.clear()
+        assert len(tracker) == 0
+        assert tracker.intersecting_pairs().shape == (0, 2)
+        tracker.add_line((0, 0, 1, 1))
+        assert tracker.intersecting_pairs().shape == (0, 2)
+
+    def test_intersections_cached(self, tracker):
+        pairs, where = tracker.intersections()
+        assert pairs.tolist() == [[0, 1]]
+        assert where.tolist() == [[2, 2, 2, 2]]
+        # Results are copies, so the cache can't be changed by callers.
+        where[0, 0] = 99
+        assert tracker.intersections()[1].tolist() == [[2, 2, 2, 2]]
+        tracker.add_line((2, 2, 7, 7))
+        assert tracker.intersections()[1].tolist() == [[2, 2, 2, 2],
+                                                       [2, 2, 4, 4],
+                                                       [2, 2, 2, 2],
+                                                       [5, 5, 6, 6]]
+
+    def test_long_lines(self):
+        # Short lines set a small grid cell, which the long ones would
+        # cover many times over.
+        short = [(x, 0, x + 1, 1) for x in range(0, 200, 2)]
+        tracker = DynamicLineSegmentIntersection(short)
+        tracker.add_line((0, 0.5, 200, 0.5))
+        tracker.add_line((0, 1, 200, 0))
+        assert tracker.intersecting_pairs().tolist() == static_pairs(
+            tracker.segments)
+        tracker.remove_line((0, 0.5, 200, 0.5))
+        assert tracker.intersecting_pairs().tolist() == static_pairs(
+            tracker.segments)
+
+    def test_random_updates_match_static(self):
+        rng = np.random.default_rng(0)
+        tracker = DynamicLineSegmentIntersection()
+        for step in range(600):
+            if len(tracker) > 5 and rng.random() < 0.3:
+                tracker.remove_line(tracker.segments[rng.integers(
+                    len(tracker))])
+            else:
+                start = rng.integers(0, 60, size=2)
+                end = start + rng.integers(-4, 5, size=2)
+                if rng.random() < 0.05:
+                    end = rng.integers(0, 60, size=2)
+                if np.array_equal(start, end):
+                    continue
+                tracker.add_line(np.concatenate((start, end)))
+            if step % 50 == 49:
+                assert tracker.intersecting_pairs().tolist() == (
+                    static_pairs(tracker.segments))
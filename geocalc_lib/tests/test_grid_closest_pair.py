@@ -0,0 +1,101 @@
+import pytest
+import numpy as np
+from geocalc_lib.shapes.point_set import PointSet
+from geocalc_lib.algorithms.grid_closest_pair import GridClosestPair
+from geocalc_lib.algorithms.closest_pair_of_points import ClosestPairOfPoints
+
+
+def brute_force_distances(coords):
+    coords = np.asarray(coords, dtype=float)
+    diff = coords[:, None, :] - coords[None, :, :]
+    dist = np.sqrt((diff ** 2).sum(axis=-1))
+    dist[np.tril_indices(len(coords))] = np.inf
+    return dist
+
+
+class TestGridClosestPair:
+    def test_small_input(self):
+        grid = GridClosestPair(np.array([[0, 0], [5, 5], [1, 1]]))
+        dist, pair = grid.closest_pair()
+        assert dist == pytest.approx(np.sqrt(2))
+        assert pair == (0, 2)
+
+    def test_empty_and_single(self):
+        assert GridClosestPair(np.empty((0, 2))).closest_pair() == (
+            float("inf"), None)
+        assert GridClosestPair(np.array([[1, 1]])).closest_pair() == (
+            float("inf"), None)
+
+    @pytest.mark.parametrize("seed", range(4))
+    def test_closest_pair_against_brute_force(self, seed):
+        rng = np.random.default_rng(seed)
+        points = rng.random((1500, 2))
+        dist, (i, j) = GridClosestPair(points, seed=seed).closest_pair()
+        assert dist == brute_force_distances(points).min()
+        assert i < j
+        assert np.hypot(*(points[i] - points[j])) == pytest.approx(dist)
+
+    def test_closest_pair_duplicates(self):
+        rng = np.random.default_rng(7)
+        points = rng.integers(0, 30, size=(2000, 2))
+        dist, (i, j) = GridClosestPair(points, seed=0).closest_pair()
+        assert dist == 0
+        assert np.array_equal(points[i], points[j])
+
+    def test_closest_pair_collinear(self):
+        points = np.column_stack((np.arange(1000) ** 1.5,
+                                  np.zeros(1000)))
+        dist, pair = GridClosestPair(points, seed=0).closest_pair()
+        assert dist == 1
+        assert pair == (0, 1)
+
+    def test_pairs_within(self):
+        points = np.array([[0, 0], [1, 0], [3, 0], [3, 1], [10, 10]])
+        pairs, distances = GridClosestPair(points).pairs_within(1)
+        assert pairs.tolist() == [[0, 1], [2, 3]]
+        assert distances.tolist() == [1, 1]
+
+    def test_pairs_within_zero_radius(self):
+        points = np.array([[0, 0], [1, 0], [0, 0], [1, 0]])
+        pairs, distances = GridClosestPair(points).pairs_within(0)
+        assert pairs.tolist() == [[0, 2], [1, 3]]
+        assert distances.tolist() == [0, 0]
+
+    def test_pairs_within_negative_radius(self):
+        with pytest.raises(ValueError):
+            GridClosestPair(np.zeros((2, 2))).pairs_within(-1)
+
+    @pytest.mark.parametrize("seed", range(4))
+    def test_pairs_within_against_brute_force(self, seed):
+        rng = np.random.default_rng(seed)
+        points = rng.integers(0, 200, size=(600, 2))
+        dist = brute_force_distances(points)
+        r = np.sqrt(50)
+        pairs, distances = GridClosestPair(points).pairs_within(r)
+        assert pairs.tolist() == np.argwhere(dist <= r).tolist()
+        assert np.allclose(distances, dist[dist <= r])
+
+
+class TestClosestPairMethods:
+    @pytest.fixture
+    def points(self):
+        rng = np.random.default_rng(11)
+        return PointSet(rng.random((5000, 2)))
+
+    def test_methods_agree(self, points):
+        cpp = ClosestPairOfPoints(points)
+        divide = cpp.closest_pair(method="divide")
+        grid = cpp.closest_pair(method="grid")
+        auto = cpp.closest_pair()
+        assert divide[0] == grid[0] == auto[0]
+
+    def test_unknown_method(self, points):
+        with pytest.raises(ValueError):
+            ClosestPairOfPoints(points).closest_pair(method="quantum")
+
+    def test_pairs_within(self, points):
+        cpp = ClosestPairOfPoints(points)
+        dist, pair = cpp.closest_pair()
+        pairs, distances = cpp.pairs_within(dist)
+        assert pairs.tolist() == [list(pair)]
+        assert distances[0] == dist
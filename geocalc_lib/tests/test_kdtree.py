@@ -0,0 +1,93 @@
+import pytest
+import numpy as np
+from geocalc_lib.shapes.point_set import PointSet
+from geocalc_lib.spatial.kdtree import KDTree
+from geocalc_lib.benchmarks.kdtree import compare_with_ckdtree
+
+
+def brute_force_nearest(points, query, k):
+    distances = np.hypot(*(points - query).T)
+    order = np.lexsort((np.arange(len(points)), distances))[:k]
+    return order, distances[order]
+
+
+class TestKDTree:
+    @pytest.fixture(params=["uniform", "grid", "clustered"])
+    def points(self, request):
+        rng = np.random.default_rng(0)
+        if request.param == "uniform":
+            return rng.random((4000, 2)) * 100
+        if request.param == "grid":
+            # Many duplicates and ties.
+            return rng.integers(0, 20, size=(4000, 2))
+        return np.concatenate([rng.normal(center, 0.5, size=(1000, 2))
+                               for center in ((0, 0), (50, 50), (90, 10),
+                                              (10, 90))])
+
+    def test_small_input(self):
+        tree = KDTree(np.array([[1, 2], [3, 4], [1, 3], [2, 5], [6, 1]]))
+        index, distance = tree.nearest((2, 2))
+        assert index.tolist() == [0]
+        assert distance.tolist() == [1]
+        indices, _ = tree.nearest(np.array([[0, 0], [5, 5]]), k=2)
+        assert indices.tolist() == [[0, 2], [1, 3]]
+
+    @pytest.mark.parametrize("k", [1, 5])
+    @pytest.mark.parametrize("leaf_size", [1, 8, 32])
+    def test_nearest_against_brute_force(self, points, k, leaf_size):
+        tree = KDTree(points, leaf_size=leaf_size)
+        queries = np.random.default_rng(k).random((60, 2)) * 110 - 5
+        indices, distances = tree.nearest(queries, k=k)
+        assert indices.shape == distances.shape == (60, k)
+        for query, found, dist in zip(queries, indices, distances):
+            expected, expected_dist = brute_force_nearest(points, query, k)
+            assert found.tolist() == expected.tolist()
+            assert np.allclose(dist, expected_dist)
+
+    def test_nearest_at_the_points(self, points):
+        # Every point finds itself, or the first copy of itself.
+        tree = KDTree(PointSet(points))
+        indices, distances = tree.nearest(points)
+        firsts = {}
+        for index, point in enumerate(map(tuple, points.tolist())):
+            firsts.setdefault(point, index)
+        assert np.all(distances == 0)
+        assert indices[:, 0].tolist() == [firsts[point] for point in map(
+            tuple, points.tolist())]
+
+    @pytest.mark.parametrize("radius", [0, 2, 7.5])
+    def test_within_against_brute_force(self, points, radius):
+        tree = KDTree(points)
+        queries = np.random.default_rng(3).random((40, 2)) * 100
+        pairs, distances = tree.within(queries, radius)
+        dist = np.hypot(*(queries[:, None] - points[None]).transpose(2, 0,
+                                                                     1))
+        assert pairs.tolist() == np.argwhere(dist <= radius).tolist()
+        assert np.allclose(distances, dist[dist <= radius])
+
+    def test_k_larger_than_tree(self):
+        tree = KDTree(np.array([[0, 0], [1, 1]]))
+        indices, distances = tree.nearest((2, 2), k=5)
+        assert indices.tolist() == [1, 0]
+        assert len(distances) == 2
+
+    def test_empty_and_single(self):
+        tree = KDTree(np.empty((0, 2)))
+        assert len(tree) == 0
+        assert tree.nearest((0, 0))[0].tolist() == []
+        assert len(tree.within(np.zeros((3, 2)), 1)[0]) == 0
+        assert KDTree(np.array([[4, 4]])).nearest((0, 0))[0].tolist() == [0]
+
+    def test_bad_arguments(self):
+        tree = KDTree(np.zeros((3, 2)))
+        with pytest.raises(ValueError):
+            tree.nearest((0, 0), k=-1)
+        with pytest.raises(ValueError):
+            tree.within((0, 0), -1)
+        with pytest.raises(ValueError):
+            KDTree(np.zeros((3, 2)), leaf_size=0)
+
+    def test_benchmark_agrees_with_ckdtree(self):
+        timings = compare_with_ckdtree(n=2000, queries=200)
+        assert timings["agree"]
+        assert timings["kdtree_build"] >= 0
@@ -0,0 +1,145 @@
+import pytest
+import numpy as np
+from scipy.spatial import Delaunay
+from geocalc_lib.shapes.point_set import PointSet
+from geocalc_lib.algorithms.largest_empty_circle import LargestEmptyCircle
+
+
+def circumcircle(a, b, c):
+    # Reference circumcircle from the determinant formulas.
+    pts = np.array([a, b, c], dtype=float)
+    squared = np.sum(pts * pts, axis=1)
+    area = np.linalg.det(np.c_[pts, np.ones(3)])
+    center = np.array([
+        np.linalg.det(np.c_[squared, pts[:, 1], np.ones(3)]),
+        np.linalg.det(np.c_[pts[:, 0], squared, np.ones(3)])]) / (2 * area)
+    return center, np.hypot(*(pts[0] - center))
+
+
+class TestLargestEmptyCircle:
+    @pytest.fixture
+    def points(self):
+        rng = np.random.default_rng(0)
+        return rng.integers(0, 1000, size=(400, 2))
+
+    def test_square(self):
+        lec = LargestEmptyCircle(np.array([[0, 0], [0, 1], [1, 0], [1, 1]]))
+        center, radius = lec.find_largest_empty_circle()
+        assert np.allclose(center, [0.5, 0.5])
+        assert radius == pytest.approx(np.sqrt(2) / 2)
+
+    def test_circumcircles_match_determinants(self, points):
+        lec = LargestEmptyCircle(points)
+        centers, radii = lec.circumcircles()
+        for simplex, center, radius in zip(lec.delaunay.simplices[:50],
+                                           centers, radii):
+            expected_center, expected_radius = circumcircle(*points[simplex])
+            assert np.allclose(center, expected_center)
+            assert radius == pytest.approx(expected_radius)
+
+    def test_circles_are_empty(self, points):
+        lec = LargestEmptyCircle(points)
+        centers, radii = lec.find_largest_empty_circles(5)
+        for center, radius in zip(centers, radii):
+            distances = np.hypot(*(points - center).T)
+            assert np.all(distances >= radius * (1 - 1e-9))
+
+    def test_top_k(self, points):
+        lec = LargestEmptyCircle(points)
+        _, radii = lec.circumcircles()
+        centers, top = lec.find_largest_empty_circles(4)
+        assert centers.shape == (4, 2)
+        assert np.allclose(top, np.sort(radii)[::-1][:4])
+        center, radius = lec.find_largest_empty_circle()
+        assert np.array_equal(centers[0], center)
+        assert top[0] == radius
+
+    def test_top_k_bounds(self, points):
+        lec = LargestEmptyCircle(points)
+        assert len(lec.find_largest_empty_circles(0)[1]) == 0
+        triangles = len(lec.delaunay.simplices)
+        assert len(lec.find_largest_empty_circles(10 ** 6)[1]) == triangles
+        with pytest.raises(ValueError):
+            lec.find_largest_empty_circles(-1)
+
+    def test_point_set_input(self):
+        lec = LargestEmptyCircle(PointSet([[0, 0], [4, 0], [0, 4]]))
+        center, radius = lec.find_largest_empty_circle()
+        assert np.allclose(center, [2, 2])
+        assert radius == pytest.approx(np.sqrt(8))
+
+
+class TestBoundedLargestEmptyCircle:
+    @pytest.fixture
+    def points(self):
+        rng = np.random.default_rng(1)
+        return rng.random((300, 2))
+
+    @pytest.fixture
+    def grid(self):
+        axis = np.linspace(0, 1, 400)
+        return np.stack(np.meshgrid(axis, axis), axis=-1).reshape(-1, 2)
+
+    def in_notched_square(self, xy, tol=0.0):
+        # The square [0.1, 0.9]^2 with a triangle cut from its right
+        # side back to (0.5, 0.5).
+        x, y = xy[:, 0], xy[:, 1]
+        square = np.all((xy >= 0.1 - tol) & (xy <= 0.9 + tol), axis=1)
+        return square & (np.abs(y - 0.5) >= x - 0.5 - tol)
+
+    def empty_radius(self, points, centers):
+        diff = centers[:, None, :] - points[None, :, :]
+        return np.sqrt((diff ** 2).sum(axis=-1)).min(axis=1)
+
+    def test_square_with_center_point(self):
+        points = np.array([[0, 0], [2, 0], [2, 2], [0, 2], [1, 1]])
+        lec = LargestEmptyCircle(points)
+        # The circumcenters all lie on the hull, so they still count.
+        center, radius = lec.find_largest_empty_circle(within="hull")
+        assert radius == pytest.approx(1)
+        # In the lower left quarter the best center is its corner.
+        quarter = np.array([[0, 0], [1, 0], [1, 1], [0, 1]])
+        center, radius = lec.find_largest_empty_circle(within=quarter)
+        assert radius == pytest.approx(1)
+        assert np.allclose(center, [1, 0]) or np.allclose(center, [0, 1])
+
+    def test_hull_against_grid(self, points, grid):
+        lec = LargestEmptyCircle(points)
+        center, radius = lec.find_largest_empty_circle(within="hull")
+        # A fine grid over the hull never beats the answer by much, and
+        # the answer's circle is empty.
+        hull = Delaunay(points)
+        sampled = self.empty_radius(points, grid[hull.find_simplex(grid)
+                                                 >= 0])
+        assert sampled.max() <= radius + 1e-12
+        assert sampled.max() >= radius - 0.01
+        assert hull.find_simplex(center, tol=1e-9) >= 0
+        assert self.empty_radius(points, center[None])[0] == (
+            pytest.approx(radius))
+
+    def test_concave_polygon_against_grid(self, points, grid):
+        polygon = np.array([[0.1, 0.1], [0.9, 0.1], [0.5, 0.5], [0.9, 0.9],
+                            [0.1, 0.9]])
+        lec = LargestEmptyCircle(points)
+        centers, radii = lec.find_largest_empty_circles(3, within=polygon)
+        inside = self.in_notched_square(grid)
+        sampled = self.empty_radius(points, grid[inside])
+        assert sampled.max() <= radii[0] + 1e-12
+        assert sampled.max() >= radii[0] - 0.01
+        assert self.in_notched_square(centers, 1e-9).all()
+        assert np.all(np.diff(radii) <= 0)
+
+    def test_polygon_wider_than_points(self, points):
+        # The corners of a big square are far from every point.
+        square = np.array([[-1, -1], [2, -1], [2, 2], [-1, 2]])
+        lec = LargestEmptyCircle(points)
+        center, radius = lec.find_largest_empty_circle(within=square)
+        assert self.empty_radius(points, square).max() == pytest.approx(
+            radius)
+
+    def test_bad_region(self, points):
+        lec = LargestEmptyCircle(points)
+        with pytest.raises(ValueError):
+            lec.find_largest_empty_circle(within="disk")
+        with pytest.raises(ValueError):
+            lec.find_largest_empty_circle(within=[[0, 0], [1, 1]])
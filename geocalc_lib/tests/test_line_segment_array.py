@@ -0,0 +1,262 @@
+from fractions import Fraction
+import pytest
+import numpy as np
+from geocalc_lib.shapes.segment_set import SegmentSet
+from geocalc_lib.algorithms.line_segment import LineSegmentIntersection
+
+
+def on_segment(point, segment, tol=1e-9):
+    x1, y1, x2, y2 = segment
+    cross = (x2 - x1) * (point[1] - y1) - (y2 - y1) * (point[0] - x1)
+    return (abs(cross) <= tol * max(1, abs(x2 - x1) + abs(y2 - y1))
+            and min(x1, x2) - tol <= point[0] <= max(x1, x2) + tol
+            and min(y1, y2) - tol <= point[1] <= max(y1, y2) + tol)
+
+
+class TestBentleyOttmann:
+    @pytest.fixture
+    def lsi(self):
+        return LineSegmentIntersection(None)
+
+    def test_cross(self, lsi):
+        pairs, points = lsi.bentley_ottmann(np.array([[0, 0, 4, 4],
+                                                      [0, 4, 4, 0]]))
+        assert pairs.tolist() == [[0, 1]]
+        assert points.tolist() == [[2, 2]]
+
+    def test_rational_crossing(self, lsi):
+        pairs, points = lsi.bentley_ottmann(np.array([[0, 0, 3, 1],
+                                                      [0, 1, 1, 0]]))
+        assert pairs.tolist() == [[0, 1]]
+        assert np.allclose(points, [[0.75, 0.25]])
+
+    def test_vertical_and_horizontal(self, lsi):
+        segments = np.array([[2, 0, 2, 5], [0, 3, 5, 3], [0, 1, 5, 1],
+                             [3, 0, 3, 5], [2, 6, 2, 8]])
+        pairs, points = lsi.bentley_ottmann(segments)
+        assert pairs.tolist() == [[0, 1], [0, 2], [1, 3], [2, 3]]
+        assert points.tolist() == [[2, 3], [2, 1], [3, 3], [3, 1]]
+
+    def test_shared_endpoints(self, lsi):
+        # Three segments meeting at one point and one touching its
+        # middle.
+        segments = np.array([[0, 0, 2, 2], [2, 2, 4, 0], [2, 2, 2, 5],
+                             [1, 3, 3, 3]])
+        pairs, points = lsi.bentley_ottmann(segments)
+        assert pairs.tolist() == [[0, 1], [0, 2], [1, 2], [2, 3]]
+        assert points.tolist() == [[2, 2], [2, 2], [2, 2], [2, 3]]
+
+    def test_collinear_overlaps(self, lsi):
+        segments = np.array([[0, 0, 4, 4], [2, 2, 6, 6], [5, 5, 7, 7],
+                             [3, 0, 3, 2], [3, 1, 3, 4]])
+        pairs, points = lsi.bentley_ottmann(segments)
+        assert pairs.tolist() == [[0, 1], [0, 4], [1, 2], [1, 4], [3, 4]]
+        assert points.tolist() == [[2, 2], [3, 3], [5, 5], [3, 3], [3, 1]]
+
+    def test_no_segments(self, lsi):
+        pairs, points = lsi.bentley_ottmann(np.empty((0, 4)))
+        assert pairs.shape == (0, 2)
+        assert points.shape == (0, 2)
+
+    def test_segment_set_input(self):
+        lsi = LineSegmentIntersection(SegmentSet([[0, 0, 4, 4],
+                                                  [0, 4, 4, 0],
+                                                  [5, 5, 6, 6]]))
+        assert lsi.bentley_ottmann()[0].tolist() == [[0, 1]]
+
+    def test_non_finite(self, lsi):
+        with pytest.raises(ValueError):
+            lsi.bentley_ottmann(np.array([[0, 0, np.inf, 1.0]]))
+
+    @pytest.mark.parametrize("seed", range(6))
+    def test_degenerate_grid_against_brute_force(self, lsi, seed):
+        # Few distinct coordinates make many shared endpoints,
+        # overlaps, and vertical and horizontal segments.
+        rng = np.random.default_rng(seed)
+        segments = rng.integers(0, 8, size=(150, 4))
+        if seed % 3 == 0:
+            segments[:, 2] = segments[:, 0]
+        elif seed % 3 == 1:
+            segments[:, 3] = segments[:, 1]
+        segments = segments[(segments[:, 0] != segments[:, 2])
+                            | (segments[:, 1] != segments[:, 3])]
+        pairs, points = lsi.bentley_ottmann(segments)
+        assert pairs.tolist() == lsi.intersecting_pairs(segments).tolist()
+        for (i, j), point in zip(pairs, points):
+            assert on_segment(point, segments[i])
+            assert on_segment(point, segments[j])
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_random_floats_against_brute_force(self, lsi, seed):
+        rng = np.random.default_rng(seed)
+        centers = rng.random((400, 2))
+        segments = np.hstack((centers, centers
+                              + rng.normal(scale=0.1, size=(400, 2))))
+        pairs, points = lsi.bentley_ottmann(segments)
+        assert pairs.tolist() == lsi.intersecting_pairs(segments).tolist()
+        for (i, j), point in zip(pairs, points):
+            assert on_segment(point, segments[i])
+            assert on_segment(point, segments[j])
+
+
+class TestBatchIntersect:
+    @pytest.fixture
+    def lsi(self):
+        return LineSegmentIntersection(None)
+
+    @pytest.fixture
+    def segments(self):
+        rng = np.random.default_rng(0)
+        first = rng.integers(0, 10, size=(60, 4))
+        second = rng.integers(0, 10, size=(45, 4))
+        # Make every segment nonzero length.
+        first[:, 2] += first[:, 0] == first[:, 2]
+        second[:, 3] += second[:, 1] == second[:, 3]
+        return first, second
+
+    def test_matrix_matches_do_intersect(self, lsi, segments):
+        first, second = segments
+        matrix = lsi.batch_intersect(first, second)
+        assert matrix.shape == (60, 45)
+        for i, a in enumerate(SegmentSet(first[:15])):
+            for j, b in enumerate(SegmentSet(second[:15])):
+                assert matrix[i, j] == lsi.do_intersect(a.start, a.end,
+                                                        b.start, b.end)
+
+    def test_matches_intersecting_pairs(self, lsi, segments):
+        first, _ = segments
+        matrix = lsi.batch_intersect(first, first)
+        upper = np.argwhere(np.triu(matrix, k=1))
+        assert upper.tolist() == lsi.intersecting_pairs(first).tolist()
+
+    def test_chunked(self, lsi, segments, monkeypatch):
+        first, second = segments
+        expected = np.argwhere(lsi.batch_intersect(first, second))
+        monkeypatch.setattr(
+            "geocalc_lib.algorithms.line_segment._CHUNK_SIZE", 7)
+        blocks = list(lsi.batch_intersect(first, second, chunked=True))
+        assert len(blocks) > 1
+        pairs = np.concatenate(blocks)
+        order = np.lexsort((pairs[:, 1], pairs[:, 0]))
+        assert pairs[order].tolist() == expected.tolist()
+
+    def test_large_integers_exact(self, lsi):
+        # The orientation products overflow int64.
+        big = 2 ** 40
+        first = np.array([[0, 0, 2 * big, 2 * big + 2]])
+        second = np.array([[big, big + 1, big, 3 * big],
+                           [big + 1, big, big + 1, 0]])
+        assert lsi.batch_intersect(first, second).tolist() == [[True,
+                                                                False]]
+
+    def test_empty(self, lsi):
+        empty = np.empty((0, 4))
+        assert lsi.batch_intersect(empty, np.ones((3, 4))).shape == (0, 3)
+        assert list(lsi.batch_intersect(empty, empty, chunked=True)) == []
+
+
+class TestIntersections:
+    @pytest.fixture
+    def lsi(self):
+        return LineSegmentIntersection(None)
+
+    @pytest.fixture
+    def segments(self):
+        return np.array([[0, 0, 3, 1], [0, 1, 1, 0], [4, 4, 0, 0],
+                         [2, 2, 6, 6], [6, 6, 8, 8], [9, 9, 9, 10]])
+
+    def test_points_and_overlaps(self, lsi, segments):
+        pairs, where = lsi.intersections(segments)
+        assert pairs.tolist() == [[0, 1], [0, 2], [1, 2], [2, 3], [3, 4]]
+        assert where.tolist() == [[0.75, 0.25, 0.75, 0.25],
+                                  [0, 0, 0, 0],
+                                  [0.5, 0.5, 0.5, 0.5],
+                                  [2, 2, 4, 4],
+                                  [6, 6, 6, 6]]
+
+    def test_exact(self, lsi, segments):
+        _, where = lsi.intersections(segments, exact=True)
+        assert where[0].tolist() == [Fraction(3, 4), Fraction(1, 4),
+                                     Fraction(3, 4), Fraction(1, 4)]
+        assert all(isinstance(value, Fraction) for value in where.ravel())
+
+    def test_float_path_matches(self, lsi, segments):
+        pairs, where = lsi.intersections(segments)
+        float_pairs, float_where = lsi.intersections(segments.astype(float))
+        assert np.array_equal(float_pairs, pairs)
+        assert np.allclose(float_where, where)
+
+    def test_candidate_pairs(self, lsi, segments):
+        pairs, where = lsi.intersections(segments, pairs=[[0, 5], [3, 2]])
+        assert pairs.tolist() == [[3, 2]]
+        assert where.tolist() == [[2, 2, 4, 4]]
+
+    def test_large_integers_exact(self, lsi):
+        rng = np.random.default_rng(0)
+        segments = rng.integers(-2 ** 40, 2 ** 40, size=(200, 4))
+        pairs, where = lsi.intersections(segments, exact=True)
+        assert len(pairs)
+        for (i, j), (x, y, _, _) in zip(pairs, where):
+            for x1, y1, x2, y2 in (segments[i].tolist(),
+                                   segments[j].tolist()):
+                assert (x2 - x1) * (y - y1) == (y2 - y1) * (x - x1)
+
+    def test_empty(self, lsi):
+        pairs, where = lsi.intersections(np.array([[0, 0, 1, 1]]))
+        assert pairs.shape == (0, 2)
+        assert where.shape == (0, 4)
+
+
+class TestIntersectingPairsMethods:
+    @pytest.fixture
+    def lsi(self):
+        return LineSegmentIntersection(None)
+
+    @pytest.mark.parametrize("seed", range(6))
+    def test_grid_matches_brute(self, lsi, seed):
+        rng = np.random.default_rng(seed)
+        segments = rng.integers(0, 40, size=(400, 4))
+        segments = segments[(segments[:, 0] != segments[:, 2])
+                            | (segments[:, 1] != segments[:, 3])]
+        if seed % 2:
+            segments = segments * 0.37
+        expected = lsi.intersecting_pairs(segments, method="brute").tolist()
+        for method in ("grid", "rtree"):
+            assert lsi.intersecting_pairs(segments,
+                                          method=method).tolist() == expected
+
+    def test_short_segments(self, lsi):
+        rng = np.random.default_rng(1)
+        starts = rng.random((3000, 2)) * 100
+        segments = np.hstack((starts, starts + rng.normal(size=(3000, 2))))
+        expected = lsi.intersecting_pairs(segments, method="brute")
+        for method in ("auto", "grid", "rtree", "sweep"):
+            assert np.array_equal(
+                lsi.intersecting_pairs(segments, method=method), expected)
+
+    def test_one_long_segment(self, lsi):
+        # A long segment covers many cells but is found once per pair.
+        segments = np.array([[0, 0, 1000, 1000]]
+                            + [[x, x + 1, x + 1, x] for x in range(0, 1000,
+                                                                   3)])
+        for method in ("grid", "rtree"):
+            pairs = lsi.intersecting_pairs(segments, method=method)
+            assert pairs.tolist() == [[0, k] for k in range(1,
+                                                            len(segments))]
+
+    def test_shared_endpoints_across_cells(self, lsi):
+        segments = np.array([[0, 0, 1, 1], [1, 1, 2, 0], [5, 5, 6, 6]])
+        assert lsi.intersecting_pairs(segments, method="grid").tolist() == [
+            [0, 1]]
+
+    def test_unknown_method(self, lsi):
+        with pytest.raises(ValueError):
+            lsi.intersecting_pairs(np.zeros((3, 4)), method="quadtree")
+
+    def test_intersections_method(self, lsi):
+        segments = np.array([[0, 0, 4, 4], [0, 4, 4, 0], [2, 2, 6, 6]])
+        for method in ("brute", "grid", "sweep"):
+            pairs, where = lsi.intersections(segments, method=method)
+            assert pairs.tolist() == [[0, 1], [0, 2], [1, 2]]
+            assert where.tolist() == [[2, 2, 2, 2], [2, 2, 4, 4],
+                                      [2, 2, 2, 2]]
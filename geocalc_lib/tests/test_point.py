@@ -0,0 +1,95 @@
+import pickle
+import timeit
+import pytest
+import numpy as np
+from geocalc_lib.shapes.point import Point
+from geocalc_lib.shapes.line import Line
+from geocalc_lib.shapes.circle import Circle
+
+
+class TestPoint:
+    def test_attributes(self):
+        p = Point(1, 2)
+        assert p.x == 1 and p.y == 2
+
+    def test_numpy_scalars_become_plain_numbers(self):
+        p = Point(np.int64(3), np.float64(4.5))
+        assert type(p.x) is int
+        assert type(p.y) is float
+
+    def test_plain_numbers_kept(self):
+        p = Point(3, 4.5)
+        assert type(p.x) is int
+        assert type(p.y) is float
+        assert type(Point(True, 2).x) is float
+
+    def test_faster_than_array_point(self):
+        # Point used to hold its coordinates in an array like this one.
+        class ArrayPoint:
+            def __init__(self, x, y):
+                self.coords = np.array([x, y])
+
+        def best(cls):
+            return min(timeit.repeat(lambda: cls(3, 4), number=20000,
+                                     repeat=7))
+
+        assert best(Point) < best(ArrayPoint)
+
+    def test_coords_compatibility(self):
+        p = Point(3, 4)
+        assert np.array_equal(p.coords, np.array([3, 4]))
+        # The array is created once and reused.
+        assert p.coords is p.coords
+
+    def test_coords_read_only(self):
+        p = Point(3, 4)
+        with pytest.raises(ValueError):
+            p.coords[0] = 10
+
+    def test_immutable(self):
+        p = Point(1, 2)
+        with pytest.raises(AttributeError):
+            p.x = 5
+        with pytest.raises(AttributeError):
+            p.z = 5
+
+    def test_no_instance_dict(self):
+        assert not hasattr(Point(1, 2), "__dict__")
+
+    def test_equality(self):
+        assert Point(1, 2) == Point(1, 2)
+        assert Point(1, 2) == Point(1.0, 2.0)
+        assert Point(1, 2) != Point(2, 1)
+        assert Point(1, 2) != (1, 2)
+
+    def test_ordering(self):
+        assert Point(1, 2) < Point(1, 3)
+        assert Point(0, 5) < Point(1, 0)
+        assert sorted([Point(2, 0), Point(1, 1)]) == [Point(1, 1),
+                                                       Point(2, 0)]
+
+    def test_hash(self):
+        points = {Point(1, 2), Point(1, 2), Point(1.0, 2.0), Point(2, 1)}
+        assert len(points) == 2
+        lookup = {Point(5, 5): "a"}
+        assert lookup[Point(5, 5)] == "a"
+
+    def test_distance_to(self):
+        assert Point(0, 0).distance_to(Point(3, 4)) == 5
+
+    def test_pickle(self):
+        p = Point(1, 2.5)
+        assert pickle.loads(pickle.dumps(p)) == p
+
+    def test_str(self):
+        assert str(Point(1, 2)) == "Point(1, 2)"
+
+    def test_line_uses_point_attributes(self):
+        line = Line(Point(0, 0), Point(4, 2))
+        assert line.midpoint() == Point(2, 1)
+        assert line.length() == pytest.approx(np.sqrt(20))
+
+    def test_circle_contains_point(self):
+        circle = Circle(Point(0, 0), 5)
+        assert circle.contains_point(Point(3, 4))
+        assert not circle.contains_point(Point(4, 4))
@@ -0,0 +1,221 @@
+import pytest
+import numpy as np
+from geocalc_lib.shapes.point import Point
+from geocalc_lib.shapes import point_set
+from geocalc_lib.shapes.point_set import PointSet, as_coords, point_order
+from geocalc_lib.algorithms.closest_pair_of_points import ClosestPairOfPoints
+from geocalc_lib.algorithms.convex_hull import ConvexHull
+from geocalc_lib.algorithms.largest_empty_circle import LargestEmptyCircle
+from geocalc_lib.spatial.kdtree import KDTree
+
+
+class TestPointSet:
+    @pytest.fixture
+    def ps(self):
+        return PointSet([[0, 0], [1, 0], [1, 1], [0, 1]])
+
+    def test_init_from_coordinates(self, ps):
+        assert len(ps) == 4
+        assert ps.dtype == np.int64
+        assert ps.coords.shape == (4, 2)
+
+    def test_init_from_points(self):
+        ps = PointSet([Point(1, 2), Point(3, 4)])
+        assert ps.tolist() == [(1, 2), (3, 4)]
+
+    def test_empty(self):
+        ps = PointSet()
+        assert len(ps) == 0
+        assert ps.coords.shape == (0, 2)
+
+    def test_append_grows_amortized(self):
+        ps = PointSet()
+        capacities = set()
+        for i in range(1000):
+            ps.append((i, i))
+            capacities.add(ps.capacity)
+        assert len(ps) == 1000
+        # Doubling means only a handful of reallocations.
+        assert len(capacities) <= 8
+        assert ps[999] == Point(999, 999)
+
+    def test_append_point(self, ps):
+        ps.append(Point(5, 6))
+        assert ps[-1] == Point(5, 6)
+
+    def test_float_promotes_dtype(self, ps):
+        ps.append((0.5, 0.5))
+        assert ps.dtype == np.float64
+        assert ps.tolist()[0] == (0.0, 0.0)
+        assert ps.tolist()[-1] == (0.5, 0.5)
+
+    def test_extend(self, ps):
+        ps.extend(np.array([[2, 2], [3, 3]]))
+        assert len(ps) == 6
+        assert ps[5] == Point(3, 3)
+
+    def test_extend_wrong_shape(self, ps):
+        with pytest.raises(ValueError):
+            ps.extend(np.array([1, 2, 3]))
+
+    def test_remove(self, ps):
+        ps.remove(1)
+        assert ps.tolist() == [(0, 0), (1, 1), (0, 1)]
+
+    def test_del_negative_index(self, ps):
+        del ps[-1]
+        assert ps.tolist() == [(0, 0), (1, 0), (1, 1)]
+
+    def test_remove_out_of_range(self, ps):
+        with pytest.raises(IndexError):
+            ps.remove(10)
+
+    def test_index_and_contains(self, ps):
+        assert ps.index(Point(1, 1)) == 2
+        assert (0, 1) in ps
+        assert Point(5, 5) not in ps
+        with pytest.raises(ValueError):
+            ps.index((5, 5))
+
+    def test_slice_is_zero_copy(self, ps):
+        view = ps[1:3]
+        assert np.shares_memory(view.coords, ps.coords)
+        assert view.tolist() == [(1, 0), (1, 1)]
+
+    def test_mutating_view_leaves_parent(self, ps):
+        view = ps[1:3]
+        view.remove(0)
+        view.append((9, 9))
+        assert view.tolist() == [(1, 1), (9, 9)]
+        assert ps.tolist() == [(0, 0), (1, 0), (1, 1), (0, 1)]
+
+    def test_fancy_index_copies(self, ps):
+        subset = ps[np.array([0, 2])]
+        assert subset.tolist() == [(0, 0), (1, 1)]
+        assert not np.shares_memory(subset.coords, ps.coords)
+
+    def test_as_coords_no_copy(self, ps):
+        assert as_coords(ps) is not None
+        assert np.shares_memory(as_coords(ps), ps.coords)
+        assert np.shares_memory(np.asarray(ps), ps.coords)
+
+    def test_clear(self, ps):
+        ps.clear()
+        assert len(ps) == 0
+
+    def test_iter_yields_points(self, ps):
+        assert list(ps)[2] == Point(1, 1)
+
+
+class TestAlgorithmsAcceptPointSet:
+    @pytest.fixture
+    def ps(self):
+        return PointSet([[0, 0], [4, 0], [4, 4], [0, 4], [1, 1], [3, 2]])
+
+    def test_closest_pair(self, ps):
+        cpp = ClosestPairOfPoints(ps)
+        dist, pair = cpp.closest_util(ps)
+        assert dist == pytest.approx(np.sqrt(2))
+
+    def test_convex_hull(self, ps):
+        ch = ConvexHull(ps)
+        hull = ch.graham_scan(ps)
+        assert hull == [(0, 0), (4, 0), (4, 4), (0, 4), (0, 0)]
+
+    def test_largest_empty_circle(self, ps):
+        lec = LargestEmptyCircle(ps)
+        assert np.shares_memory(lec.points, ps.coords)
+        center, radius = lec.find_largest_empty_circle()
+        assert radius > 0
+
+
+class TestOrders:
+    @pytest.fixture(params=["int", "float"])
+    def ps(self, request):
+        rng = np.random.default_rng(6)
+        if request.param == "int":
+            return PointSet(rng.integers(0, 30, size=(2000, 2)))
+        coords = rng.random((2000, 2))
+        # Some equal xs and ys, so ties are broken.
+        coords[::7, 0] = 0.5
+        coords[::11, 1] = 0.25
+        return PointSet(coords)
+
+    @pytest.fixture
+    def sorts(self, monkeypatch):
+        # Count the sorts of each kind.
+        counts = {}
+        for kind, sort in list(point_set._ORDERS.items()):
+            def counted(coords, kind=kind, sort=sort):
+                counts[kind] = counts.get(kind, 0) + 1
+                return sort(coords)
+            monkeypatch.setitem(point_set._ORDERS, kind, counted)
+        return counts
+
+    def test_x_and_y(self, ps):
+        xs, ys = ps.coords[:, 0], ps.coords[:, 1]
+        assert np.array_equal(ps.order("x"), np.lexsort((ys, xs)))
+        assert np.array_equal(ps.order("lexicographic"), ps.order("x"))
+        assert np.array_equal(ps.order("y"), np.lexsort((xs, ys)))
+
+    def test_same_for_arrays(self, ps):
+        for kind in ("x", "y", "morton", "hilbert"):
+            assert np.array_equal(point_order(ps.coords, kind),
+                                  ps.order(kind))
+
+    @pytest.mark.parametrize("kind", ["morton", "hilbert"])
+    def test_curves_are_permutations(self, ps, kind):
+        assert np.array_equal(np.sort(ps.order(kind)), np.arange(len(ps)))
+
+    def test_hilbert_steps_to_neighbors(self, monkeypatch):
+        # On a full grid of the curve's size every step is to a
+        # neighboring cell.
+        monkeypatch.setattr(point_set, "_CURVE_BITS", 4)
+        grid = np.array([(x, y) for x in range(16) for y in range(16)])
+        steps = np.diff(grid[point_order(grid, "hilbert")], axis=0)
+        assert np.all(np.abs(steps).sum(axis=1) == 1)
+
+    def test_morton_visits_quadrants_in_turn(self):
+        grid = np.array([(x, y) for x in range(4) for y in range(4)])
+        quadrants = grid[point_order(grid, "morton")] // 2
+        assert quadrants[::4].tolist() == [[0, 0], [1, 0], [0, 1], [1, 1]]
+
+    def test_cached_until_changed(self, ps, sorts):
+        first = ps.order("x")
+        assert ps.order("x") is first
+        assert not first.flags.writeable
+        assert sorts == {"x": 1}
+        ps.append((0.5, 0.5))
+        assert len(ps.order("x")) == len(ps)
+        ps.remove(0)
+        ps.order("x")
+        assert sorts == {"x": 3}
+
+    def test_views_are_not_cached(self, ps, sorts):
+        view = ps[:100]
+        view.order("y")
+        view.order("y")
+        assert sorts == {"y": 2}
+        ps.remove(0)
+        assert np.array_equal(view.order("y"),
+                              point_order(view.coords.copy(), "y"))
+
+    def test_unknown_kind(self, ps):
+        with pytest.raises(ValueError):
+            ps.order("angle")
+        with pytest.raises(ValueError):
+            point_order([[0, 0]], "angle")
+
+    def test_algorithms_share_sorts(self, ps, sorts):
+        ClosestPairOfPoints(ps).closest_pair(method="divide")
+        ConvexHull(ps).hull(method="monotone")
+        KDTree(ps).nearest([[0, 0]])
+        ClosestPairOfPoints(ps).closest_pair(method="divide")
+        assert sorts == {"x": 1, "y": 1}
+
+    def test_results_unchanged(self, ps):
+        coords = ps.coords.copy()
+        assert ClosestPairOfPoints(ps).closest_pair(method="divide") == (
+            ClosestPairOfPoints(coords).closest_pair(method="divide"))
+        assert np.array_equal(ConvexHull(ps).hull(method="monotone"),
+                              ConvexHull(coords).hull(method="monotone"))
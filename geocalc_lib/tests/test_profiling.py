@@ -0,0 +1,103 @@
+import pytest
+import numpy as np
+from geocalc_lib import profiling
+from geocalc_lib.shapes.point import Point
+from geocalc_lib.algorithms.closest_pair_of_points import ClosestPairOfPoints
+from geocalc_lib.algorithms.convex_hull import ConvexHull
+from geocalc_lib.algorithms.largest_empty_circle import LargestEmptyCircle
+from geocalc_lib.algorithms.line_segment import LineSegmentIntersection
+
+
+class TestCollect:
+    def test_disabled_by_default(self):
+        assert profiling.stats is None
+        profiling.count("anything")
+        profiling.enter("anything.max_depth")
+        assert profiling.stats is None
+
+    def test_counters(self):
+        with profiling.collect() as counters:
+            profiling.count("a.calls")
+            profiling.count("a.calls", 4)
+            profiling.record_max("a.max_size", 3)
+            profiling.record_max("a.max_size", 2)
+        assert counters == {"a.calls": 5, "a.max_size": 3}
+        assert profiling.stats is None
+
+    def test_depth(self):
+        with profiling.collect() as counters:
+            for _ in range(3):
+                profiling.enter("a.max_depth")
+            for _ in range(3):
+                profiling.leave("a.max_depth")
+            profiling.enter("a.max_depth")
+            profiling.leave("a.max_depth")
+        assert counters == {"a.max_depth": 3}
+
+    def test_nested_blocks_add_up(self):
+        with profiling.collect() as outer:
+            profiling.count("a.calls")
+            profiling.record_max("a.max_size", 5)
+            with profiling.collect() as inner:
+                profiling.count("a.calls", 2)
+                profiling.record_max("a.max_size", 4)
+        assert inner == {"a.calls": 2, "a.max_size": 4}
+        assert outer == {"a.calls": 3, "a.max_size": 5}
+
+    def test_reset_after_error(self):
+        with pytest.raises(ValueError):
+            with profiling.collect():
+                raise ValueError
+        assert profiling.stats is None
+
+
+class TestAlgorithmCounters:
+    @pytest.fixture
+    def points(self):
+        return np.random.default_rng(0).integers(0, 1000, size=(500, 2))
+
+    def test_graham_scan_orientations(self, points):
+        ch = ConvexHull(points)
+        with profiling.collect() as counters:
+            ch.graham_scan(points)
+        # Every point is pushed once and popped at most once.
+        assert len(points) <= counters["convex_hull.orientation_tests"] < (
+            2 * len(points))
+
+    def test_closest_util(self, points):
+        cpp = ClosestPairOfPoints(points)
+        as_points = [Point(*point) for point in points.tolist()]
+        with profiling.collect() as counters:
+            cpp.closest_util(as_points)
+        assert counters["closest_pair.distance_evaluations"] > 0
+        # Calls nest 9 deep before 500 points are halved to 3 or fewer.
+        assert counters["closest_pair.max_depth"] == 9
+        assert 0 < counters["closest_pair.max_strip"] <= counters[
+            "closest_pair.strip_points"]
+
+    def test_closest_pair_divide(self, points):
+        with profiling.collect() as counters:
+            ClosestPairOfPoints(points).closest_pair(method="divide")
+        # 500, 250, 125 and then leaves of at most 64 points.
+        assert counters["closest_pair.max_depth"] == 4
+        assert counters["closest_pair.distance_evaluations"] > 0
+
+    def test_line_segment_orientations(self):
+        segments = np.array([[0, 0, 4, 4], [0, 4, 4, 0], [5, 5, 6, 6]])
+        lsi = LineSegmentIntersection(segments)
+        with profiling.collect() as counters:
+            lsi.intersecting_pairs(method="brute")
+        # Each of the 3 pairs takes four orientation tests.
+        assert counters == {"line_segment.orientation_tests": 12}
+
+    def test_largest_empty_circle(self, points):
+        lec = LargestEmptyCircle(points)
+        with profiling.collect() as counters:
+            lec.find_largest_empty_circle(within="hull")
+        assert counters["largest_empty_circle.simplices_visited"] == len(
+            lec.delaunay.simplices)
+        assert counters["largest_empty_circle.cells_walked"] > 0
+
+    def test_nothing_counted_outside_a_block(self, points):
+        ConvexHull(points).graham_scan(points)
+        assert profiling.stats is None
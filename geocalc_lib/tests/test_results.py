@@ -0,0 +1,107 @@
+import pytest
+import numpy as np
+from geocalc_lib.shapes.point import Point
+from geocalc_lib.shapes.point_set import PointSet
+from geocalc_lib.algorithms.closest_pair_of_points import ClosestPairOfPoints
+from geocalc_lib.algorithms.convex_hull import ConvexHull
+from geocalc_lib.algorithms.grid_closest_pair import GridClosestPair
+from geocalc_lib.algorithms.largest_empty_circle import LargestEmptyCircle
+from geocalc_lib.algorithms.results import PairResult
+
+
+@pytest.fixture
+def points():
+    return np.random.default_rng(4).integers(0, 10 ** 4, size=(3000, 2))
+
+
+class TestPairResult:
+    @pytest.mark.parametrize("method", ["divide", "grid"])
+    def test_closest_pair(self, points, method):
+        result = ClosestPairOfPoints(points).closest_pair(method=method)
+        distance, (i, j) = result
+        assert result.distance == distance
+        assert result.pair == (i, j)
+        assert np.array_equal(result.indices, [i, j])
+        assert np.array_equal(result.coords, points[[i, j]])
+        assert np.hypot(*(result.coords[0] - result.coords[1])) == (
+            pytest.approx(distance))
+
+    def test_grid(self, points):
+        result = GridClosestPair(points, seed=0).closest_pair()
+        assert np.array_equal(result.coords, points[result.indices])
+
+    def test_farthest_pair(self, points):
+        result = ConvexHull(points).farthest_pair()
+        assert np.array_equal(result.coords, points[list(result.pair)])
+
+    def test_point_set(self):
+        ps = PointSet([Point(0, 0), Point(7, 7), Point(0, 1)])
+        result = ClosestPairOfPoints(ps).closest_pair()
+        assert result.pair == (0, 2)
+        assert result.coords.tolist() == [[0, 0], [0, 1]]
+
+    def test_too_few_points(self):
+        result = ClosestPairOfPoints([[1, 2]]).closest_pair()
+        assert result == (float("inf"), None)
+        assert result.indices.shape == (0,)
+        assert result.coords.shape == (0, 2)
+
+    def test_is_a_tuple(self):
+        result = PairResult(1.0, (0, 1), [[0, 0], [1, 0]])
+        assert result == (1.0, (0, 1))
+        assert len(result) == 2
+
+
+class TestHullResult:
+    def test_vertices(self, points):
+        ch = ConvexHull(points)
+        indices, coords = ch.vertices()
+        assert np.array_equal(indices, ch.monotone_chain())
+        assert np.array_equal(coords, points[indices])
+
+    def test_methods_agree(self, points):
+        ch = ConvexHull(points)
+        expected = ch.vertices(method="monotone")
+        assert np.array_equal(ch.vertices(method="chan").coords,
+                              expected.coords)
+
+    def test_empty(self):
+        result = ConvexHull(np.empty((0, 2))).vertices()
+        assert result.indices.shape == (0,)
+        assert result.coords.shape == (0, 2)
+
+
+class TestCircleResult:
+    @pytest.fixture
+    def lec(self):
+        rng = np.random.default_rng(5)
+        return LargestEmptyCircle(rng.random((400, 2)) * 100)
+
+    def test_sites_on_circle(self, lec):
+        result = lec.find_largest_empty_circle()
+        center, radius = result
+        assert result.sites.shape == (3,)
+        assert np.all(result.sites >= 0)
+        assert np.array_equal(result.coords, lec.points[result.sites])
+        assert np.allclose(np.hypot(*(result.coords - center).T), radius)
+        # The triangle is one of the triangulation's.
+        assert any(set(simplex) == set(result.sites.tolist())
+                   for simplex in lec.delaunay.simplices.tolist())
+
+    def test_boundary_site(self, lec):
+        square = np.array([[0, 0], [1, 0], [1, 1], [0, 1]]) * 300
+        result = lec.find_largest_empty_circle(within=square)
+        assert result.sites[0] >= 0
+        assert np.array_equal(result.sites[1:], [-1, -1])
+        assert np.all(np.isnan(result.coords[1:]))
+        assert np.hypot(*(result.coords[0] - result.center)) == (
+            pytest.approx(result.radius))
+
+    def test_k_largest(self, lec):
+        result = lec.find_largest_empty_circles(5, within="hull")
+        centers, radii = result
+        assert result.sites.shape == (5, 3)
+        assert result.coords.shape == (5, 3, 2)
+        for center, radius, coords in zip(centers, radii, result.coords):
+            on_circle = np.hypot(*(coords - center).T)
+            assert np.allclose(on_circle[~np.isnan(on_circle)], radius)
@@ -0,0 +1,97 @@
+import pytest
+import numpy as np
+from geocalc_lib.shapes.point_set import PointSet
+from geocalc_lib.shapes.segment_set import SegmentSet
+from geocalc_lib.spatial.rtree import RTree
+
+
+def segment_distances(segments, point):
+    segments = np.asarray(segments, dtype=float)
+    start, direction = segments[:, :2], segments[:, 2:] - segments[:, :2]
+    t = np.clip(np.sum((point - start) * direction, axis=1)
+                / np.sum(direction ** 2, axis=1), 0, 1)
+    return np.hypot(*(start + t[:, None] * direction - point).T)
+
+
+class TestPointRTree:
+    @pytest.fixture
+    def points(self):
+        rng = np.random.default_rng(0)
+        return rng.integers(0, 200, size=(3000, 2))
+
+    def test_window(self):
+        tree = RTree(np.array([[1, 2], [3, 4], [1, 3], [2, 5], [6, 1]]))
+        assert tree.window(1, 2, 2, 3).tolist() == [0, 2]
+        assert tree.window(7, 7, 9, 9).tolist() == []
+
+    @pytest.mark.parametrize("node_size", [2, 5, 16])
+    def test_window_against_brute_force(self, points, node_size):
+        tree = RTree(points, node_size=node_size)
+        rng = np.random.default_rng(node_size)
+        for low in rng.integers(-20, 200, size=(30, 2)):
+            high = low + rng.integers(0, 50, size=2)
+            inside = np.all((points >= low) & (points <= high), axis=1)
+            assert tree.window(*low, *high).tolist() == (
+                np.flatnonzero(inside).tolist())
+
+    @pytest.mark.parametrize("k", [1, 4])
+    def test_nearest_against_brute_force(self, points, k):
+        tree = RTree(PointSet(points))
+        queries = np.random.default_rng(k).random((40, 2)) * 200
+        indices, distances = tree.nearest(queries, k=k)
+        for query, found, dist in zip(queries, indices, distances):
+            brute = np.hypot(*(points - query).T)
+            expected = np.lexsort((np.arange(len(points)), brute))[:k]
+            assert found.tolist() == expected.tolist()
+            assert np.allclose(dist, brute[expected])
+
+    def test_nearest_single_query_and_duplicates(self):
+        tree = RTree(np.array([[0, 0], [5, 5], [0, 0], [1, 1]]))
+        indices, distances = tree.nearest((0, 0), k=3)
+        assert indices.tolist() == [0, 2, 3]
+        assert distances[:2].tolist() == [0, 0]
+
+    def test_k_larger_than_tree(self):
+        indices, _ = RTree(np.array([[0, 0], [1, 1]])).nearest((2, 2), k=5)
+        assert indices.tolist() == [1, 0]
+
+    def test_empty(self):
+        tree = RTree(np.empty((0, 2)))
+        assert len(tree) == 0
+        assert tree.window(0, 0, 1, 1).tolist() == []
+        assert tree.nearest((0, 0))[0].tolist() == []
+
+    def test_bad_node_size(self):
+        with pytest.raises(ValueError):
+            RTree(np.zeros((3, 2)), node_size=1)
+
+
+class TestSegmentRTree:
+    @pytest.fixture
+    def segments(self):
+        rng = np.random.default_rng(3)
+        starts = rng.random((2000, 2)) * 100
+        return np.hstack((starts, starts + rng.normal(size=(2000, 2)) * 3))
+
+    def test_overlapping_against_brute_force(self, segments):
+        tree = RTree(SegmentSet(segments))
+        queries = np.random.default_rng(4).random((50, 4)) * 100
+        low = np.minimum(queries[:, :2], queries[:, 2:])
+        high = np.maximum(queries[:, :2], queries[:, 2:])
+        meets = ((low[:, None] <= tree.boxes[None, :, 2:])
+                 & (tree.boxes[None, :, :2] <= high[:, None])).all(axis=2)
+        assert tree.overlapping(queries).tolist() == (
+            np.argwhere(meets).tolist())
+
+    def test_window_includes_crossing_segments(self):
+        tree = RTree(np.array([[0, 0, 10, 10], [20, 0, 20, 10]]))
+        assert tree.window(4, 4, 6, 6).tolist() == [0]
+
+    def test_nearest_against_brute_force(self, segments):
+        tree = RTree(segments)
+        for query in np.random.default_rng(5).random((30, 2)) * 100:
+            indices, distances = tree.nearest(query, k=2)
+            brute = segment_distances(segments, query)
+            expected = np.lexsort((np.arange(len(segments)), brute))[:2]
+            assert indices.tolist() == expected.tolist()
+            assert np.allclose(distances, brute[expected])
@@ -0,0 +1,100 @@
+import pytest
+import numpy as np
+from geocalc_lib.shapes.point import Point
+from geocalc_lib.shapes.line import Line
+from geocalc_lib.shapes.segment_set import SegmentSet, as_segments
+from geocalc_lib.algorithms.line_segment import LineSegmentIntersection
+
+
+class TestSegmentSet:
+    @pytest.fixture
+    def segments(self):
+        return SegmentSet([[0, 0, 4, 4], [0, 4, 4, 0], [1, 1, 1, 5]])
+
+    def test_init(self, segments):
+        assert len(segments) == 3
+        assert segments.coords.shape == (3, 4)
+        assert segments.dtype == np.int64
+
+    def test_init_from_lines(self):
+        segments = SegmentSet([Line(Point(0, 0), Point(1, 2))])
+        assert segments.tolist() == [(0, 0, 1, 2)]
+
+    def test_getitem_returns_line(self, segments):
+        assert segments[1] == Line(Point(0, 4), Point(4, 0))
+
+    def test_starts_and_ends_are_views(self, segments):
+        assert np.shares_memory(segments.starts, segments.coords)
+        assert np.array_equal(segments.ends[2], [1, 5])
+
+    def test_zero_length_rejected(self, segments):
+        with pytest.raises(ValueError):
+            segments.append((1, 1, 1, 1))
+        assert len(segments) == 3
+
+    def test_index_and_remove(self, segments):
+        line = Line(Point(0, 4), Point(4, 0))
+        assert line in segments
+        del segments[segments.index(line)]
+        assert line not in segments
+        assert len(segments) == 2
+
+    def test_length(self, segments):
+        assert np.allclose(segments.length(),
+                           [np.sqrt(32), np.sqrt(32), 4])
+
+    def test_midpoint(self, segments):
+        assert np.allclose(segments.midpoint(), [[2, 2], [2, 2], [1, 3]])
+
+    def test_slope(self, segments):
+        slopes = segments.slope()
+        assert slopes[0] == 1
+        assert slopes[1] == -1
+        assert slopes[2] == float("inf")
+
+    def test_slope_matches_line(self, segments):
+        for line, slope in zip(segments, segments.slope()):
+            assert line.slope() == slope
+
+    def test_bounds(self, segments):
+        assert np.array_equal(segments.bounds(), [[0, 0, 4, 4],
+                                                  [0, 0, 4, 4],
+                                                  [1, 1, 1, 5]])
+        assert np.array_equal(segments.total_bounds(), [0, 0, 4, 5])
+
+    def test_empty_total_bounds(self):
+        with pytest.raises(ValueError):
+            SegmentSet().total_bounds()
+
+    def test_as_segments_no_copy(self, segments):
+        assert np.shares_memory(as_segments(segments), segments.coords)
+
+
+class TestIntersectingPairs:
+    @pytest.fixture
+    def lsi(self):
+        return LineSegmentIntersection(SegmentSet())
+
+    def test_simple(self, lsi):
+        segments = SegmentSet([[0, 0, 4, 4], [0, 4, 4, 0], [5, 5, 6, 9]])
+        assert lsi.intersecting_pairs(segments).tolist() == [[0, 1]]
+
+    def test_collinear_overlap_and_touching(self, lsi):
+        segments = SegmentSet([[0, 0, 3, 0], [2, 0, 5, 0], [5, 0, 5, 3],
+                               [7, 0, 9, 0]])
+        assert lsi.intersecting_pairs(segments).tolist() == [[0, 1], [1, 2]]
+
+    def test_empty(self, lsi):
+        assert lsi.intersecting_pairs(SegmentSet()).shape == (0, 2)
+
+    def test_matches_do_intersect(self, lsi):
+        rng = np.random.default_rng(0)
+        coords = rng.integers(0, 10, size=(60, 4))
+        coords = coords[np.any(coords[:, :2] != coords[:, 2:], axis=1)]
+        segments = SegmentSet(coords)
+        lines = list(segments)
+        expected = [[i, j] for i in range(len(lines))
+                    for j in range(i + 1, len(lines))
+                    if lsi.do_intersect(lines[i].start, lines[i].end,
+                                        lines[j].start, lines[j].end)]
+        assert lsi.intersecting_pairs(segments).tolist() == expected